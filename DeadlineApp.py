@@ -1,8 +1,11 @@
 from pywebio import *
 from pywebio.session import info as session_info
 from dateutil.easter import *
+from types import MappingProxyType
 import arrow
-from pyecharts.components import Table
+import holiday_calendar
+from deadline_engine import MAX_DURATION, DeadlineCase, check_case, evaluate, evaluate_many
+import ics_export
 
 # UNDER HEAVY DEVELOPMENT - NOT FOR PRODUCTION USE
 
@@ -17,6 +20,27 @@ config(title="Web App Fristenrechner | Web App Deadline Calculator",
       theme = "default") 
 
 
+# --- HOLIDAY SELECTION --- #
+# Shared by all sessions, PyWebIO copies the options for each checkbox
+
+CANTONS = tuple(holiday_calendar.CANTONS)
+
+# Checkbox options per canton as (label, value, selected), the value is the holiday label passed to the engine
+# The holidays of the canton in holiday_calendar are preselected, the same holidays the bulk mode applies (holidays=None)
+CANTON_HOLIDAY_OPTIONS = MappingProxyType({
+    canton: tuple((label, label, canton in cantons) for label, rule, cantons in holiday_calendar.HOLIDAYS)
+    for canton in CANTONS})
+
+
+# --- BULK MODE --- #
+# One deadline per line: date; type of receipt; duration with unit; canton
+# e.g. "20.11.2023; fiction; 30d; ZH" or "01.03.2024; actual; 2m; BE"
+
+BULK_TYPES = {"actual": "actual", "fiction": "fiction", "empfang": "actual", "fiktion": "fiction"}
+BULK_UNITS = {"d": "days", "t": "days", "m": "months", "y": "years", "j": "years"}
+BULK_MAX_ROWS = 1000
+
+
 # --- FUNCTIONS --- #
 
 # Function to choose language according to browser language
@@ -35,6 +59,158 @@ def btn_click(btn_val):
     elif btn_val == "Feedback":
         session.run_js('open("mailto:hello@piccolaw.ch")')
 
+# Validate the duration of the single mode, the maximum depends on the unit
+def check_duration(data):
+    if data["duration"] > MAX_DURATION[data["unit"]]:
+        return ("duration", lang("Please enter at most %s" % MAX_DURATION[data["unit"]], "Bitte höchstens %s eingeben" % MAX_DURATION[data["unit"]]))
+
+# Function to parse the rows of the bulk mode into cases, raises ValueError with the line number
+def parse_bulk(text, court_holidays):
+    cases = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            receipt_std, receipt_type, duration, canton = [cell.strip() for cell in line.split(";")]
+            unit = BULK_UNITS[duration[-1].lower()]
+            canton = canton.upper()
+            if canton not in CANTONS:
+                raise ValueError(canton)
+            cases.append(DeadlineCase(
+                receipt_type=BULK_TYPES[receipt_type.lower()],
+                receipt_dt=arrow.get(receipt_std, "DD.MM.YYYY").date(),
+                duration=int(duration[:-1]),
+                unit=unit,
+                court_holidays=court_holidays,
+                canton=canton))
+            # Duration between one and MAX_DURATION, end within the supported dates
+            check_case(cases[-1])
+        except (ValueError, KeyError, IndexError, arrow.parser.ParserError):
+            raise ValueError(number)
+    return cases
+
+# Function to show the table of bulk results, sorted by a column
+def put_bulk_table(rows, headers, column, reverse=False):
+    # pyecharts is only imported once a session reaches the results
+    from pyecharts.components import Table
+
+    rows = sorted(rows, key=lambda row: row[0][column], reverse=reverse)
+    tbl_bulk = Table()
+    tbl_bulk.add(headers, [row[1] for row in rows])
+
+    with output.use_scope("scope_res_bulk", clear=True):
+        output.put_buttons(
+            [{"label": ("▼ " if reverse else "▲ ") + header if i == column else header, "value": i} for i, header in enumerate(headers)],
+            small=True,
+            outline=True,
+            onclick=lambda i: put_bulk_table(rows, headers, i, reverse=(i == column and not reverse)))
+        output.put_html(tbl_bulk.render_notebook()).style('margin-top: 20px')
+
+# Bulk mode: list of receipts in, deadline schedule out
+def deadline_bulk():
+
+    with output.use_scope("scope_input_instructions", clear=True):
+        output.put_markdown(lang("""
+            ### Input
+
+            Please enter one deadline per line: date; type of receipt; duration; canton
+
+            Notes:
+            - Format for all date inputs: DD.MM.YYYY (e.g. 01.01.2020, 16.05.2020, 07.12.2020)
+            - Type of receipt: "actual" (date of receipt) or "fiction" (date of collection note)
+            - Duration with unit: d (days), m (months) or y (years), e.g. 30d, 2m, 1y (at most 3650d, 120m or 10y)
+            - All holidays of the canton extend the deadlines
+            - Example: 20.11.2023; fiction; 30d; ZH
+            ""","""
+            ### Input
+
+            Bitte eine Frist pro Zeile eingeben: Datum; Empfangsart; Dauer; Kanton
+
+            Hinweise:
+            - Format für alle Daten: DD.MM.YYYY (z.B. 01.01.2020, 16.05.2020, 07.12.2020)
+            - Empfangsart: "empfang" (Zustelldatum) oder "fiktion" (Datum Abholungseinladung)
+            - Dauer mit Einheit: t (Tage), m (Monate) oder j (Jahre), z.B. 30t, 2m, 1j (höchstens 3650t, 120m oder 10j)
+            - Alle Feiertage des Kantons verlängern die Fristen
+            - Beispiel: 20.11.2023; fiktion; 30t; ZH
+            """))
+
+    # Function to validate the rows
+    def check_rows(text):
+        lines = [line for line in text.splitlines() if line.strip()]
+        if len(lines) > BULK_MAX_ROWS:
+            return lang("At most %d lines" % BULK_MAX_ROWS, "Höchstens %d Zeilen" % BULK_MAX_ROWS)
+        try:
+            parse_bulk(text, False)
+        except ValueError as e:
+            return lang("Invalid input in line %s" % e, "Ungültige Eingabe in Zeile %s" % e)
+
+    bulk_input = input.input_group("", [
+        input.textarea(
+            lang(
+                "Deadlines",
+                "Fristen"),
+            name="rows",
+            rows=12,
+            required=True,
+            placeholder="20.11.2023; fiction; 30d; ZH",
+            validate=check_rows),
+        input.select(
+            lang(
+                "Court Holidays",
+                "Gerichtsferien"),
+            options=[{
+                    "label":lang("Disable", "Deaktivieren"),
+                    "value":False
+                    },{
+                    "label":lang("Enable", "Aktivieren"),
+                    "value":True
+                    }],
+            name="court_holidays",
+            required=True),
+        ])
+
+    # One pass over all deadlines
+    cases = parse_bulk(bulk_input["rows"], bulk_input["court_holidays"])
+    results = evaluate_many(cases)
+
+    types = {"actual": lang("Actual receipt", "Tatsächlicher Empfang"), "fiction": lang("Legal fiction", "Zustellfiktion")}
+    units = {"days": lang(" days", " Tage"), "months": lang(" months", " Monate"), "years": lang(" years", " Jahre")}
+    headers = [
+        lang("No.", "Nr."),
+        lang("Type of receipt", "Empfangsart"),
+        lang("Receipt", "Empfang"),
+        lang("Duration", "Dauer"),
+        lang("Canton", "Kanton"),
+        lang("Start of Deadline", "Fristbeginn"),
+        lang("End of Deadline", "Fristende"),
+    ]
+    # Sort keys and displayed cells per row
+    rows = [
+        ((i, case.receipt_type, result.receipt_dt, (case.unit, case.duration), case.canton, result.start_dt, result.end_dt),
+         [str(i), types[case.receipt_type], arrow.get(result.receipt_dt).format("DD.MM.YYYY"), str(case.duration) + units[case.unit],
+          case.canton, arrow.get(result.start_dt).format("DD.MM.YYYY"), arrow.get(result.end_dt).format("DD.MM.YYYY")])
+        for i, (case, result) in enumerate(zip(cases, results), start=1)]
+
+    output.clear("scope_input_instructions")
+    output.put_markdown(lang("""## Deadlines""", """## Fristen""")).style('margin-top: 20px')
+    output.put_markdown(lang("""Click on a column to sort the table.""", """Klicke auf eine Spalte, um die Tabelle zu sortieren."""))
+    put_bulk_table(rows, headers, 6)
+
+    # All deadlines as one calendar file
+    german = 'de' in session_info.user_language
+    calendar = "".join(ics_export.ics_chunks(
+        (event
+         for i, (case, result) in enumerate(zip(cases, results), start=1)
+         for event in ics_export.deadline_events(case, result, german, prefix=str(i) + ". ")),
+        name=lang("Deadlines", "Fristen")))
+    output.put_file(
+        "piccolaw-deadlines.ics",
+        calendar.encode("utf-8"),
+        lang("Download deadlines as calendar file (ICS)", "Fristen als Kalenderdatei herunterladen (ICS)")).style('margin-top: 20px')
+
+    # Keep the session open for sorting
+    session.hold()
+
 # User Info: Employment data (block required)
 def deadline_app():
 
@@ -43,718 +219,18 @@ def deadline_app():
                     output_animation=False)
 
     label_change = {
-        lang("Actual receipt", "Tatsächlicher Empfang") : lang("Date of receipt", "Zustelldatum"),
-        lang("Legal fiction", "Zustellfiktion") : lang("Date of collection note", "Datum Abholungseinladung"),
+        "actual" : lang("Date of receipt", "Zustelldatum"),
+        "fiction" : lang("Date of collection note", "Datum Abholungseinladung"),
     }
 
-    labels = list(label_change.keys())
-
-    canton_change = {
-        "AG" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False}, 
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-        "AI" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : True, "selected": True},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "AR" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "BS" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "BL" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "BE" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "FR" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "GE" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : True, "selected": True},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "False" : False, "selected": False},
-            {"label" : "Restauration de la République", "value" : True, "selected": True},
-        ],
-    "GL" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : True, "selected": True},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "GR" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "JU" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : True, "selected": True},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : False, "selected": False},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "LU" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "NE" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : True, "selected": True},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : False, "selected": False},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "NW" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : True, "selected": True},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "OW" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : True, "selected": True},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "SH" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "SZ" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : True, "selected": True},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : True, "selected": True},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "SO" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "SG" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "TG" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "TI" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : False, "selected": False},
-            {"label" : "Heilige Drei Könige", "value" : True, "selected": True},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : True, "selected": True},
-            {"label" : "Karfreitag", "value" : False, "selected": False},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : True, "selected": True},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "UR" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : True, "selected": True},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "VS" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : True, "selected": True},
-            {"label" : "Karfreitag", "value" : False, "selected": False},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "VD" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : True, "selected": True},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : False, "selected": False},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "ZG" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : True, "selected": True},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : True, "selected": True},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : True, "selected": True},
-            {"label" : "Mariä Empfängnis", "value" : True, "selected": True},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    "ZH" : [
-            {"label" : "Neujahrstag", "value" : True, "selected": True},
-            {"label" : "Berchtoldstag", "value" : True, "selected": True},
-            {"label" : "Heilige Drei Könige", "value" : False, "selected": False},
-            {"label" : "Jahrestag der Ausrufung der Republik Neuenburg", "value" : False, "selected": False},
-            {"label" : "Josefstag", "value" : False, "selected": False},
-            {"label" : "Karfreitag", "value" : True, "selected": True},
-            {"label" : "Ostermontag", "value" : True, "selected": True},
-            {"label" : "Fahrtsfest", "value" : False, "selected": False},
-            {"label" : "Tag der Arbeit", "value" : False, "selected": False},
-            {"label" : "Auffahrt", "value" : True, "selected": True},
-            {"label" : "Pfingstmontag", "value" : True, "selected": True},
-            {"label" : "Frohnleichnam", "value" : False, "selected": False},
-            {"label" : "Commémoration du Plébiscite Jurassien", "value" : False, "selected": False},
-            {"label" : "Peter und Paul", "value" : False, "selected": False},
-            {"label" : "Bundesfeier", "value" : True, "selected": True},
-            {"label" : "Mariä Himmelfahrt", "value" : False, "selected": False},
-            {"label" : "Jeûne Genevois", "value" : False, "selected": False},
-            {"label" : "Lundi du Jeûne", "value" : False, "selected": False},
-            {"label" : "Mauritiustag", "value" : False, "selected": False},
-            {"label" : "Bruderklausenfest", "value" : False, "selected": False},
-            {"label" : "Allerheiligen", "value" : False, "selected": False},
-            {"label" : "Mariä Empfängnis", "value" : False, "selected": False},
-            {"label" : "Weihnachtstag", "value" : True, "selected": True},
-            {"label" : "Stephanstag", "value" : True, "selected": True},
-            {"label" : "Restauration de la République", "value" : False, "selected": False},
-        ],
-    }
+    labels = [{
+        "label":lang("Actual receipt", "Tatsächlicher Empfang"),
+        "value":"actual"
+        },{
+        "label":lang("Legal fiction", "Zustellfiktion"),
+        "value":"fiction"
+        }]
 
-    cantons = list(canton_change.keys())
 
     # --- INPUT --- #
 
@@ -772,6 +248,16 @@ def deadline_app():
         `v0.0.1 | Updated: XXXX-XX-XX`
         """))
 
+    mode = input.actions(lang("Mode", "Modus"), buttons=[{
+            "label":lang("Single deadline", "Einzelne Frist"),
+            "value":"single"
+            },{
+            "label":lang("List of deadlines", "Liste von Fristen"),
+            "value":"bulk"
+            }])
+    if mode == "bulk":
+        return deadline_bulk()
+
     with output.use_scope("scope_input_instructions", clear=True):
         output.put_markdown(lang("""
             ### Input
@@ -780,7 +266,7 @@ def deadline_app():
 
             Notes:
             - Format for all date inputs: DD.MM.YYYY (e.g. 01.01.2020, 16.05.2020, 07.12.2020)
-            - End date is optional, leave empty to only evaluate the end of the deadline
+            - Court holidays (Art. 145 ZPO) do not apply in conciliation and summary proceedings
 
             ""","""
             ### Input
@@ -789,7 +275,7 @@ def deadline_app():
 
             Notes:
             - Format for all date inputs: DD.MM.YYYY (e.g. 01.01.2020, 16.05.2020, 07.12.2020)
-            - End date is optional, leave empty to only evaluate the end of the deadline
+            - Gerichtsferien (Art. 145 ZPO) gelten nicht im Schlichtungs- und im summarischen Verfahren
             """))
 
     # User input
@@ -803,13 +289,35 @@ def deadline_app():
             required=True,
             onchange=lambda c: input.input_update("receipt_std", label = label_change[c])),
         input.input(
-            label = label_change[labels[0]],
+            label = label_change[labels[0]["value"]],
             name="receipt_std",
             type=input.TEXT,
             required=True,
             pattern="[0-9]{2}\.[0-9]{2}\.(19|20)\d{2}$",
             maxlength="10",
             minlength="10"),
+        input.input(
+            label = lang("Duration", "Dauer"),
+            name="duration",
+            type=input.NUMBER,
+            required=True,
+            validate=lambda n: lang("Please enter a positive number", "Bitte eine positive Zahl eingeben") if n < 1 else None),
+        input.select(
+            lang(
+                "Unit",
+                "Einheit"),
+            options=[{
+                    "label":lang("Days", "Tage"),
+                    "value":"days"
+                    },{
+                    "label":lang("Months", "Monate"),
+                    "value":"months"
+                    },{
+                    "label":lang("Years", "Jahre"),
+                    "value":"years"
+                    }],
+            name="unit",
+            required=True),
         input.select(
             lang(
                 "Court Holidays",
@@ -825,13 +333,72 @@ def deadline_app():
             required=True),
         input.select(
             label = "Kanton",
-            options = cantons,
+            options = CANTONS,
             name = "canton",
             required = True,
-            onchange=lambda c: input.input_update("holiday_cb", options = canton_change[c])),
+            onchange=lambda c: input.input_update("holiday_cb", options = CANTON_HOLIDAY_OPTIONS[c])),
         input.checkbox(
             label = "Feiertage",
-            options = canton_change[cantons[0]],
+            options = CANTON_HOLIDAY_OPTIONS[CANTONS[0]],
             name = "holiday_cb",
             multiple = True)
-        ])
+        ], validate = check_duration)
+
+
+    # --- EVALUATION --- #
+
+    case = DeadlineCase(
+        receipt_type=deadline_input["receipt_type"],
+        receipt_dt=arrow.get(deadline_input["receipt_std"], "DD.MM.YYYY").date(),
+        duration=deadline_input["duration"],
+        unit=deadline_input["unit"],
+        court_holidays=deadline_input["court_holidays"],
+        canton=deadline_input["canton"],
+        holidays=tuple(deadline_input["holiday_cb"]))
+    result = evaluate(case)
+
+    reason_labels = {
+        "saturday": lang("Saturday", "Samstag"),
+        "sunday": lang("Sunday", "Sonntag"),
+        "court_holidays": lang("Court holidays", "Gerichtsferien"),
+    }
+
+
+    # --- OUTPUT SUMMARY --- #
+
+    output.clear("scope_input_instructions")
+
+    with output.use_scope("scope_res_general"):
+
+        output.put_markdown(lang("""## Key Results""", """## Wichtigste Resultate""")).style('margin-top: 20px'),
+
+        output.put_row([
+            output.put_markdown(lang("""**Receipt:**""", """**Empfang:**""")),
+            output.put_markdown(arrow.get(result.receipt_dt).format("DD.MM.YYYY")),
+        ], size="35% auto auto")
+        output.put_row([
+            output.put_markdown(lang("""**Start of Deadline:**""", """**Fristbeginn:**""")),
+            output.put_markdown(arrow.get(result.start_dt).format("DD.MM.YYYY")),
+        ], size="35% auto auto")
+        if case.court_holidays != False:
+            output.put_row([
+                output.put_markdown(lang("""**Days of Court Holidays:**""", """**Tage Gerichtsferien:**""")),
+                output.put_markdown(str(result.court_holiday_days)),
+            ], size="35% auto auto")
+        for day, reason in result.extension_lst:
+            output.put_row([
+                output.put_markdown(lang("""**Extension:**""", """**Verlängerung:**""")),
+                output.put_markdown(arrow.get(day).format("DD.MM.YYYY") + " (" + reason_labels.get(reason, reason) + ")"),
+            ], size="35% auto auto")
+        output.put_row([
+            output.put_markdown(lang("""**End of Deadline:**""", """**Fristende:**""")),
+            output.put_markdown("**" + arrow.get(result.end_dt).format("DD.MM.YYYY") + "**"),
+        ], size="35% auto auto")
+
+        calendar = "".join(ics_export.ics_chunks(
+            ics_export.deadline_events(case, result, 'de' in session_info.user_language),
+            name=lang("Deadlines", "Fristen")))
+        output.put_file(
+            "piccolaw-deadline.ics",
+            calendar.encode("utf-8"),
+            lang("Download deadline as calendar file (ICS)", "Frist als Kalenderdatei herunterladen (ICS)")).style('margin-top: 20px')
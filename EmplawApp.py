@@ -1,12 +1,15 @@
 from pywebio import *
 from pywebio.session import info as session_info
-from dateutil.easter import *
+from functools import partial
+from dataclasses import replace
 import arrow
-import plotly.express as px
-import pandas as pd
-import copy
-import portion
-from pyecharts.components import Table
+from emplaw_engine import EmploymentCase, StageMemo, evaluate_staged, period_duration, sweep_termination
+from calendar_math import add_years
+import emplaw_timeline
+from static_assets import plotly_html
+import compute_pool
+import result_cache
+import ics_export
 
 # §§
 # LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
@@ -119,7 +122,8 @@ def check_trial(data):
         return ("", "")
 
 # Validate termination form
-def check_form_termination(data):
+# Bound to the employment start date of the session with partial
+def check_form_termination(data, employment_sdt):
     try: 
         arrow.get(data["termination_dt"], "DD.MM.YYYY")
     except:
@@ -131,94 +135,79 @@ def check_form_termination(data):
                             scope="scope_input_instructions")
         return ("", "")
 
-# Function to correct date subtraction if origin month has more days than target month
-# See issue 1
-def subtract_corr(sdt, edt):
-    if sdt.day != edt.day:
-        return(edt)
-    else:
-        edt = edt.shift(days=-1)
-        return(edt)
-
-# Function to calculate overlap between two date ranges
-def overlap_calc(sdt_1, sdt_2, edt_1, edt_2):
-        latest_start = max(sdt_1, sdt_2)
-        earliest_end = min(edt_1, edt_2)
-        delta = (earliest_end.date() - latest_start.date()).days + 1
-        overlap = max(0, delta)
-        return(overlap)
-
-# Function to grow date interval
-def grow(main, gaps):
-    start, end = main
-    for lo, hi in gaps:
-        if hi < start:
-            # gap is lower than main
-            continue
-        if lo > end:
-            # gap is higher than main
-            break
-        # extend main end by overlap length
-        overlap_length = overlap_calc(start, lo, end, hi)
-        end = max(end, hi)
-        end = end.shift(days=overlap_length)
-    return [start, end]
-
-# Function to flatten list
-# Source: https://stackoverflow.com/a/71468284/14819955
-def flat(x):
-    match x:
-        case []:
-            return []
-        case [[*sublist], *r]:
-            return [*sublist, *flat(r)]
-
-# Function to remove empty nested lists
-# Source: https://stackoverflow.com/a/20368240/14819955
-def purify(lst):
-    for (i, sl) in enumerate(lst):
-        if type(sl) == list:
-            lst[i] = purify(sl)
-    return [i for i in lst if i != [] and i != '']
-
-# Function to push dates to desired endpoint
-def push_endpoint(date, endpoint):
-    if endpoint in ["No mention of termination date", "Keine Angaben zum Kündigungstermin", "Termination date only end of month", "Kündigungstermin nur auf Ende Monat"]:
-        return date.ceil("month") # push to the end of the month
-    elif endpoint in ["Termination date only end of week", "Kündungstermin nur auf Ende Woche"]:
-        return date.ceil("week") # push to the end of the week
-    elif endpoint in ["Termination date only end of quarter", "Kündungstermin nur auf Ende Quartal"]:
-        return date.ceil("quarter") # push to the end of the quarter
-    elif endpoint in ["Termination date only end of year", "Kündungstermin nur auf Ende Jahr"]:
-        return date.ceil("year") # push to the end of the year
-    else:
-        return date
-
-# Function to evaluate service year thresholds
-def get_last_index(list_of_elems, condition, default_idx=-1) -> int:
-    try:
-        return next(i for i in range(len(list_of_elems) - 1, -1, -1)
-                    if condition(list_of_elems[i]))
-    except StopIteration:  # no date earlier than comparison date is found
-        return default_idx
-
-# Function to calculate time period duration in days
-def period_duration(start_date, end_date):
-    return (end_date - start_date).days + 1
-    
-# Function to correct single dates
-def single_date(lst, first_index, last_index):
-    if lst[first_index] > lst[last_index]:
-        lst[first_index] = lst[last_index]
-        return lst
-
-# Function to check if index exists, if not place empty string
-def check_index(lst, index):
-    if index < len(lst):
-        return lst[index]
-    else:
-        lst.insert(index, "")
-        return lst[index]
+# Fields of the termination form, optionally filled with the values of a case
+# The single form checks the date itself, as the browser cannot submit a hidden required field
+def termination_inputs(termination_dt=None, notice_period=None, endpoint=None, required=True):
+    return [
+        # Date of termination
+        input.input(
+            lang(
+                "Date of termination notice receipt",
+                "Datum Kündigungsempfang"),
+            name="termination_dt",
+            value=termination_dt,
+            type=input.TEXT,
+            required=required,
+            pattern="[0-9]{2}\.[0-9]{2}\.(19|20)\d{2}$",
+            maxlength="10",
+            minlength="10",
+            placeholder="DD.MM.YYYY"),
+        # Duration of notice period
+        input.select(
+            lang(
+                "Duration of notice period (months)",
+                "Dauer der Kündigungsfrist (Monate)"),
+            options=[{
+                "label":lang("No mention of notice period", "Keine Angaben zur Kündigungsfrist"),
+                "value":None
+                }] + [{"label":str(i), "value":i} for i in range(1, 13)],
+            name="notice_period_input",
+            value=notice_period,
+            required=True),
+        # Cancellation end of month required
+        input.select(
+            lang(
+                "Termination date",
+                "Kündigungstermin"),
+            options=[{
+                "label":lang("No mention of termination date", "Keine Angaben zum Kündigungstermin"),
+                "value":"month"
+                },{
+                "label":lang("Termination date only end of week", "Kündungstermin nur auf Ende Woche"),
+                "value":"week"
+                },{
+                "label":lang("Termination date only end of month", "Kündigungstermin nur auf Ende Monat"),
+                "value":"month"
+                },{
+                "label":lang("Termination date only end of quarter", "Kündungstermin nur auf Ende Quartal"),
+                "value":"quarter"
+                },{
+                "label":lang("Termination date only end of year", "Kündungstermin nur auf Ende Jahr"),
+                "value":"year"
+                },{
+                "label":lang("Termination date anytime", "Kündungstermin jederzeit"),
+                "value":"anytime"}],
+            name="endpoint",
+            value=endpoint,
+            required=True),
+    ]
+
+# Field of the probation period termination form, optionally filled with the value of a case
+def trial_notice_inputs(trial_notice_period=None):
+    return [
+        # Duration of notice period
+        input.select(
+            lang(
+                "Duration of notice period for probation period (days)",
+                "Dauer der Kündigungsfrist während der Probezeit (Tage)"),
+            options=[{
+                "label":lang("Not specified in contract", "Keine Angaben im Arbeitsvertrag"),
+                "value":7
+                }] + [{"label":str(i), "value":i} for i in range(0, 31)],
+            name="trial_notice_input",
+            value=trial_notice_period,
+            required=True),
+    ]
 
 # Function to populate dict key with sublist of pairs
 def populate_dct(in_dct):
@@ -235,81 +224,6 @@ def populate_dct(in_dct):
         value_lst = value_lst[2:]
     return paired_lst
 
-# Function to merge overlapping date ranges
-def merge(lst):
-    # Do not merge empty lits
-    if lst != []:
-        intervals = [portion.closed(a, b) for a, b in lst]
-        merge = portion.Interval(*intervals)
-        merge = [[i.lower, i.upper] for i in merge]
-        # Hotfix for rare error where inf is returned (investigate)
-        if merge != [[portion.inf, -portion.inf]]:
-            return merge
-        else:
-            return lst
-    else:
-        return lst
-
-# Function to check if a given date is a holiday
-# Source: https://www.bj.admin.ch/dam/bj/de/data/publiservice/service/zivilprozessrecht/kant-feiertage.pdf
-def holiday_checker(day, workplace):
-    easter_dt = arrow.Arrow.fromdate(easter(day.year))
-    if (
-        # Neujahrstag (all cantons)
-        (day == arrow.Arrow(day.year, 1, 1))
-        # Berchtoldstag
-        or (day == arrow.Arrow(day.year, 1, 2) and workplace in ["ZH", "BE", "LU", "OW", "NW", "GL", "ZG", "FR", "SO", "SH", "SG", "AG", "TG", "VD", "VS", "NE", "JU"])
-        # Heilige Drei Könige
-        or (day == arrow.Arrow(day.year, 1, 6) and workplace in ["UR", "SZ", "TI"])
-        # Jahrestag der Ausrufung der Republik Neuenburg
-        or (day == arrow.Arrow(day.year, 3, 1) and workplace in ["NE"])
-        # Josefstag
-        or (day == (arrow.Arrow(day.year, 3, 19) and workplace in ["UR", "SZ", "NW", "SO", "TI", "VS"]))
-        # Karfreitag
-        or (day == easter_dt.shift(days=-2) and workplace in ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "VD", "NE", "GE", "JU"])
-        # Ostermontag
-        or (day == easter_dt.shift(days=+1) and workplace in ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "GE", "JU"])
-        # Fahrtsfest
-        or (day == arrow.Arrow(day.year, 4, 1).shift(weekday=4) and workplace in ["GL"])
-        # Tag der Arbeit
-        or (day == arrow.Arrow(day.year, 5, 1) and workplace in ["ZH", "BS", "BL", "SH", "AG", "TG", "TI", "NE", "JU"])
-        # Auffahrt
-        or (day == easter_dt.shift(days=+39) and workplace in ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "NE", "GE", "JU"])
-        # Pfingstmontag
-        or (day == easter_dt.shift(days=+50) and workplace in ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "GE", "JU"])
-        # Frohnleichnam
-        or (day == easter_dt.shift(days=+60) and workplace in ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR","SO", "AI", "AG", "TI", "VS", "NE", "JU"])
-        # Commémoration du plébiscite jurassien
-        or (day == arrow.Arrow(day.year, 6, 23) and workplace in ["JU"])
-        # Peter und Paul
-        or (day == arrow.Arrow(day.year, 6, 29) and workplace in ["TI"])
-        # Bundesfeier (all cantons)
-        or (day == arrow.Arrow(day.year, 8, 1))
-        # Mariä Himmelfahrt
-        or day == (arrow.Arrow(day.year, 8, 15) and workplace in ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR", "SO", "AI", "AG", "TI", "VS", "JU"])
-        # Jeûne genevois
-        or (day == arrow.Arrow(day.year, 9, 1).shift(weekday=6).shift(weekday=3) and workplace in ["GE"])
-        # Lundi du Jeûne
-        or day == (arrow.Arrow(day.year, 9, 1).shift(weekday=6).shift(days=+7).shift(days=+8) and workplace in ["VD"])
-        # Mauritiustag
-        or (day == arrow.Arrow(day.year, 9, 25) and workplace in ["AI"])
-        # Bruderklausenfest
-        or (day == arrow.Arrow(day.year, 9, 25) and workplace in ["OW"])
-        # Allerheiligen
-        or (day == arrow.Arrow(day.year, 11, 1) and workplace in ["LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "AI", "SG", "AG", "TI", "VS", "JU"])
-        # Mariä Empfängnis
-        or (day == arrow.Arrow(day.year, 12, 8) and workplace in ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR", "AI", "AG", "TI", "VS"])
-        # Weihnachtstag (all cantons)
-        or (day == arrow.Arrow(day.year, 12, 25))
-        # Stephanstag
-        or (day == arrow.Arrow(day.year, 12, 26) and workplace in ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VS", "NE"])
-        # Restauration de la République
-        or (day == arrow.Arrow(day.year, 12, 31) and workplace in ["GE"])
-    ):
-        return True
-    else:
-        return False
-
 # Function to limit a date to be between lower and upper bounds
 # Source: https://stackoverflow.com/a/5996949/14819955
 def clamp(n, minn, maxn):
@@ -330,14 +244,382 @@ def btn_click(btn_val):
         session.run_js('open("mailto:hello@piccolaw.ch")')
 
 
-# --- MAIN FNCTION --- #
-def emplaw_app():
+# --- OUTPUT --- #
 
-    # --- SESSION CONTROL --- #
-    session.set_env(input_panel_fixed=False,
-                    output_animation=False)
+# Function to check if a result scope has to be rendered (again), records the data it is rendered with
+def scope_changed(rendered, scope, data):
+    if scope in rendered and rendered[scope] == data:
+        return False
+    rendered[scope] = data
+    return True
+
+# Function to output the results of a case
+# Scopes are updated in place, scopes whose data did not change since the last output are kept
+def put_results(case, result, case_key, rendered):
+
+    # Variables from case
+    incapacity_type = case.incapacity_type
+    incap_dct = case.incap_dct
+    trial_relevance = case.trial_relevance
+    termination_occurence = case.termination_occurence
+
+    # Variables from result
+    termination_case = result.termination_case
+    termination_dt = result.termination_dt
+    trial_lst = result.trial_lst
+    trial_extension_dur = result.trial_extension_dur
+    notice_period_lst = result.notice_period_lst
+    notice_comp_lst = result.notice_comp_lst
+    notice_ext_lst = result.notice_ext_lst
+    notice_overlap = result.notice_overlap
+    embargo_masterlst = result.embargo_masterlst
+    sickpay_masterlst = result.sickpay_masterlst
 
-    # --- INPUT --- #
+    # Output
+    if termination_case == "no_case":
+        termination_validity = lang("[--> No termination evaluated]", "[--> Keine Kündigung evaluiert]")
+        reason = lang("[--> No termination evaluated]", "[--> Keine Kündigung ausgewertet]")
+        new_employment_edt = lang("[--> No termination evaluated]", "[--> Keine Kündigung ausgewertet]")
+    elif termination_case == "embargo_case":
+        termination_validity = lang("⛔ TERMINATION IS INVALID.", "⛔ KÜNDIGUNG UNGÜLTIG")
+        reason = lang("The termination was issued during an embargo period.", "Die Kündigung wurde während einer Sperrfrist ausgesprochen.")
+        new_employment_edt = lang("[--> No valid termination]", "[--> Keine gültige Kündigung]")
+        # Earliest valid termination within two years of the invalid one
+        sweep = result_cache.get_or_run(
+            "sweep:" + case_key, compute_pool.run, sweep_termination, case, termination_dt, add_years(termination_dt, 2))
+        earliest_valid_dt = sweep.earliest_valid_dt
+        if earliest_valid_dt is None:
+            earliest_termination = lang("[--> No valid termination within two years]", "[--> Keine gültige Kündigung innerhalb von zwei Jahren]")
+        else:
+            earliest_termination = earliest_valid_dt.strftime("%d.%m.%Y") + lang(" (employment end date: ", " (Enddatum Anstellung: ") + \
+                sweep.new_employment_edts[sweep.termination_dts.index(earliest_valid_dt)].strftime("%d.%m.%Y") + ")"
+    else:
+        termination_validity = lang("✅ Termination is valid.", "✅ Kündigung ist gültig.")
+        if termination_case == "trial_case":
+            reason = lang("Termination during probation period.", "Kündigung während Probezeit.")
+        else:
+            reason = lang("Regular termination of employment.", "Ordentliche Kündigung des Arbeitsverhältnisses.")
+        new_employment_edt = result.new_employment_edt.strftime("%d.%m.%Y")
+
+    # Summary of most important datapoints
+    if scope_changed(rendered, "scope_res_general", result):
+        with output.use_scope("scope_res_general", clear=True):
+
+            output.put_markdown(lang("""## Key Results""", """## Wichtigste Resultate""")).style('margin-top: 20px'),
+
+            if termination_occurence != False:
+                output.put_row([
+                    output.put_markdown(lang("""**Validity of Termination:**""", """**Gültigkeit Kündigung:**""")),
+                    output.put_markdown(termination_validity),
+                ], size="35% auto auto")
+                output.put_row([
+                    output.put_markdown(lang("""**Reason:**""", """**Begründung:**""")),
+                    output.put_markdown(reason),
+                ], size="35% auto auto")
+                if termination_case == "embargo_case":
+                    output.put_row([
+                        output.put_markdown(lang("""**Earliest Valid Termination:**""", """**Frühestmögliche gültige Kündigung:**""")),
+                        output.put_markdown(earliest_termination),
+                    ], size="35% auto auto")
+
+            if trial_relevance != False:
+                output.put_row([
+                    output.put_markdown(lang("""**Missed Workdays Probation Period:**""", """**Verpasste Arbeitstage Probezeit:**""")),
+                    output.put_markdown(str(trial_extension_dur)),
+                ], size="35% auto auto")
+                output.put_row([
+                    output.put_markdown(lang("""**Probation Period End Date:**""", """**Enddatum Probezeit:**""")),
+                    output.put_markdown(trial_lst[-1].strftime("%d.%m.%Y")),
+                ], size="35% auto auto")
+
+            if termination_occurence != False:
+                output.put_row([
+                    output.put_markdown(lang("""**Compensation Days Notice Period:**""", """**Kompensationstage Kündigungsfrist:**""")),
+                    output.put_markdown(str(notice_overlap)),
+                ], size="35% auto auto")
+                output.put_row([
+                    output.put_markdown(lang("""**Employment End Date:**""", """**Enddatum Anstellung:**""")),
+                    output.put_markdown(new_employment_edt),
+                ], size="35% auto auto")
+
+            if (termination_occurence == False) and (trial_relevance == False):
+                output.put_row([
+                    output.put_markdown(lang("""**[--> See below for detailed results.]**""", """**[--> Siehe detaillierte Auflistung unten]**""")),
+                ])
+
+    # Start of detailed results
+    # pyecharts is only imported once a session reaches the results
+    from pyecharts.components import Table
+
+    # Headers shared by the incapacity, embargo and sick pay tables (scopes are rendered independently)
+    tbl_incap_headers = [
+        lang("No.", "Nr."),
+        lang("Start", "Start"),
+        lang("End", "Ende"),
+        lang("Duration", "Dauer"),
+    ]
+
+    # Scope for the summary of the trial period
+    if scope_changed(rendered, "scope_res_trial", result.trial_lst):
+        with output.use_scope("scope_res_trial", clear=True):
+
+            output.put_markdown(lang("""## Detailed Results """, """## Detaillierte Ergebnisse""")).style('margin-top: 30px')
+            output.put_markdown(lang("""### Probation Period""", """### Probezeit""")).style('margin-top: 20px')
+
+            if trial_relevance == True:
+
+                tbl_trial = Table()
+                tbl_trial_headers = [
+                    lang("", ""),
+                    lang("Start", "Start"),
+                    lang("End", "Ende"),
+                    lang("Duration", "Dauer"),
+                ]
+                tbl_trial_rows = [[lang("Probation Period", "Probezeit"), trial_lst[0].strftime("%d.%m.%Y"), trial_lst[1].strftime("%d.%m.%Y"), str(period_duration(trial_lst[0], trial_lst[1])) + lang(" days", " Tage")]]
+
+                tbl_trial.add(tbl_trial_headers, tbl_trial_rows)
+
+                output.put_html(tbl_trial.render_notebook()).style('margin-top: 40px')
+        
+            else:
+                output.put_markdown(lang("""**[--> No probation period evaluated]**""", """**[--> Keine Probezeit ausgewertet]**""")),
+
+    # Scope for the summary of incapacities as declared by user input
+    if scope_changed(rendered, "scope_res_incap", case.incap_dct):
+        with output.use_scope("scope_res_incap", clear=True):
+
+            output.put_markdown(lang("""### Incapacities (Your Input)""", """### Arbeitsunfähigkeiten (Dein Input)""")).style('margin-top: 20px')
+
+            if incapacity_type != False:
+
+                tbl_incap = Table()
+                tbl_incap_rows = []
+            
+                # List incapacities (dict is used for incap number)
+                for key, value in incap_dct.items():
+                    for incap_sublst in value:
+                        if incap_sublst != []:
+                            tbl_lst = []
+                            tbl_lst.append(str(key) + "." + str(value.index(incap_sublst)))
+                            tbl_lst.append(incap_sublst[0].strftime("%d.%m.%Y"))
+                            tbl_lst.append(incap_sublst[1].strftime("%d.%m.%Y"))
+                            tbl_lst.append(str(period_duration(incap_sublst[0], incap_sublst[1])) + lang(" days", " Tage"))
+                            tbl_incap_rows.append(tbl_lst)
+
+                tbl_incap.add(tbl_incap_headers, tbl_incap_rows)
+
+                output.put_html(tbl_incap.render_notebook()).style('margin-top: 40px')
+
+            else:
+                output.put_markdown(lang("""**[--> No incapacities evaluated]**""", """**[--> Keine Arbeitsunfähigkeiten ausgewertet]**""")),
+
+    # Scope for the summary of any embargo periods
+    if scope_changed(rendered, "scope_res_embargo_merged", result.embargo_masterlst):
+        with output.use_scope("scope_res_embargo_merged", clear=True):
+
+            output.put_markdown(lang("""### Embargo Periods""", """### Sperrfristen""")).style('margin-top: 20px')
+
+            if incapacity_type != False:
+
+                tbl_embargo = Table()
+                tbl_embargo_rows = []
+
+                # Count
+                i = 1
+                for embargo_sublst in embargo_masterlst:
+                    tbl_lst = []
+                    tbl_lst.append(str(i))
+                    tbl_lst.append(embargo_sublst[0].strftime("%d.%m.%Y"))
+                    tbl_lst.append(embargo_sublst[1].strftime("%d.%m.%Y"))
+                    tbl_lst.append(str(period_duration(embargo_sublst[0], embargo_sublst[1])) + lang(" days", " Tage"))
+                    tbl_embargo_rows.append(tbl_lst)
+                    i += 1
+
+                tbl_embargo.add(tbl_incap_headers, tbl_embargo_rows)
+
+                output.put_html(tbl_embargo.render_notebook()).style('margin-top: 40px')
+
+            else:
+                output.put_markdown(lang("""**[--> No embargo periods evaluated]**""", """**[--> Keine Sperrfristen ausgewertet]**""")),
+
+    # Scope for the summary of any sick pay periods
+    if scope_changed(rendered, "scope_res_sp", result.sickpay_masterlst):
+        with output.use_scope("scope_res_sp", clear=True):
+
+            output.put_markdown(lang("""### Sick Pay Periods""", """### Perioden Lohnfortzahlung """)).style('margin-top: 20px'),
+
+            if incapacity_type != False:
+
+                tbl_sp = Table()
+                tbl_sp_rows = []
+
+                # Count iterations
+                i = 1
+                for sickpay_sublst in sickpay_masterlst:
+                    tbl_lst = []
+                    tbl_lst.append(str(i))
+                    tbl_lst.append(sickpay_sublst[0].strftime("%d.%m.%Y"))
+                    tbl_lst.append(sickpay_sublst[1].strftime("%d.%m.%Y"))
+                    tbl_lst.append(str(period_duration(sickpay_sublst[0], sickpay_sublst[1])) + lang(" days", " Tage"))
+                    tbl_sp_rows.append(tbl_lst)
+                    i += 1
+
+                tbl_sp.add(tbl_incap_headers, tbl_sp_rows)
+
+                output.put_html(tbl_sp.render_notebook()).style('margin-top: 40px')
+
+            else:
+                output.put_markdown(lang("""**[--> No sick pay periods evaluated]**""", """**[--> Keine Lohnfortzahlungsfristen ausgewertet]**""")),
+
+    # Scope for the summary of notice period
+    if scope_changed(rendered, "scope_res_notice", [result.termination_case, result.notice_period_lst, result.notice_comp_lst, result.notice_ext_lst]):
+        with output.use_scope("scope_res_notice", clear=True):
+
+            output.put_markdown(lang("""### Notice Period""", """### Kündigungsfrist""")).style('margin-top: 20px'),
+        
+            # Omit if no notice period was evaluated
+            if (termination_occurence == True) and (termination_case != "embargo_case"):
+
+                tbl_np = Table()
+                tbl_np_headers = [
+                    lang("Type", "Art"),
+                    lang("Start", "Start"),
+                    lang("End", "Ende"),
+                    lang("Duration", "Dauer"),
+                ]
+
+                tbl_np_rows = []
+
+                tbl_np_rows.append([
+                    lang("Original Notice Period", "Ursprüngliche Kündigungsfrist"),
+                    notice_period_lst[0].strftime("%d.%m.%Y"),
+                    notice_period_lst[1].strftime("%d.%m.%Y"),
+                    str(period_duration(notice_period_lst[0], notice_period_lst[1])) + lang(" days", " Tage")
+                    ])
+
+                try:
+                    tbl_np_rows.append([
+                        lang("Notice Period Compensation", "Kompensation Kündigungsfrist"),
+                        notice_comp_lst[0].strftime("%d.%m.%Y"),
+                        notice_comp_lst[1].strftime("%d.%m.%Y"),
+                        str(period_duration(notice_comp_lst[0], notice_comp_lst[1])) + lang(" days", " Tage")
+                        ])
+                except IndexError:
+                    tbl_np_rows.append([
+                        lang("Notice Period Compensation", "Kompensation Kündigungsfrist"),
+                        "X",
+                        "X",
+                        "X",
+                        ])
+
+                try:
+                    tbl_np_rows.append([
+                        lang("Notice Period Extension", "Verlängerung Kündigungsfrist"),
+                        notice_ext_lst[0].strftime("%d.%m.%Y"),
+                        notice_ext_lst[1].strftime("%d.%m.%Y"),
+                        str(period_duration(notice_ext_lst[0], notice_ext_lst[1])) + lang(" days", " Tage"),
+                        ])
+                except IndexError:
+                    tbl_np_rows.append([
+                        lang("Notice Period Extension", "Verlängerung Kündigungsfrist"),
+                        "X",
+                        "X",
+                        "X",
+                        ])
+
+                tbl_np.add(tbl_np_headers, tbl_np_rows)
+
+                output.put_html(tbl_np.render_notebook()).style('margin-top: 40px')
+
+            else:
+                output.put_markdown(lang("""**[--> No notice period evaluated]**""", """**[--> Keine Kündigungsfrist ausgewertet]**""")),
+
+
+    # --- OUTPUT VISUALIZATION - MAKE OUTPUT --- #
+
+    # Renderer for this session: interactive plotly chart or static SVG
+    timeline_renderer = emplaw_timeline.TIMELINE_RENDERER
+    if timeline_renderer == "auto":
+        timeline_renderer = "svg" if session_info.user_agent.is_mobile else "plotly"
+
+    if scope_changed(rendered, "scope_visualization", result):
+        with output.use_scope("scope_visualization", clear=True):
+
+            if timeline_renderer == "svg":
+                # SVG output to PyWebIO
+                timeline = result_cache.get_or_run(
+                    lang("timeline_svg:en:", "timeline_svg:de:") + case_key,
+                    compute_pool.run, emplaw_timeline.timeline_svg, case, result, 'de' in session_info.user_language)
+                output.put_markdown(lang("""
+                ## Visualization
+
+                IMPORTANT: The chart below is intended only as a visual aid.
+
+                """, """
+                ## Visualisierung
+
+                WICHTIG: Die nachfolgende Grafik ist nur als visuelle Hilfe gedacht.
+
+                """)).style('margin-top: 20px'),
+                output.put_collapse(lang("Further Information", "Ergänzende Hinweise",), [
+                    output.put_markdown(lang("""
+                    - Hover over a bar to see its start and end date
+                    - Time periods of a single day are shown as thin lines
+
+                    ""","""
+                    - Start- und Enddatum werden angezeigt, wenn der Mauszeiger über einem Balken steht
+                    - Zeiträume von einem einzelnen Tag werden als dünne Linien dargestellt
+
+                    """))]).style('margin-top: 20px'),
+                output.put_html(timeline).style("border: 1px solid #dfe2e5")
+
+            else:
+                # Plotly output to PyWebIO, only the figure spec is sent to the client
+                timeline = result_cache.get_or_run(
+                    lang("timeline_spec:en:", "timeline_spec:de:") + case_key,
+                    compute_pool.run, emplaw_timeline.timeline_spec, case, result, 'de' in session_info.user_language)
+                output.put_markdown(lang("""
+                ## Interactive Visualization
+
+                IMPORTANT: The chart below is intended only as a visual aid.
+
+                """, """
+                ## Interaktive Visualisierung
+
+                WICHTIG: Die nachfolgende Grafik ist nur als visuelle Hilfe gedacht.
+
+                """)).style('margin-top: 20px'),
+                output.put_collapse(lang("Further Information", "Ergänzende Hinweise",), [
+                    output.put_markdown(lang("""
+                    - An export of the chart area as PNG is possible via the control panel on the top right
+                    - Time periods of asingle day cannot be visualized
+
+                    ""","""
+                    - Ein Export als PNG ist über das Steuerpanel rechts oben möglich.
+                    - Die Visualisierung einzelner Tage ist nicht möglich
+
+                    """))]).style('margin-top: 20px'),
+                output.put_html(plotly_html(timeline)).style("border: 1px solid #dfe2e5")
+
+
+    # --- OUTPUT CALENDAR EXPORT --- #
+
+    if scope_changed(rendered, "scope_export", case_key):
+        with output.use_scope("scope_export", clear=True):
+
+            output.put_markdown(lang("""## Calendar Export""", """## Kalenderexport""")).style('margin-top: 20px')
+            calendar = "".join(ics_export.ics_chunks(
+                ics_export.employment_events(case, result, 'de' in session_info.user_language),
+                name=lang("Employment Law", "Arbeitsrecht"),
+                uid_prefix=case_key))
+            output.put_file(
+                "piccolaw-employment.ics",
+                calendar.encode("utf-8"),
+                lang("Download periods as calendar file (ICS)", "Zeiträume als Kalenderdatei herunterladen (ICS)"))
+
+
+# Function to output title, landing page and terms (scope "scope_input_instructions")
+def put_intro():
 
     output.put_buttons(
         ["< Back to piccolaw.ch", "Restart App", "Feedback"],
@@ -412,7 +694,69 @@ def emplaw_app():
             
             Durch die weitere Nutzung dieser App stimmst du diesen Nutzungsbedingungen zu.
             """))
-    
+
+# Function to evaluate a case and output the results
+# Changes of the termination afterwards update the results in place
+def evaluate_and_put(case):
+
+    # Stage memo of this session, kept for changes of the termination below
+    # Evaluations run in the pool and hand the updated memo back (the process pool works on a copy)
+    memo = StageMemo()
+    def evaluate_case(case):
+        nonlocal memo
+        result, memo = compute_pool.run(evaluate_staged, case, memo)
+        return result
+
+    # Repeated cases are served from the cache
+    case_key = result_cache.case_key(case)
+    result = result_cache.get_or_run("evaluate:" + case_key, evaluate_case, case)
+
+    # --- OUTPUT SUMMARY --- #
+
+    session.set_env(output_max_width = "1080px")
+
+    # Remove progress bar
+    output.remove("scope_progress")    
+    output.clear("scope_input_instructions")
+
+    # Output scopes and the data they were rendered with
+    rendered = {}
+    put_results(case, result, case_key, rendered)
+
+
+    # --- CHANGE TERMINATION --- #
+
+    # Changes of the termination update the results in place, without repeating the other forms
+    # Only the stages (notice period, sick pay, validity) and result scopes affected by a change are recomputed
+    if case.termination_occurence == True:
+        while True:
+            fields = termination_inputs(case.termination_dt.format("DD.MM.YYYY"), case.notice_period, case.endpoint)
+            if case.trial_relevance == True:
+                fields += trial_notice_inputs(case.trial_notice_period)
+            termination_data = input.input_group(lang("Change Termination", "Kündigung ändern"), fields,
+                validate = partial(check_form_termination, employment_sdt=case.employment_sdt))
+            case = replace(
+                case,
+                termination_dt=arrow.get(termination_data["termination_dt"], "DD.MM.YYYY"),
+                notice_period=termination_data["notice_period_input"],
+                endpoint=termination_data["endpoint"],
+                trial_notice_period=termination_data.get("trial_notice_input", case.trial_notice_period))
+            case_key = result_cache.case_key(case)
+            result = result_cache.get_or_run("evaluate:" + case_key, evaluate_case, case)
+            put_results(case, result, case_key, rendered)
+
+
+# --- MAIN FNCTION --- #
+def emplaw_app():
+
+    # --- SESSION CONTROL --- #
+    session.set_env(input_panel_fixed=False,
+                    output_animation=False)
+
+    # --- INPUT --- #
+
+    put_intro()
+
     # Terms and conditions
     input.actions(lang("Agree and continue?", "Zustimmen und fortfahren?"), [
         {'label': "Okay!", 'value': 'continue'},
@@ -466,8 +810,6 @@ def emplaw_app():
             required=True),
     ], validate = check_form_employment)
     # Variables: Employment data (input required)
-    # Make employment start date global for validation
-    global employment_sdt
     employment_sdt = arrow.get(employment_data["employment_sdt"], "DD.MM.YYYY")
     workplace = employment_data["workplace"]
 
@@ -536,10 +878,13 @@ def emplaw_app():
     incapacity_type = case["incapacity_type"]
     trial_relevance = case["trial_relevance"]
     termination_occurence = case["termination_occurence"]
-    # Set termination occurence to true if yes
-    # Set end of seniority to today if no termination was issued
-    if termination_occurence == False:
-        termination_dt = arrow.now().shift(years=+3)
+    # Defaults for optional blocks
+    workdays_num = []
+    trial_dur = 1
+    termination_dt = None
+    notice_period = None
+    endpoint = "month"
+    trial_notice_period = 7
 
 
     output.set_processbar("bar", 0.3)
@@ -611,7 +956,8 @@ def emplaw_app():
         trial_period_data = input.input_group("", [
             input.checkbox(
                     lang("Workdays", "Arbeitstage"),
-                    ["Montag / Monday", "Dienstag / Tuesday", "Mittwoch / Wednesday", "Donnerstag / Thursday", "Freitag / Friday", "Samstag / Saturday", "Sonntag / Sunday"],
+                    options=[{"label": day, "value": index} for index, day in enumerate([
+                        "Montag / Monday", "Dienstag / Tuesday", "Mittwoch / Wednesday", "Donnerstag / Thursday", "Freitag / Friday", "Samstag / Saturday", "Sonntag / Sunday"])],
                     name="workdays_input",
                     required=True),
             # probation period
@@ -619,22 +965,24 @@ def emplaw_app():
                 lang(
                     "Duration of probation period (months)",
                     "Dauer Probezeit (Monate)"),
-                    [lang(
-                        "No mention of probation period",
-                        "Keine Angaben zur Probezeit"),
-                        "1", "2", "3",
-                    lang(
-                        "No probation period",
-                        "Keine Probezeit")],
+                    options=[{
+                        "label":lang("No mention of probation period", "Keine Angaben zur Probezeit"),
+                        "value":1
+                        },
+                        {"label":"1", "value":1},
+                        {"label":"2", "value":2},
+                        {"label":"3", "value":3},
+                        {
+                        "label":lang("No probation period", "Keine Probezeit"),
+                        "value":0}],
                     name="trial_input",
-                    type=input.TEXT,
                     required=True),
         ], validate = check_trial)
         # Declare variables from trial period
-        workdays_input = trial_period_data["workdays_input"]
-        trial_input = trial_period_data["trial_input"]
+        workdays_num = trial_period_data["workdays_input"]
+        trial_dur = trial_period_data["trial_input"]
         # Set trial relevance to false if no trial period was specified
-        if trial_input == lang("No probation period", "Keine Probezeit"):
+        if trial_dur == 0:
             trial_relevance = False
 
         output.set_processbar("bar", 0.5)
@@ -992,61 +1340,11 @@ def emplaw_app():
 
     # User input: Termination (block optional)
     if termination_occurence == True:
-        termination_data = input.input_group("", [
-            # Date of termination
-            input.input(
-                lang(
-                    "Date of termination notice receipt",
-                    "Datum Kündigungsempfang"),
-                name="termination_dt",
-                type=input.TEXT,
-                required=True,
-                pattern="[0-9]{2}\.[0-9]{2}\.(19|20)\d{2}$",
-                maxlength="10",
-                minlength="10",
-                placeholder="DD.MM.YYYY"),
-            # Duration of notice period
-            input.select(
-                lang(
-                    "Duration of notice period (months)",
-                    "Dauer der Kündigungsfrist (Monate)"),
-                [lang(
-                    "No mention of notice period",
-                    "Keine Angaben zur Kündigungsfrist"),
-                    "1", "2", "3", "4", "5", "6", "7", "8","9", "10", "11", "12"],
-                name="notice_period_input",
-                type=input.TEXT,
-                required=True),
-            # Cancellation end of month required
-            input.select(
-                lang(
-                    "Termination date",
-                    "Kündigungstermin"),
-                [lang(
-                    "No mention of termination date",
-                    "Keine Angaben zum Kündigungstermin"),
-                lang(
-                    "Termination date only end of week",
-                    "Kündungstermin nur auf Ende Woche"),
-                lang(
-                    "Termination date only end of month",
-                    "Kündigungstermin nur auf Ende Monat"),
-                lang(
-                    "Termination date only end of quarter",
-                    "Kündungstermin nur auf Ende Quartal"),
-                lang(
-                    "Termination date only end of year",
-                    "Kündungstermin nur auf Ende Jahr"),
-                lang(
-                    "Termination date anytime",
-                    "Kündungstermin jederzeit")],
-                name="endpoint",
-                type=input.TEXT,
-                required=True),
-        ], validate = check_form_termination)
+        termination_data = input.input_group("", termination_inputs(),
+            validate = partial(check_form_termination, employment_sdt=employment_sdt))
         # Variables: Termination
         termination_dt = arrow.get(termination_data["termination_dt"], "DD.MM.YYYY")
-        notice_period_input = termination_data["notice_period_input"]
+        notice_period = termination_data["notice_period_input"]
         endpoint = termination_data["endpoint"]
 
         output.set_processbar("bar", 0.9)
@@ -1067,1060 +1365,267 @@ def emplaw_app():
 
     # User input: Trial termination (block optional)
     if (termination_occurence == True) and (trial_relevance == True):
-        termination_data = input.input_group("", [
-            # Duration of notice period
-            input.select(
-                lang(
-                    "Duration of notice period for probation period (days)",
-                    "Dauer der Kündigungsfrist während der Probezeit (Tage)"),
-                [lang(
-                    "Not specified in contract",
-                    "Keine Angaben im Arbeitsvertrag"),
-                    "0", "1", "2", "3", "4", "5", "6", "7", "8","9", "10", "11", "12","13", "14", "15",
-                    "16", "17", "18", "19", "20", "21", "22", "23", "24", "25", "26", "27", "28", "29", "30"],
-                name="trial_notice_input",
-                type=input.TEXT,
-                required=True),
-        ])
+        termination_data = input.input_group("", trial_notice_inputs())
         # Variables: Trial termination
-        trial_notice_input = termination_data["trial_notice_input"]
+        trial_notice_period = termination_data["trial_notice_input"]
 
         output.set_processbar("bar", 1)
 
-    # --- DECLARE KNOWN VARIABLES, LISTS, DICTS --- #
-
-    # List structure: unequal indicies indicate start dates, equal ones end dates (starts from index 0)
-    # List manipulation is handled in pairs hereafter
-    # List for incapacities initiated above
-
-    # Lists and dicts with known input
-    reg_employment_lst = [employment_sdt, termination_dt]
-    trial_lst = [employment_sdt]
-
-    # List with seniority thresholds
-    # Create correponding sick pay dict
-    sickpay_dct = {}
-    syears = []
-    for i in range(0,35):
-        syears.append(employment_sdt.shift(years=i))
-        # Populate sick pay dict with emtpy lists (used later)
-        sickpay_dct[i] = []
-
-    # Empty lists
-    notice_period_lst = []
-    notice_comp_lst = []
-    notice_ext_lst = []
-    workdays_num = []
-    missed_workdays = []
-    repeated_workdays = []
-    holidays = []
-    embargo_negative = []
-    incap_masterlst = []
-    embargo_masterlst = []
-    sickpay_masterlst = []
-    master_lst = []
-
-    # Dics
-    embargo_dct = {}
-
-    # Deep copy incap dict into embargo dict
-    embargo_dct = copy.deepcopy(incap_dct)
-
-    # Prepare list of merged incap periods
-    # Flatten dictionary values
-    incap_masterlst = flat(list(incap_dct.values()))
-    # Remove empty nested lists
-    incap_masterlst = purify(incap_masterlst)
-    # Merge overlapping periods
-    incap_masterlst = merge(incap_masterlst)
-
-    # --- TRIAL PERIOD --- #
-
-    # Check if user selected trial period evaluation
-    if trial_relevance == True:
-
-        # Gather weekday numbers from user input
-        # Source: https://stackoverflow.com/a/70202124/14819955
-        weekday_mapping = {day: index for index, day in enumerate((
-        "Montag / Monday", "Dienstag / Tuesday", "Mittwoch / Wednesday", "Donnerstag / Thursday", "Freitag / Friday", "Samstag / Saturday", "Sonntag / Sunday"))}
-        for weekday in workdays_input:
-            workdays_num.append(weekday_mapping.get(weekday, weekday))
-
-
-        # Extract probation period duration from user input
-        if trial_input in ["No mention of probation period", "Keine Angaben zur Probezeit"]:
-            trial_dur = 1
-        else:
-            trial_dur = int(trial_input)
-
-        # Calculate probation period end date
-        trial_lst.insert(1, min(trial_lst[0].shift(months=+trial_dur), termination_dt)) # BGer 4C.45/2004
-        trial_lst[1] = subtract_corr(trial_lst[0], trial_lst[1])
-
-        # Assume no trial extension
-        trial_extension = False
-        # Check if any incapacity date lies within probation period
-        for incap_sublst in incap_masterlst:
-            for day in arrow.Arrow.range("day", incap_sublst[0], incap_sublst[1]):
-                if day.is_between(trial_lst[0], trial_lst[1], "[]"):
-                    trial_extension = True
-                    break
-
-        if trial_extension == True:
-            for incap_sublst in incap_masterlst:
-                
-                # Gather future holidays for 2 years
-                for day in arrow.Arrow.range("days", trial_lst[0], limit=730):
-                    if holiday_checker(day, workplace) == True:
-                        holidays.append(day)
-                                
-                # Gather working days during probation period
-                for day in arrow.Arrow.range("days", max(trial_lst[0], incap_sublst[0]), min(trial_lst[1], incap_sublst[1])):
-                    # Add date to list if it is a working day, not a holiday and not already in the list
-                    if (day.weekday() in workdays_num) and (day not in holidays) and (day not in missed_workdays):
-                        missed_workdays.append(day)
-
-                # Gather working days during probation period extension and match against amount of missed working days
-                for day in arrow.Arrow.range("days", max(trial_lst[1], incap_sublst[1]).shift(days=+1), limit=365):
-                    if (day.weekday() in workdays_num) and (day not in holidays) and (len(missed_workdays) > len(repeated_workdays)):
-                        repeated_workdays.append(day)
-
-                # Set extension end date
-                trial_lst[1] = min(repeated_workdays[-1], termination_dt) # cap at termination
-                    
-        # Shift regular employment start date to after trial period
-        reg_employment_lst[0] = trial_lst[-1].shift(days=+1)
-
-        # Count probation period extension
-        trial_extension_dur = len(missed_workdays)
-    else:
-        trial_extension_dur = 0
-
-
-    # --- CASE: ILLNESS OR ACCIDENT --- #
-
-    # Selected case type
-    if incapacity_type == "illacc":
-
-        # Loop through incapacities by incapacity
-        for key, value in embargo_dct.items():
-
-            # Keep score of embargo days for each incap
-            embargo_cap_loop = 30 # start with lowest
-            embargo_claimed_loop = 0
-            embargo_unclaimed_loop = 0
-
-            # Iterate over sublists
-            for embargo_sublst in value:
-
-                # Skip empty lists
-                if embargo_sublst == []:
-                    continue
-
-                # Only check new lists, skip other lists
-                if embargo_sublst in embargo_negative:
-                    continue
-
-                # Continue with next iteration if incapacitiy start date lies before the beginning of employment, empty sublist
-                if reg_employment_lst[0] >= embargo_sublst[1]:
-                    embargo_sublst.clear() # Clear list
-                    continue
-
-                # Set embargo cap according to seniority at beginning of incapacity
-                if embargo_sublst[0] < syears[1]:
-                    embargo_cap_loop = 30 # cap at 29 days incl. start and end date
-                elif embargo_sublst[0] >= syears[5]:
-                    embargo_cap_loop = 180 # cap at 180 days incl. start and end date
-                else:
-                    embargo_cap_loop = 90 # cap at 90 days incl. start and end date
-
-                # Skip if embargo_cap has been exceeded
-                if embargo_claimed_loop >= embargo_cap_loop:
-                    embargo_sublst.clear()
-                    continue
-
-                # Count unclaimed days, max 1 since 1 day will be subtracted
-                embargo_unclaimed_loop = max(1, (embargo_cap_loop - embargo_claimed_loop))
-
-                # Set embargo start date
-                embargo_sublst[0] = max(reg_employment_lst[0], embargo_sublst[0]) # starts on reg employment at the earliest
-
-                # Check if service year 1, 5 is crossed during embargo period, adjust embargo cap
-                if syears[1].is_between(embargo_sublst[0], embargo_sublst[1], "[)"):
-                    crossed_syear = 1
-                    embargo_cap_loop = 90 # cap at 90 days incl. start and end date
-                elif syears[5].is_between(embargo_sublst[0], embargo_sublst[1], "[)"):
-                    crossed_syear = 5
-                    embargo_cap_loop = 180 # cap at 180 days incl. start and end date
-                else:
-                    # Set embargo end date into embargo dict, max date after cap is reached
-                    embargo_sublst[1] = min(embargo_sublst[0].shift(days=(embargo_unclaimed_loop - 1)), embargo_sublst[1])
-                    # Count used days
-                    embargo_claimed_loop = period_duration(embargo_sublst[0], embargo_sublst[1])
-                    # Skip syear cleanup
-                    crossed_syear = 0
-
-                # Split embargo period if seniority threshold is crossed during embargo period
-                # Put split embargo periods into dict key 11, 12, 13...
-                if crossed_syear != 0:
-                
-                    # Save original end date
-                    save_date_embargo_split = embargo_sublst[1]
-                    # Set end of first period, max one day before syear change
-                    embargo_sublst[1] = min(embargo_sublst[0].shift(days=(embargo_unclaimed_loop - 1)), syears[crossed_syear].shift(days=-1))
-                    # Calculate used balance
-                    embargo_claimed_loop += period_duration(embargo_sublst[0], embargo_sublst[1])
-                    # Count unclaimed days
-                    embargo_unclaimed_loop = max(1, (embargo_cap_loop - embargo_claimed_loop))
-
-                    # Insert new list
-                    new_embargo_sublist = []
-                    value.insert((value.index(embargo_sublst) + 1), new_embargo_sublist)
-                    # Set start of second period at syear change
-                    new_embargo_sublist.insert(0, syears[crossed_syear])
-                    # Set end of second period
-                    new_embargo_sublist.insert(1, min(new_embargo_sublist[0].shift(days=(embargo_unclaimed_loop - 1)), save_date_embargo_split))
-                    # Add to negative list to test against
-                    embargo_negative.append(new_embargo_sublist)
-                    # Count used days
-                    embargo_claimed_loop += period_duration(new_embargo_sublist[0], new_embargo_sublist[1])
-
-
-    # --- CASE: MILITARY OR CIVIL SERVICE --- #
-
-    # Selected case type
-    if incapacity_type == "milservice":
-        for key, value in embargo_dct.items():
-            for embargo_sublst in value:
-
-                # Check if milservice duration was over 11 days
-                milservice_dur = period_duration(embargo_sublst[0], embargo_sublst[1])
-                if milservice_dur > 11:
-                    # Set embargo start to 4 weeks prior
-                    embargo_sublst[0] = embargo_sublst[0].shift(weeks=-4, days=-1)
-                    # Set embargo end to 4 weeks after
-                    embargo_sublst[1] = embargo_sublst[1].shift(weeks=+4, days=+1)
-
-                # Delete if embargo ended before regular employment
-                if reg_employment_lst[0] >= embargo_sublst[1]:
-                    embargo_sublst.clear() # Clear list
-                    continue
-
-                # Set embargo beginning at start of reg employment
-                embargo_sublst[0] = max(reg_employment_lst[0], embargo_sublst[0])
-
-                # Forward beginning to regular employment end date
-                if reg_employment_lst[0] >= embargo_sublst[0]:
-                    embargo_sublst[0] = reg_employment_lst[0]
-
-                # Set sick pay (Erwerbsersatz) during milservice, calculate total
-                sickpay_dct[1] = [[embargo_sublst[0], embargo_sublst[1]]]
-
-
-    # --- CASE: PREGNANCY --- #
-
-    # Selected case type
-    if incapacity_type == "preg":
-        for key, value in embargo_dct.items():
-            for embargo_sublst in value:
-                
-                # Set sick pay (maternity pay) to 14 weeks after confinement
-                sickpay_dct[1] = [[embargo_sublst[1], embargo_sublst[1].shift(weeks=14)]]
-                
-                # Extend embargo to 16 weeks after confinement
-                embargo_sublst[1] = embargo_sublst[1].shift(weeks=16, days=-1)
-                sick_pay_claimed_total = period_duration(embargo_sublst[0], embargo_sublst[1])
-
-                # Delete if embargo ended before regular employment
-                if reg_employment_lst[0] >= embargo_sublst[1]:
-                    embargo_sublst.clear() # Clear list
-                    continue
-
-                # Set embargo beginning at start of reg employment
-                embargo_sublst[0] = max(reg_employment_lst[0], embargo_sublst[0])
+    # --- EVALUATION --- #
+
+    case = EmploymentCase(
+        employment_sdt=employment_sdt,
+        workplace=workplace,
+        incapacity_type=incapacity_type,
+        incap_dct=incap_dct,
+        trial_relevance=trial_relevance,
+        workdays_num=workdays_num,
+        trial_dur=trial_dur,
+        termination_occurence=termination_occurence,
+        termination_dt=termination_dt,
+        notice_period=notice_period,
+        endpoint=endpoint,
+        trial_notice_period=trial_notice_period)
+    evaluate_and_put(case)
+
+
+# --- SINGLE FORM --- #
+
+# Function to create a date field of the single form
+def date_input(label, name, required=False):
+    return input.input(
+        label,
+        name=name,
+        type=input.TEXT,
+        required=required,
+        pattern="[0-9]{2}\.[0-9]{2}\.(19|20)\d{2}$",
+        maxlength="10",
+        minlength="10",
+        placeholder="DD.MM.YYYY")
+
+# Function to get the positions of option values in a select (the browser only knows the selected index)
+def option_indexes(options, values):
+    return [index for index, option in enumerate(options) if option["value"] in values]
+
+# Function to get the field names of an incapacity in the single form
+# Incapacity 1 keeps the names of the sequential form, the others are prefixed with their number
+def illacc_names(number):
+    prefix = "illacc_" if number == 1 else f"illacc_{number}_"
+    return [f"{prefix}{bound}_{i}" for i in range(1, 4) for bound in ["sdt", "edt"]]
+
+# Function to show only the fields of the single form that apply to the selected case options
+# Rules map a field name to conditions, each a select name and the selected indexes for which the field is shown
+def show_conditional_fields(rules):
+    session.run_js("""
+        function piccolawField(name) {
+            return document.querySelector('[id^="' + name + '-"], [name="' + name + '"]');
+        }
+        function piccolawUpdate() {
+            for (const [name, conditions] of Object.entries(rules)) {
+                const field = piccolawField(name);
+                if (!field) continue;
+                const shown = conditions.every(([select, indexes]) => {
+                    const element = piccolawField(select);
+                    return element && indexes.includes(element.selectedIndex);
+                });
+                field.closest(".form-group").style.display = shown ? "" : "none";
+            }
+        }
+        document.addEventListener("change", piccolawUpdate);
+        const piccolawPoll = setInterval(() => {
+            if (piccolawField("employment_sdt")) {
+                clearInterval(piccolawPoll);
+                piccolawUpdate();
+            }
+        }, 50);
+        """, rules=rules)
+
+# Validate single form
+# Only the blocks that apply to the selected case options are checked, with the validators of the sequential form
+def check_form_single(data):
+    error = check_form_employment(data)
+    if error:
+        return error
+    if not data["terms"]:
+        return ("terms", lang("ERROR: Please agree to the terms", "ERROR: Bitte stimme den Bedingungen zu"))
+    error = check_case_comb(data)
+    if error:
+        return error
+    if data["trial_relevance"] == True:
+        error = check_trial(data)
+        if error:
+            return error
+    for fields in incap_fields(data):
+        # Check each incapacity under the field names of the first one and report errors on the original field
+        renamed = dict(zip(illacc_names(1), fields))
+        error = check_form_incapacity({key: data[name] for key, name in renamed.items()})
+        if error:
+            return (renamed.get(error[0], error[0]), error[1])
+    if data["termination_occurence"] == True:
+        return check_form_termination(data, employment_sdt=arrow.get(data["employment_sdt"], "DD.MM.YYYY"))
+
+# Function to get the field names of each incapacity entered in the single form
+def incap_fields(data):
+    if data["incapacity_type"] == "illacc":
+        return [illacc_names(number) for number in range(1, data["illacc_amount"] + 1)]
+    elif data["incapacity_type"] in ["milservice", "preg"]:
+        return [[data["incapacity_type"] + "_sdt", data["incapacity_type"] + "_edt"]]
+    return []
+
+# Alternative to emplaw_app: all inputs in a single form, fields are shown or hidden in the browser
+# The case is submitted at once instead of with up to eight sequential forms
+def emplaw_form_app():
 
-                # Forward beginning to regular employment end date
-                if reg_employment_lst[0] >= embargo_sublst[0]:
-                    embargo_sublst[0] = reg_employment_lst[0]
-
-
-    # --- Cleanup --- #
-
-    # Prepare list of merged embargo periods
-    # Flatten dictionary values
-    embargo_masterlst = flat(list(embargo_dct.values()))
-    # Remove empty nested lists
-    embargo_masterlst = purify(embargo_masterlst)
-    # Merge overlapping periods
-    embargo_masterlst = merge(embargo_masterlst)
-
-
-    # --- TERMINATION AND NOTICE PERIOD --- #
-
-    # Check if user selected termination evaluation
-    if termination_occurence == True:
-
-        # Legal minimum notice period according to seniority
-        if notice_period_input in ["No mention of notice period", "Keine Angaben zur Kündigungsfrist"]:
-            if termination_dt < syears[1]:
-                notice_period = 1
-            elif termination_dt >= syears[5]:
-                notice_period = 3
-            else:
-                notice_period = 2
-        else:
-            notice_period = int(notice_period_input)
-
-        # Calculate regular employment period end date
-        reg_employment_lst[1] = push_endpoint(reg_employment_lst[1], endpoint)
-
-        # Determine notice period start date (BGE 134 III 354)
-        notice_period_lst.insert(0, reg_employment_lst[1].shift(days=1))
-
-        # Determine notice period end date
-        notice_period_lst.insert(1, reg_employment_lst[1].shift(months=+notice_period))
-
-        # Push notice period end date if required
-        notice_period_lst[1] = push_endpoint(notice_period_lst[1], endpoint)
-
-        # Backwards check of notice period duration, truncate
-        while notice_period_lst[0].shift(months=+notice_period) < notice_period_lst[1]:
-            notice_period_lst[0] = notice_period_lst[0].shift(months=+1)
-            reg_employment_lst[1] = notice_period_lst[0].shift(days=-1)
-
-        # Calculate new employment end date
-        new_employment_edt = notice_period_lst[-1]
-
-        # Only calculate if incap has occured
-        if incapacity_type != False:
+    # --- SESSION CONTROL --- #
+    session.set_env(input_panel_fixed=False,
+                    output_animation=False)
 
-            # Calculate total notice overlap, i.e. how many days of original notice period were missed
-            notice_overlap = 0
-            # Duration of original notice period
-            for embargo_sublst in embargo_masterlst:
-                notice_overlap += overlap_calc(notice_period_lst[0], embargo_sublst[0], notice_period_lst[1], embargo_sublst[1])
+    # --- INPUT --- #
 
+    put_intro()
 
-            # Shift missed notice period days, start and end date
-            if notice_overlap != 0:
+    with output.use_scope("scope_input_instructions", clear=True):
+        output.put_markdown(lang("""
+            ### Case
 
-                notice_comp_lst.append(notice_period_lst[1].shift(days=+1))
-                notice_comp_lst.append(notice_period_lst[1].shift(days=+notice_overlap))
-                # Handle consecutive interruptions of notice period
-                notice_comp_lst = grow(notice_comp_lst, embargo_masterlst) 
+            Please enter the employment data and select the case options you would like to evaluate. The form shows the fields required for the selected options.
 
-                # Create extension if needed
-                if not endpoint in ["Termination date anytime", "Kündigungstermin jederzeit"]:
-                    notice_ext_lst.insert(0, notice_comp_lst[1].shift(days=+1))
-                    notice_ext_lst.insert(1, push_endpoint(notice_comp_lst[1], endpoint))
-                    single_date(notice_ext_lst, 0, 1)
-                    new_employment_edt = notice_ext_lst[1]
-                else:
-                    new_employment_edt = notice_comp_lst[1]
-        
-        # Set variables if no incaps were given
-        else:
-            notice_overlap = 0
+            Notes:
+            - The first day fully available to the parties counts as first day of work.
+            - Enter periods of incapacity in chronological order and leave unused fields empty.
+            - Format for all date inputs: DD.MM.YYYY (e.g. 01.01.2020, 16.05.2020, 07.12.2020)
+            ""","""
+            ### Fall
 
-    # Set termination date to regular employment endt date if no termination date was given
-    else: 
-        notice_overlap = 0
-        new_employment_edt = termination_dt
-        termination_dt = termination_dt.shift(years=200) # Shift out of sight
+            Bitte trage die Angaben zum Arbeitsverhältnis ein und wähle die auszuwertende Fallkonstellation. Das Formular zeigt die für die gewählte Konstellation nötigen Felder an.
 
+            Hinweise:
+            - Als Tag des Stellenatritts gilt der vollumfänglich verfügbare, erste Arbeitstag.
+            - Trage Perioden der Arbeitsunfähigkeit in chronologischer Reihenfolge ein und lasse ungenutzte Felder leer.
+            - Format für alle Datumsangaben: DD.MM.YYYY (bspw. 01.01.2020, 16.05.2020, 07.12.2020).
+            """))
 
-    # --- SICK PAY --- #
+    incapacity_options = [
+        {"label":lang("No incapacity","Keine Arbeitsunfähigkeit"), "value":False},
+        {"label":lang("accident or illness","Unfall oder Krankheit"), "value":"illacc"},
+        {"label":lang("military or civil service", "Militär, Schutz- oder Zivildienst"), "value":"milservice"},
+        {"label":lang("pregnancy", "Schwangerschaft"), "value":"preg"}]
+    yes_no_options = [
+        {"label":lang("No", "Nein"), "value":False},
+        {"label":lang("Yes", "Ja"), "value":True}]
+    amount_options = [
+        {"label":lang("One single accident or illness", "Einzelner Unfall oder Krankheit"), "value":1},
+        {"label":lang("Two seperate accidents or illnesses", "Zwei unabhängige Unfälle oder Krankheiten"), "value":2},
+        {"label":lang("Three seperate accidents or illnesses", "Drei unabhängige Unfälle oder Krankheiten"), "value":3}]
+    trial_options = [
+        {"label":lang("No mention of probation period", "Keine Angaben zur Probezeit"), "value":1},
+        {"label":"1", "value":1},
+        {"label":"2", "value":2},
+        {"label":"3", "value":3},
+        {"label":lang("No probation period", "Keine Probezeit"), "value":0}]
+
+    # Conditions for the fields of the optional blocks
+    illacc = ["incapacity_type", option_indexes(incapacity_options, ["illacc"])]
+    trial = ["trial_relevance", option_indexes(yes_no_options, [True])]
+    termination = ["termination_occurence", option_indexes(yes_no_options, [True])]
+    rules = {"illacc_amount": [illacc], "workdays_input": [trial], "trial_input": [trial]}
+    for number in range(1, 4):
+        amount = ["illacc_amount", option_indexes(amount_options, range(number, 4))]
+        rules.update({name: [illacc, amount] for name in illacc_names(number)})
+    for incapacity_type in ["milservice", "preg"]:
+        condition = ["incapacity_type", option_indexes(incapacity_options, [incapacity_type])]
+        rules.update({incapacity_type + "_sdt": [condition], incapacity_type + "_edt": [condition]})
+    rules.update({name: [termination] for name in ["termination_dt", "notice_period_input", "endpoint"]})
+    rules["trial_notice_input"] = [termination, trial, ["trial_input", option_indexes(trial_options, [1, 2, 3])]]
+    show_conditional_fields(rules)
+
+    # Fields of all blocks, the optional ones are not required in the browser and checked by check_form_single
+    fields = [
+        input.checkbox(
+            lang("Terms and conditions", "Nutzungsbedingungen"),
+            options=[{"label":lang("I agree", "Ich stimme zu"), "value":True}],
+            name="terms"),
+        date_input(lang("First day of work (DD.MM.YYYY)", "Tag des Stellenatritts (DD.MM.YYYY)"), "employment_sdt", required=True),
+        input.select(
+            lang("Place of work (canton)", "Arbeitsort (Kanton)"),
+            ["AG", "AI", "AR", "BS", "BL", "BE", "FR", "GE", "GL", "GR", "JU", "LU", "NE", "NW",
+            "OW", "SH", "SZ", "SO", "SG", "TG", "TI", "UR", "VS", "VD", "ZG", "ZH"],
+            name="workplace",
+            required=True),
+        input.select(lang("Type of incapacity", "Art der Arbeitsunfähigkeit"), options=incapacity_options, name="incapacity_type", required=True),
+        input.select(lang("Evaluation of probation period", "Auswertung Probezeit"), options=yes_no_options, name="trial_relevance", required=True),
+        input.select(lang("Evaluation of termination", "Auswertung Kündigung"), options=yes_no_options, name="termination_occurence", required=True),
+        input.select(
+            lang("Number of Seperate Incapacities (Illness or Accident)", "Anzahl unabhängiger Arbeitsunfähigkeiten (Krankheit oder Unfall)"),
+            options=amount_options,
+            name="illacc_amount"),
+        input.checkbox(
+            lang("Workdays", "Arbeitstage"),
+            options=[{"label": day, "value": index} for index, day in enumerate([
+                "Montag / Monday", "Dienstag / Tuesday", "Mittwoch / Wednesday", "Donnerstag / Thursday", "Freitag / Friday", "Samstag / Saturday", "Sonntag / Sunday"])],
+            name="workdays_input"),
+        input.select(lang("Duration of probation period (months)", "Dauer Probezeit (Monate)"), options=trial_options, name="trial_input"),
+    ]
+    for number in range(1, 4):
+        for name in illacc_names(number):
+            period = name[-1]
+            fields.append(date_input(
+                lang(
+                    f"Incapacity {number}, period {period} - " + ("start" if "_sdt_" in name else "end"),
+                    f"Arbeitsunfähigkeit {number}, Periode {period} - " + ("Beginn" if "_sdt_" in name else "Ende")),
+                name))
+    fields += [
+        date_input(lang("Start of service", "Dienstbeginn"), "milservice_sdt"),
+        date_input(lang("End of service", "Dienstende"), "milservice_edt"),
+        date_input(lang("Start date of pregnancy", "Datum des Schwangerschaftsbeginns"), "preg_sdt"),
+        date_input(lang("Date of confinement", "Datum der Niederkunft"), "preg_edt"),
+    ]
+    fields += termination_inputs(required=False) + trial_notice_inputs()
+
+    data = input.input_group("", fields, validate=check_form_single)
+
+    # --- EVALUATION --- #
+
+    trial_relevance = data["trial_relevance"]
+    termination_occurence = data["termination_occurence"]
+    # Defaults for optional blocks, as in emplaw_app
+    workdays_num = []
+    trial_dur = 1
+    termination_dt = None
+    notice_period = None
+    endpoint = "month"
+    trial_notice_period = 7
 
-    if incapacity_type == "illacc":
+    if trial_relevance == True:
+        workdays_num = data["workdays_input"]
+        trial_dur = data["trial_input"]
+        # Set trial relevance to false if no trial period was specified
+        if trial_dur == 0:
+            trial_relevance = False
 
-        # Sick pay matrix, starting after first year of service
-        # Source: https://www.gerichte-zh.ch/themen/arbeit/waehrend-arbeitsverhaeltnis/arbeitsverhinderung/krankheit-und-unfall.html
-        # Include placeholder for index 0 since it is 3 weeks for all cantons
-        pay_matrix = [
-            ["", 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42], # ZH (weeks)
-            ["", 1, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 6, 6 ,6, 6, 6 ,6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6], # BS / BL (months)
-            ["", 1, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 6 ,6, 6, 6 ,6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6], # BE (months)
-        ]
-
-        # Choose sick pay duration
-        if workplace in ["ZH", "SH", "TG"]:
-            canton = 0
-            unit = "weeks"
-        elif workplace in ["BS", "BL"]:
-            canton = 1
-            unit = "months"
-        else:
-            canton = 2
-            unit = "months"
-
-        # Split sick pay periods into years
-        for key, value in incap_dct.items():
-            for incap_sublst in value:
-
-                # Skip empty lists
-                if incap_sublst == []:
-                    continue
-
-                # Skip sublists that end before beginning of claim
-                if employment_sdt.shift(months=+3) >= incap_sublst[1]:
-                    continue
-
-                sickpay_sublst_1 = copy.deepcopy(incap_sublst)
-                sickpay_sublst_2 = []
-                
-                # Define sick pay start date max 3 months into employment
-                sickpay_sublst_1[0] = max(employment_sdt.shift(months=+3), sickpay_sublst_1[0])
-
-                # Calculate seniority at the beginning of the incapacity
-                # Source: https://stackoverflow.com/a/70038244/14819955
-                sick_pay_syear_start_index = get_last_index(syears, lambda x: x < sickpay_sublst_1[0]) + 1 # +1 to denote year 0 as first syear
-
-                # Calculate seniority at the end of the incapacity
-                sick_pay_syear_end_index = get_last_index(syears, lambda x: x < sickpay_sublst_1[1]) + 1 # +1 to denote year 0 as first syear
-
-                # Compare seniority at start and end, split if not the same
-                # Group into dict according to start year
-                if sick_pay_syear_start_index != sick_pay_syear_end_index: # not in the same year
-                    # Hold original enddate
-                    save_date_sick_pay_split = sickpay_sublst_1[1]
-                    # Cap first period a day before syear
-                    sickpay_sublst_1[1] = min(sickpay_sublst_1[1], syears[sick_pay_syear_start_index].shift(days=-1))
-                    # Split period after syear
-                    sickpay_sublst_2.insert(0, syears[sick_pay_syear_start_index])
-                    sickpay_sublst_2.insert(1, save_date_sick_pay_split)
-                    # Sort second period into dict according to syear
-                    sickpay_dct[sick_pay_syear_end_index].append(sickpay_sublst_2)
-
-                # Sort first period into dict according to syear
-                sickpay_dct[sick_pay_syear_start_index].append(sickpay_sublst_1)
-
-        # Keep score of total
-        sick_pay_claimed_total = 0
-        # Loop through incapacities according to syear
-        for key, value in sickpay_dct.items():
-
-            # Keep score of sick pay for each loop (year)
-            sick_pay_cap = 21 # start with lowest lowest
-            sick_pay_claimed_loop = 0
-            sick_pay_unclaimed_loop = 0
-
-            # Iterate over sublists
-            for sickpay_sublst in value:
-
-                # Skip empty lists
-                if sickpay_sublst == []:
-                    continue
-
-                # Calculate sick pay according to service year
-                if syears[key] == syears[1]:
-                    sick_pay_cap = period_duration(sickpay_sublst[0], sickpay_sublst[0].shift(weeks=+3, days=-1))
-                else:
-                    # Add +1 to move query to the right index in sick pay matrix
-                    sick_pay_cap = period_duration(sickpay_sublst[0], sickpay_sublst[0].shift(**{unit:(pay_matrix[canton][key - 1])}, days=-1))
-
-                # Check if cap has been exceeded
-                if sick_pay_claimed_loop >= sick_pay_cap:
-                    sickpay_sublst.clear() # Clear list
-                    continue
-
-                # Calculate sick pay unclaimed
-                sick_pay_unclaimed_loop = max(1, (sick_pay_cap - sick_pay_claimed_loop))
-
-                # Set sick pay end date, cap sick pay at the earliest relevant occurence
-                sickpay_sublst[1] = min(sickpay_sublst[0].shift(days=+sick_pay_unclaimed_loop - 1), sickpay_sublst[1], new_employment_edt)
-
-                # Count used sick days
-                sick_pay_claimed_loop += period_duration(sickpay_sublst[0], sickpay_sublst[1])
-
-                # Count total
-                sick_pay_claimed_total += sick_pay_claimed_loop
-
-        # Delete empty syear keys from dict
-        for key in list(sickpay_dct.keys()):
-            if sickpay_dct[key] == []:
-                del sickpay_dct[key]
-
-    # Merge overlapping dictionary values for each year
-    # Prepare list of merged embargo periods
-    # Flatten dictionary values
-    sickpay_masterlst = flat(list(sickpay_dct.values()))
-    # Remove empty nested lists
-    sickpay_masterlst = purify(sickpay_masterlst)
-    # Merge overlapping periods
-    sickpay_masterlst = merge(sickpay_masterlst)
-
-
-    # --- EVALUATION AND CLEANUP --- #
+    # Sort dates into incap dict as list pairs, one key per incapacity
+    incap_dct = {}
+    for number, names in enumerate(incap_fields(data), start=1):
+        incap_dct[number] = populate_dct({name: data[name] for name in names})
 
-    # Output
-    valid_termination  = lang("✅ Termination is valid.", "✅ Kündigung ist gültig.")
-    invalid_termination = lang("⛔ TERMINATION IS INVALID.", "⛔ KÜNDIGUNG UNGÜLTIG")
-    no_termination = lang("[--> No termination evaluated]", "[--> Keine Kündigung evaluiert]")
-
-    # Standard case
-    # Termination during prbation period
-    if termination_occurence == False:
-        termination_case = "no_case"
-    # Termination without issue
     if termination_occurence == True:
-        termination_case = "standard_case"
-    # Termination during trial
-    if (termination_occurence == True) and termination_dt.is_between(trial_lst[0], trial_lst[-1], "[]"):
-        termination_case = "trial_case"
-    # Termination during embargo period
-    if (termination_occurence == True) and (incapacity_type != False):
-        for embargo_sublst in embargo_masterlst:
-            if termination_dt.is_between(embargo_sublst[0], embargo_sublst[-1], "[]"):
-                termination_case = "embargo_case"
-                break
-
-
-    # --- Termination case: No case --- #
-
-    if termination_case == "no_case":
-        termination_validity = no_termination
-        reason = lang("[--> No termination evaluated]", "[--> Keine Kündigung ausgewertet]")
-        new_employment_edt = lang("[--> No termination evaluated]", "[--> Keine Kündigung ausgewertet]")
-
-    # --- Termination case: Standard case --- #
-
-    if termination_case == "standard_case":
-        termination_validity = valid_termination
-        reason = lang("Regular termination of employment.", "Ordentliche Kündigung des Arbeitsverhältnisses.")
-
-    # --- Termination case: TERMINATION DURING TRIAL PERIOD --- #
-
-    # Adjust varibles
-    if termination_case == "trial_case":
-        termination_validity = valid_termination
-        reason = lang("Termination during probation period.", "Kündigung während Probezeit.")
-
-        # Set notice period according to user input
-        if (trial_notice_input == "Not specified in contract") or (trial_notice_input == "Keine Angaben im Arbeitsvertrag"):
-            trial_notice_period = 7
-        else:
-            trial_notice_period = int(trial_notice_input)
-
-        # Set end of trial period to termination date
-        trial_lst[1] = termination_dt
-        # Adjust notice period
-        notice_period_lst[0] = termination_dt.shift(days=+1)
-        notice_period_lst[1] = termination_dt.shift(days=+trial_notice_period)
-        notice_ext_lst.clear()
-        notice_comp_lst.clear()
-        notice_overlap = 0
-        reg_employment_lst.clear()
-        embargo_dct.clear()
-        embargo_masterlst.clear()
-        new_employment_edt = notice_period_lst[-1]
-
-
-    # --- Termination case: TERMINATION DURING EMBARGO PERIOD --- #
-
-    # Adjust varibles
-    if termination_case == "embargo_case":
-        termination_validity = invalid_termination
-        reason = lang("The termination was issued during an embargo period.", "Die Kündigung wurde während einer Sperrfrist ausgesprochen.")
-        notice_period_lst.clear()
-        notice_overlap = 0
-        reg_employment_lst[1] = reg_employment_lst[1].shift(years=+3) # showing that employment continues
-        notice_comp_lst.clear()
-        notice_ext_lst.clear()
-        new_employment_edt = lang("[--> No valid termination]", "[--> Keine gültige Kündigung]")
-
-    # --- Cleanup sick pay and embargo periods --- #
-    # Delete sick pay and embargo periods after valid terminatio
-    if (termination_case == "standard_case") or (termination_case == "trial_case"):
-        for sickpay_sublst in sickpay_masterlst:
-
-            # Delete sick pay that starts after end of employment
-            if sickpay_sublst[0] > new_employment_edt:
-                sickpay_sublst.clear() # Clear list
-                continue
-
-            # Cap sick pay that surpasses end of employment
-            if new_employment_edt.is_between(sickpay_sublst[0], sickpay_sublst[1], "[]"):
-                sickpay_sublst[1] = new_employment_edt
-                continue
-
-        for embargo_sublst in embargo_masterlst:
-
-            # Delete embargo that starts after end of employment
-            if embargo_sublst[0] > new_employment_edt:
-                embargo_sublst.clear()
-                continue
-
-        sickpay_masterlst = purify(sickpay_masterlst)    
-        embargo_masterlst = purify(embargo_masterlst)
-
-
-    # --- OUTPUT SUMMARY --- #
-
-    session.set_env(output_max_width = "1080px")
-
-    # Remove progress bar
-    output.remove("scope_progress")    
-    output.clear("scope_input_instructions")
-
-    # Summary of most important datapoints
-    with output.use_scope("scope_res_general"):
-
-        output.put_markdown(lang("""## Key Results""", """## Wichtigste Resultate""")).style('margin-top: 20px'),
-
-        if termination_occurence != False:
-            output.put_row([
-                output.put_markdown(lang("""**Validity of Termination:**""", """**Gültigkeit Kündigung:**""")),
-                output.put_markdown(termination_validity),
-            ], size="35% auto auto")
-            output.put_row([
-                output.put_markdown(lang("""**Reason:**""", """**Begründung:**""")),
-                output.put_markdown(reason),
-            ], size="35% auto auto")
-
-        if trial_relevance != False:
-            output.put_row([
-                output.put_markdown(lang("""**Missed Workdays Probation Period:**""", """**Verpasste Arbeitstage Probezeit:**""")),
-                output.put_markdown(str(trial_extension_dur)),
-            ], size="35% auto auto")
-            output.put_row([
-                output.put_markdown(lang("""**Probation Period End Date:**""", """**Enddatum Probezeit:**""")),
-                output.put_markdown(trial_lst[-1].format("DD.MM.YYYY")),
-            ], size="35% auto auto")
-
-        if termination_occurence != False:
-            output.put_row([
-                output.put_markdown(lang("""**Compensation Days Notice Period:**""", """**Kompensationstage Kündigungsfrist:**""")),
-                output.put_markdown(str(notice_overlap)),
-            ], size="35% auto auto")
-            output.put_row([
-                output.put_markdown(lang("""**Employment End Date:**""", """**Enddatum Anstellung:**""")),
-                output.put_markdown(new_employment_edt.format("DD.MM.YYYY")),
-            ], size="35% auto auto")
-
-        if (termination_occurence == False) and (trial_relevance == False):
-            output.put_row([
-                output.put_markdown(lang("""**[--> See below for detailed results.]**""", """**[--> Siehe detaillierte Auflistung unten]**""")),
-            ])
-
-    # Start of detailed results
-
-    # Scope for the summary of the trial period
-    with output.use_scope("scope_res_trial"):
-
-        output.put_markdown(lang("""## Detailed Results """, """## Detaillierte Ergebnisse""")).style('margin-top: 30px')
-        output.put_markdown(lang("""### Probation Period""", """### Probezeit""")).style('margin-top: 20px')
-
+        termination_dt = arrow.get(data["termination_dt"], "DD.MM.YYYY")
+        notice_period = data["notice_period_input"]
+        endpoint = data["endpoint"]
         if trial_relevance == True:
-
-            tbl_trial = Table()
-            tbl_trial_headers = [
-                lang("", ""),
-                lang("Start", "Start"),
-                lang("End", "Ende"),
-                lang("Duration", "Dauer"),
-            ]
-            tbl_trial_rows = [[lang("Probation Period", "Probezeit"), trial_lst[0].format("DD.MM.YYYY"), trial_lst[1].format("DD.MM.YYYY"), str(period_duration(trial_lst[0], trial_lst[1])) + lang(" days", " Tage")]]
-
-            tbl_trial.add(tbl_trial_headers, tbl_trial_rows)
-
-            output.put_html(tbl_trial.render_notebook()).style('margin-top: 40px')
-        
-        else:
-            output.put_markdown(lang("""**[--> No probation period evaluated]**""", """**[--> Keine Probezeit ausgewertet]**""")),
-
-    # Scope for the summary of incapacities as declared by user input
-    with output.use_scope("scope_res_incap"):
-
-        output.put_markdown(lang("""### Incapacities (Your Input)""", """### Arbeitsunfähigkeiten (Dein Input)""")).style('margin-top: 20px')
-
-        if incapacity_type != False:
-
-            tbl_incap_headers = [
-                lang("No.", "Nr."),
-                lang("Start", "Start"),
-                lang("End", "Ende"),
-                lang("Duration", "Dauer"),
-            ]
-
-            tbl_incap = Table()
-            tbl_incap_rows = []
-            
-            # List incapacities (dict is used for incap number)
-            for key, value in incap_dct.items():
-                for incap_sublst in value:
-                    if incap_sublst != []:
-                        tbl_lst = []
-                        tbl_lst.append(str(key) + "." + str(value.index(incap_sublst)))
-                        tbl_lst.append(incap_sublst[0].format("DD.MM.YYYY"))
-                        tbl_lst.append(incap_sublst[1].format("DD.MM.YYYY"))
-                        tbl_lst.append(str(period_duration(incap_sublst[0], incap_sublst[1])) + lang(" days", " Tage"))
-                        tbl_incap_rows.append(tbl_lst)
-
-            tbl_incap.add(tbl_incap_headers, tbl_incap_rows)
-
-            output.put_html(tbl_incap.render_notebook()).style('margin-top: 40px')
-
-        else:
-            output.put_markdown(lang("""**[--> No incapacities evaluated]**""", """**[--> Keine Arbeitsunfähigkeiten ausgewertet]**""")),
-
-    # Scope for the summary of any embargo periods
-    with output.use_scope("scope_res_embargo_merged"):
-
-        output.put_markdown(lang("""### Embargo Periods""", """### Sperrfristen""")).style('margin-top: 20px')
-
-        if incapacity_type != False:
-
-            tbl_embargo = Table()
-            tbl_embargo_rows = []
-
-            # Count
-            i = 1
-            for embargo_sublst in embargo_masterlst:
-                tbl_lst = []
-                tbl_lst.append(str(i))
-                tbl_lst.append(embargo_sublst[0].format("DD.MM.YYYY"))
-                tbl_lst.append(embargo_sublst[1].format("DD.MM.YYYY"))
-                tbl_lst.append(str(period_duration(embargo_sublst[0], embargo_sublst[1])) + lang(" days", " Tage"))
-                tbl_embargo_rows.append(tbl_lst)
-                i += 1
-
-            tbl_embargo.add(tbl_incap_headers, tbl_embargo_rows)
-
-            output.put_html(tbl_embargo.render_notebook()).style('margin-top: 40px')
-
-        else:
-            output.put_markdown(lang("""**[--> No embargo periods evaluated]**""", """**[--> Keine Sperrfristen ausgewertet]**""")),
-
-    # Scope for the summary of any sick pay periods
-    with output.use_scope("scope_res_sp"):
-
-        output.put_markdown(lang("""### Sick Pay Periods""", """### Perioden Lohnfortzahlung """)).style('margin-top: 20px'),
-
-        if incapacity_type != False:
-
-            tbl_sp = Table()
-            tbl_sp_rows = []
-
-            # Count iterations
-            i = 1
-            for sickpay_sublst in sickpay_masterlst:
-                tbl_lst = []
-                tbl_lst.append(str(i))
-                tbl_lst.append(sickpay_sublst[0].format("DD.MM.YYYY"))
-                tbl_lst.append(sickpay_sublst[1].format("DD.MM.YYYY"))
-                tbl_lst.append(str(period_duration(sickpay_sublst[0], sickpay_sublst[1])) + lang(" days", " Tage"))
-                tbl_sp_rows.append(tbl_lst)
-                i += 1
-
-            tbl_sp.add(tbl_incap_headers, tbl_sp_rows)
-
-            output.put_html(tbl_sp.render_notebook()).style('margin-top: 40px')
-
-        else:
-            output.put_markdown(lang("""**[--> No sick pay periods evaluated]**""", """**[--> Keine Lohnfortzahlungsfristen ausgewertet]**""")),
-
-    # Scope for the summary of notice period
-    with output.use_scope("scope_res_notice"):
-
-        output.put_markdown(lang("""### Notice Period""", """### Kündigungsfrist""")).style('margin-top: 20px'),
-        
-        # Omit if no notice period was evaluated
-        if (termination_occurence == True) and (termination_case != "embargo_case"):
-
-            tbl_np = Table()
-            tbl_np_headers = [
-                lang("Type", "Art"),
-                lang("Start", "Start"),
-                lang("End", "Ende"),
-                lang("Duration", "Dauer"),
-            ]
-
-            tbl_np_rows = []
-
-            tbl_np_rows.append([
-                lang("Original Notice Period", "Ursprüngliche Kündigungsfrist"),
-                notice_period_lst[0].format("DD.MM.YYYY"),
-                notice_period_lst[1].format("DD.MM.YYYY"),
-                str(period_duration(notice_period_lst[0], notice_period_lst[1])) + lang(" days", " Tage")
-                ])
-
-            try:
-                tbl_np_rows.append([
-                    lang("Notice Period Compensation", "Kompensation Kündigungsfrist"),
-                    notice_comp_lst[0].format("DD.MM.YYYY"),
-                    notice_comp_lst[1].format("DD.MM.YYYY"),
-                    str(period_duration(notice_comp_lst[0], notice_comp_lst[1])) + lang(" days", " Tage")
-                    ])
-            except IndexError:
-                tbl_np_rows.append([
-                    lang("Notice Period Compensation", "Kompensation Kündigungsfrist"),
-                    "X",
-                    "X",
-                    "X",
-                    ])
-
-            try:
-                tbl_np_rows.append([
-                    lang("Notice Period Extension", "Verlängerung Kündigungsfrist"),
-                    notice_ext_lst[0].format("DD.MM.YYYY"),
-                    notice_ext_lst[1].format("DD.MM.YYYY"),
-                    str(period_duration(notice_ext_lst[0], notice_ext_lst[1])) + lang(" days", " Tage"),
-                    ])
-            except IndexError:
-                tbl_np_rows.append([
-                    lang("Notice Period Extension", "Verlängerung Kündigungsfrist"),
-                    "X",
-                    "X",
-                    "X",
-                    ])
-
-            tbl_np.add(tbl_np_headers, tbl_np_rows)
-
-            output.put_html(tbl_np.render_notebook()).style('margin-top: 40px')
-
-        else:
-            output.put_markdown(lang("""**[--> No notice period evaluated]**""", """**[--> Keine Kündigungsfrist ausgewertet]**""")),
-
-
-    # --- OUTPUT VISUALIZATION - PREPARATION --- #
-
-    # Convert dates from arrow to datetime for compatibility with Pandas
-    # Strip time information
-    # Convert standalone lists
-    master_lst = [trial_lst, reg_employment_lst, notice_period_lst, notice_comp_lst, notice_ext_lst]
-    for sublst in master_lst:
-        for index, value in enumerate(sublst):
-            if isinstance(value, arrow.Arrow):
-                sublst[index] = value.datetime.date()
-
-    # Copy local variables and covert to datetime
-    local_vars = locals()
-    output_dct = local_vars.copy()
-    # Sort employment_sdt as global variable into dict
-    output_dct["employment_sdt"] = employment_sdt
-    # Convert
-    for key, value in list(output_dct.items()):
-        if isinstance(value, arrow.Arrow):
-            output_dct[key] = value.datetime.date()
-
-
-    # --- OUTPUT VISUALIZATION - GATHER DATA --- #
-
-    # List of dataframes
-    df_lst = []
-
-    # Placeholder
-    df_lst.append(pd.DataFrame(
-        data=[[
-            "[PH_T]",
-            output_dct["termination_dt"],
-            output_dct["termination_dt"],
-            "stack_1"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert sick pay dict into dataframe
-    for sickpay_sublst in sickpay_masterlst:
-        if sickpay_sublst != []:
-            df_lst.append(pd.DataFrame(
-                data=[[
-                    lang("Sick Pay", "Lohnfortzahlung"),
-                    sickpay_sublst[0].datetime.date(),
-                    sickpay_sublst[1].datetime.date(),
-                    "stack_2"]],
-                columns=["task", "start", "end", "stack"]))
-
-    # Insert trial period into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-        lang("Probation Period", "Probezeit"),
-        check_index(trial_lst, 0),
-        check_index(trial_lst, 1),
-        "stack_3"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert regular employment into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-        lang("Regular Employment","Reguläre Anstellung"),
-        check_index(reg_employment_lst, 0),
-        check_index(reg_employment_lst, 1),
-        "stack_3"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert embargo period dict into dataframe
-    if incapacity_type != False:
-        for embargo_sublst in embargo_masterlst:
-            df_lst.append(pd.DataFrame(
-                data=[[
-                lang("Embargo Period", "Sperrfrist"),
-                embargo_sublst[0].datetime.date(),
-                embargo_sublst[1].datetime.date(),
-                "stack_3"]],
-                columns=["task", "start", "end", "stack"]))
-
-    # Insert regular notice period into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-        lang("Regular Notice Period", "Ordentliche Kündigungsfrist"),
-        check_index(notice_period_lst, 0),
-        check_index(notice_period_lst, 1),
-        "stack_3"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert missed notice period compensation into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-            lang("Compensation Missed Notice Period", "Kompensation verpasste Kündigungsfrist"),
-            check_index(notice_comp_lst, 0),
-            check_index(notice_comp_lst, 1),
-            "stack_3"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert notice period extension into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-            lang("Notice Period Extension", "Verlängerung Kündigungsfrist"),
-            check_index(notice_ext_lst, 0),
-            check_index(notice_ext_lst, 1), "stack_3"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Insert incapacity dict into dataframe
-    if incapacity_type != False:
-        for incap_sublst in incap_masterlst:
-            if incap_sublst != []:
-                df_lst.append(pd.DataFrame(
-                    data=[[
-                        lang("Incapacity", "Arbeitsunfähigkeit"),
-                        incap_sublst[0].datetime.date(),
-                        incap_sublst[1].datetime.date(),
-                        "stack_4"]],
-                    columns=["task", "start", "end", "stack"]))
-
-    # Insert place holders into dataframe
-    df_lst.append(pd.DataFrame(
-        data=[[
-            "[PH_B]",
-            output_dct["termination_dt"],
-            output_dct["termination_dt"],
-            "stack_5"]],
-        columns=["task", "start", "end", "stack"]))
-
-    # Combine dataframes
-    df = pd.concat(df_lst, ignore_index=True, sort=False)
-
-    # --- OUTPUT VISUALIZATION - FORMAT --- #
-
-    fig = px.timeline(df,
-                x_start="start",
-                x_end="end",
-                y="stack",
-                opacity=1,
-                color="task",
-                color_discrete_map={
-                    "[PH_T]": "#ffffff",
-                    "Sick Pay": "#f032e6", "Lohnfortzahlung": "#f032e6",
-                    "Probation Period": "#f58231", "Probezeit": "#f58231",
-                    "Regular Employment": "#3cb44b", "Reguläre Anstellung": "#3cb44b",
-                    "Notice Period": "#000075", "Kündigungsfrist": "#000075",
-                    "Compensation Missed Notice Period": "#4363d8", "Kompensation verpasste Kündigungsfrist": "#4363d8",
-                    "Sperrfrist": "#e6194B", "Embargo Period": "#e6194B",
-                    "Notice Period Extension": "#911eb4", "Verlängerung Kündigungsfrist": "#911eb4",
-                    "Incapacity": "#9A6324", "Arbeitsunfähigkeit": "#9A6324",
-                    "[PH_B]": "#ffffff",
-                },
-                width=1000,
-                height=700,
-                hover_name="task",
-                hover_data={"task":False,
-                            "stack":False,
-                            "start": True,
-                            "end":True})
-
-    config = {'displayModeBar': True,
-              'displaylogo': False,
-              'modeBarButtonsToRemove': ['select2d', 'lasso2d'],}
-
-    fig.update_traces(marker_line_width=1.0, opacity=0.95)
-
-    fig.update_xaxes(range=[reg_employment_lst[0], reg_employment_lst[1]])
-
-    fig.update_layout(
-        barmode="overlay",
-        xaxis = dict(
-            automargin=True,
-            dtick="M12",
-            tickformat="%d.%m.%Y",
-            type="date",
-            showgrid=True,
-            rangeslider_visible=True),
-        
-        margin=dict(
-            b=100,
-            t=200,),
-
-        yaxis = dict(
-            automargin=True,
-            visible=False,
-            autorange="reversed",
-            showgrid=True),
-        
-        legend=dict(
-            title="",
-            orientation="h",
-            font_size=16,
-            x=0,
-            y=1.1),
-
-        shapes = [
-            dict(
-            x0=termination_dt, x1=termination_dt, line_color="#DB162F", fillcolor="#DB162F", y0=0, y1=1, xref='x', yref='paper',
-            line_width=3),
-            dict(
-            x0=syears[1], x1=syears[1], line_color="#3B6728", fillcolor="#3B6728", y0=0, y1=1, xref='x', yref='paper',
-            line_width=1.5),
-            dict(
-            x0=syears[5], x1=syears[5], line_color="#3B6728", fillcolor="#3B6728", y0=0, y1=1, xref='x', yref='paper',
-            line_width=1.5),
-            ],
-            
-        
-        annotations=[
-            dict(
-            x=termination_dt, y=1, xref='x', yref='paper',font=dict(size=16, color="#DB162F"),
-            showarrow=False, xanchor='left', text=lang("Termination", "Kündigung")),
-            dict(
-            x=syears[1], y=0.05, xref='x', yref='paper',font=dict(size=16, color="#3B6728"),
-            showarrow=False, xanchor='left', text="1Y"),
-            dict(
-            x=syears[5], y=0.05, xref='x', yref='paper',font=dict(size=16, color="#3B6728"),
-            showarrow=False, xanchor='left', text="5Y"),
-            ])
-
-
-    # --- OUTPUT VISUALIZATION - MAKE OUTPUT --- #
-
-    with output.use_scope("scope_visualization"):
-        # Plotly output to PyWebIO
-        plotly_html = fig.to_html(include_plotlyjs="require", full_html=False, config=config)
-        output.put_markdown(lang("""
-        ## Interactive Visualization
-
-        IMPORTANT: The chart below is intended only as a visual aid.
-
-        """, """
-        ## Interaktive Visualisierung
-
-        WICHTIG: Die nachfolgende Grafik ist nur als visuelle Hilfe gedacht.
-
-        """)).style('margin-top: 20px'),
-        output.put_collapse(lang("Further Information", "Ergänzende Hinweise",), [
-            output.put_markdown(lang("""
-            - An export of the chart area as PNG is possible via the control panel on the top right
-            - Time periods of asingle day cannot be visualized
-
-            ""","""
-            - Ein Export als PNG ist über das Steuerpanel rechts oben möglich.
-            - Die Visualisierung einzelner Tage ist nicht möglich
-
-            """))]).style('margin-top: 20px'),
-        output.put_html(plotly_html).style("border: 1px solid #dfe2e5")
+            trial_notice_period = data["trial_notice_input"]
+
+    case = EmploymentCase(
+        employment_sdt=arrow.get(data["employment_sdt"], "DD.MM.YYYY"),
+        workplace=data["workplace"],
+        incapacity_type=data["incapacity_type"],
+        incap_dct=incap_dct,
+        trial_relevance=trial_relevance,
+        workdays_num=workdays_num,
+        trial_dur=trial_dur,
+        termination_occurence=termination_occurence,
+        termination_dt=termination_dt,
+        notice_period=notice_period,
+        endpoint=endpoint,
+        trial_notice_period=trial_notice_period)
+    evaluate_and_put(case)
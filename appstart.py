@@ -1,14 +1,172 @@
 from pywebio import *
+import argparse
+import os
+import signal
+import sys
+import time
+import tornado.httpserver
+import tornado.ioloop
+import tornado.netutil
+import tornado.web
+from pywebio.platform.tornado import webio_handler
+from pywebio.utils import STATIC_PATH
+from static_assets import static_dir
 import EmplawApp
 import DeadlineApp
 
 
+# --- MULTI-PROCESS MODE --- #
+# Worker processes share the listening socket, the kernel distributes new connections
+# A PyWebIO session lives on the websocket connection that opened it, so it always stays on its worker
+# Signals to the main process:
+# - SIGHUP: graceful restart, start new workers and let the old ones finish their sessions
+# - SIGTERM / SIGINT: graceful shutdown
+
+# Function to count open sessions of a worker
+def tracked_handler(handler, connections):
+    class TrackedHandler(handler):
+        def open(self, *args, **kwargs):
+            connections.add(self)
+            return super().open(*args, **kwargs)
+
+        def on_close(self):
+            connections.discard(self)
+            return super().on_close()
+
+    return TrackedHandler
+
+# Function to run a single worker process on shared sockets
+def run_worker(applications, sockets, static_path, shutdown_timeout):
+    loop = tornado.ioloop.IOLoop.current()
+    connections = set()
+
+    app = tornado.web.Application([
+        (r"/", tracked_handler(webio_handler(applications, cdn=True), connections)),
+        (r"/static/(.*)", tornado.web.StaticFileHandler, {"path": static_path}),
+        (r"/(.*)", tornado.web.StaticFileHandler, {"path": STATIC_PATH, "default_filename": "index.html"}),
+    ], websocket_ping_interval=30)
+    server = tornado.httpserver.HTTPServer(app, max_buffer_size=2 ** 20 * 200)
+    server.add_sockets(sockets)
+
+    # Stop accepting connections, wait for open sessions to finish
+    def drain():
+        server.stop()
+        deadline = loop.time() + shutdown_timeout
+
+        def check():
+            if not connections or loop.time() > deadline:
+                loop.stop()
+            else:
+                loop.call_later(1, check)
+        check()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: loop.add_callback_from_signal(drain))
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # handled by main process
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    loop.start()
+
+# Delay before a crashed worker is replaced, doubled for each crash of a worker that ran less than RESPAWN_STABLE seconds
+RESPAWN_DELAY = 1
+RESPAWN_MAX_DELAY = 60
+RESPAWN_STABLE = 60
+
+# Function to start the server with several worker processes
+def start_workers(applications, port, host, workers, shutdown_timeout):
+    sockets = tornado.netutil.bind_sockets(port, address=host)
+    static_path = static_dir()
+    children = set()
+    draining = set()
+    events = []
+    started = {} # start time per worker
+    respawns = [] # times at which crashed workers are replaced
+    delay = 0
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(applications, sockets, static_path, shutdown_timeout)
+            finally:
+                os._exit(0)
+        children.add(pid)
+        started[pid] = time.monotonic()
+
+    for _ in range(workers):
+        spawn()
+    print(f"Running on http://{host or 'localhost'}:{port}/ with {workers} worker processes")
+
+    signal.signal(signal.SIGHUP, lambda signum, frame: events.append("restart"))
+    signal.signal(signal.SIGTERM, lambda signum, frame: events.append("stop"))
+    signal.signal(signal.SIGINT, lambda signum, frame: events.append("stop"))
+
+    stopping = False
+    while children or respawns:
+        while events:
+            event = events.pop(0)
+            if event == "restart" and not stopping:
+                # Start replacements first, old workers keep serving their open sessions
+                old = children - draining
+                for _ in old:
+                    spawn()
+                for pid in old:
+                    os.kill(pid, signal.SIGTERM)
+                draining.update(old)
+            elif event == "stop" and not stopping:
+                stopping = True
+                respawns.clear()
+                for pid in children - draining:
+                    os.kill(pid, signal.SIGTERM)
+                draining.update(children)
+
+        # Replace crashed workers once their delay has passed
+        while respawns and respawns[0] <= time.monotonic():
+            respawns.pop(0)
+            spawn()
+
+        # Reap exited workers, replace workers that crashed after a delay, so a worker failing at startup does not fork in a loop
+        pid, status = (os.waitpid(-1, os.WNOHANG) if children else (0, 0))
+        if pid == 0:
+            time.sleep(0.5)
+            continue
+        children.discard(pid)
+        runtime = time.monotonic() - started.pop(pid)
+        if pid in draining:
+            draining.discard(pid)
+        elif not stopping:
+            delay = RESPAWN_DELAY if runtime >= RESPAWN_STABLE or not delay else min(delay * 2, RESPAWN_MAX_DELAY)
+            print(f"Worker {pid} exited unexpectedly (status {status}), restarting in {delay}s")
+            respawns.append(time.monotonic() + delay)
+            respawns.sort()
+
+
 # --- DEPLOYMENT --- #
 # Import apps as module, then add to start_server
 # Access via http://host:port/?app=XXX
 if __name__ == '__main__':
-    start_server(
-        [EmplawApp.emplaw_app, DeadlineApp.deadline_app], # Add apps to dictionary
-        port=41780,
-        host="0.0.0.0",
-        debug=False)
+    parser = argparse.ArgumentParser(description="Start piccolaw apps")
+    parser.add_argument("--port", type=int, default=41780)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("PICCOLAW_WORKERS", "1")),
+                        help="number of worker processes, 0 = number of cores (default: 1, single process)")
+    parser.add_argument("--shutdown-timeout", type=int, default=int(os.environ.get("PICCOLAW_SHUTDOWN_TIMEOUT", "600")),
+                        help="seconds a worker waits for open sessions on restart or shutdown (default: 600)")
+    args = parser.parse_args()
+
+    apps = [EmplawApp.emplaw_app, EmplawApp.emplaw_form_app, DeadlineApp.deadline_app] # Add apps to dictionary
+
+    if args.workers == 1:
+        # Exit on SIGTERM, so the static directory is removed
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        start_server(
+            apps,
+            port=args.port,
+            host=args.host,
+            static_dir=static_dir(),
+            debug=False)
+    else:
+        start_workers(
+            apps,
+            port=args.port,
+            host=args.host,
+            workers=args.workers or os.cpu_count() or 1,
+            shutdown_timeout=args.shutdown_timeout)
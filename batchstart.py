@@ -0,0 +1,261 @@
+import argparse
+import csv
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+import arrow
+from emplaw_engine import EmploymentCase, evaluate, period_duration
+import holiday_calendar
+import ics_export
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# --- BATCH EVALUATION --- #
+# Evaluate a table of employment cases without the web interface
+# Usage: python3 batchstart.py cases.csv results.csv [--workers N] [--ics calendar.ics]
+# Input and output may be CSV or Parquet (Parquet requires pandas and pyarrow)
+# With --ics, the periods of all cases are also written to a calendar file, event by event as rows are evaluated
+
+# Input columns (empty cells use the default, invalid values are reported in the error column):
+# - employment_sdt: first day of work (DD.MM.YYYY)
+# - workplace: canton (e.g. ZH)
+# - incapacity_type: empty (no incapacities), illacc, milservice or preg (milservice and preg with a single period)
+# - incapacities: periods as DD.MM.YYYY-DD.MM.YYYY, periods of one incapacity separated by ";", seperate incapacities by "|"
+# - workdays: weekday numbers separated by "," (0 = monday, 6 = sunday), default 0,1,2,3,4
+# - trial_dur: probation period in months (1 to 3), empty = no evaluation of probation period
+# - termination_dt: date of termination notice receipt (DD.MM.YYYY), empty = no evaluation of termination
+# - notice_period: notice period in months, empty = legal minimum
+# - endpoint: week, month, quarter, year or anytime, default month
+# - trial_notice_period: notice period during probation period in days, default 7
+
+RESULT_COLUMNS = [
+    "termination_case",
+    "termination_valid",
+    "trial_edt",
+    "trial_extension_dur",
+    "notice_sdt",
+    "notice_edt",
+    "notice_overlap",
+    "new_employment_edt",
+    "embargo_periods",
+    "embargo_days",
+    "sickpay_periods",
+    "sickpay_days",
+    "error",
+]
+
+# Allowed cell values, other values are reported as error of the row
+INCAPACITY_TYPES = ["illacc", "milservice", "preg"]
+ENDPOINTS = ["week", "month", "quarter", "year", "anytime"]
+
+
+# --- FUNCTIONS --- #
+
+# Function to parse a date cell
+def parse_date(value):
+    return arrow.get(value.strip(), "DD.MM.YYYY")
+
+# Function to parse a period cell (DD.MM.YYYY-DD.MM.YYYY) into a [start, end] pair, raises ValueError
+def parse_period(value):
+    dates = value.split("-")
+    if len(dates) != 2:
+        raise ValueError("period must have a start and an end date: " + value.strip())
+    start, end = parse_date(dates[0]), parse_date(dates[1])
+    if start > end:
+        raise ValueError("period ends before it starts: " + value.strip())
+    return [start, end]
+
+# Function to check that the periods of an incapacity are in chronological order and do not overlap
+def check_periods(periods):
+    for previous, period in zip(periods, periods[1:]):
+        if period[0] <= previous[1]:
+            raise ValueError("periods not in chronological order or overlapping")
+
+# Function to format a date, empty string if no date
+def format_date(value):
+    if isinstance(value, date):
+        return value.strftime("%d.%m.%Y")
+    return ""
+
+# Function to format list of periods
+def format_periods(lst):
+    return "; ".join(format_date(sublst[0]) + "-" + format_date(sublst[1]) for sublst in lst if sublst != [])
+
+# Function to count days of list of periods
+def count_days(lst):
+    return sum(period_duration(sublst[0], sublst[1]) for sublst in lst if sublst != [])
+
+# Function to get an element of a list if it exists
+def get_index(lst, index):
+    if index < len(lst):
+        return lst[index]
+    return None
+
+# Function to convert a table row into a case, raises ValueError for invalid cell values
+def row_to_case(row):
+    row = {key: ("" if value is None else str(value).strip()) for key, value in row.items()}
+
+    workplace = row["workplace"].upper()
+    if workplace not in holiday_calendar.CANTONS:
+        raise ValueError("unknown workplace: " + row["workplace"])
+    incapacity_type = row.get("incapacity_type", "").lower()
+    if incapacity_type and incapacity_type not in INCAPACITY_TYPES:
+        raise ValueError("unknown incapacity_type: " + row["incapacity_type"])
+    endpoint = row.get("endpoint", "").lower() or "month"
+    if endpoint not in ENDPOINTS:
+        raise ValueError("unknown endpoint: " + row["endpoint"])
+    employment_sdt = parse_date(row["employment_sdt"])
+    termination_dt = parse_date(row["termination_dt"]) if row.get("termination_dt") else None
+    if termination_dt is not None and termination_dt < employment_sdt:
+        raise ValueError("termination_dt before employment_sdt")
+
+    # Incapacities: dict key per seperate incapacity, list of [start, end] pairs as value
+    incap_dct = {}
+    if row.get("incapacities"):
+        for key, incap in enumerate(row["incapacities"].split("|"), start=1):
+            incap_dct[key] = [parse_period(period) for period in incap.split(";") if period.strip()]
+            check_periods(incap_dct[key])
+    incap_dct = {key: periods for key, periods in incap_dct.items() if periods}
+    # Same pairing as in the web form: periods only with a type of incapacity and vice versa
+    if incap_dct and not incapacity_type:
+        raise ValueError("incapacities without incapacity_type")
+    if incapacity_type and not incap_dct:
+        raise ValueError("incapacity_type without incapacities")
+    if incapacity_type in ["milservice", "preg"] and sum(len(periods) for periods in incap_dct.values()) > 1:
+        raise ValueError("only one period allowed for " + incapacity_type)
+
+    # Probation period of one to three months (Art. 335b OR)
+    trial_dur = int(row["trial_dur"]) if row.get("trial_dur") else 0
+    if row.get("trial_dur") and not 1 <= trial_dur <= 3:
+        raise ValueError("trial_dur must be between 1 and 3")
+    workdays_num = [int(day) for day in (row.get("workdays") or "0,1,2,3,4").split(",") if day.strip()]
+    if not workdays_num or any(not 0 <= day <= 6 for day in workdays_num):
+        raise ValueError("workdays must be at least one weekday number between 0 and 6")
+    notice_period = int(row["notice_period"]) if row.get("notice_period") else None
+    if notice_period is not None and notice_period < 1:
+        raise ValueError("notice_period must be at least 1")
+    trial_notice_period = int(row["trial_notice_period"]) if row.get("trial_notice_period") else 7
+    if trial_notice_period < 1:
+        raise ValueError("trial_notice_period must be at least 1")
+
+    return EmploymentCase(
+        employment_sdt=employment_sdt,
+        workplace=workplace,
+        incapacity_type=incapacity_type or False,
+        incap_dct=incap_dct,
+        trial_relevance=trial_dur > 0,
+        workdays_num=workdays_num,
+        trial_dur=trial_dur,
+        termination_occurence=termination_dt is not None,
+        termination_dt=termination_dt,
+        notice_period=notice_period,
+        endpoint=endpoint,
+        trial_notice_period=trial_notice_period)
+
+# Function to convert a result into result columns
+def result_to_row(case, result):
+    return {
+        "termination_case": result.termination_case,
+        "termination_valid": "" if result.termination_valid is None else result.termination_valid,
+        "trial_edt": format_date(get_index(result.trial_lst, 1)) if case.trial_relevance else "",
+        "trial_extension_dur": result.trial_extension_dur,
+        "notice_sdt": format_date(get_index(result.notice_period_lst, 0)),
+        "notice_edt": format_date(get_index(result.notice_period_lst, 1)),
+        "notice_overlap": result.notice_overlap,
+        "new_employment_edt": format_date(result.new_employment_edt),
+        "embargo_periods": format_periods(result.embargo_masterlst),
+        "embargo_days": count_days(result.embargo_masterlst),
+        "sickpay_periods": format_periods(result.sickpay_masterlst),
+        "sickpay_days": count_days(result.sickpay_masterlst),
+        "error": "",
+    }
+
+# Function to evaluate a single row, errors are captured per row
+# With ics, the calendar events of the row are returned under the key "ics" (summaries prefixed with the row number)
+def evaluate_row(row, number=0, ics=False):
+    try:
+        case = row_to_case(row)
+        result = evaluate(case)
+        res = result_to_row(case, result)
+        if ics:
+            stamp = ics_export.dtstamp()
+            prefix = str(number) + ". "
+            res["ics"] = "".join(
+                ics_export.vevent(summary, sdt, edt, stamp, prefix, description)
+                for summary, sdt, edt, description in ics_export.employment_events(case, result, False, prefix))
+        return res
+    except Exception as e:
+        res = {column: "" for column in RESULT_COLUMNS}
+        res["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return res
+
+# Function to read table of cases
+def read_table(path):
+    if path.endswith(".parquet"):
+        import pandas as pd
+        return pd.read_parquet(path).fillna("").astype(str).to_dict("records")
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+# Function to write table of results
+def write_table(path, rows, columns):
+    if path.endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(rows, columns=columns).astype(str).to_parquet(path, index=False)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+# Function to evaluate all rows in parallel, rows keep their order
+# Calendar events are written to the open file ics_file as soon as a row is done, they are not kept
+def evaluate_table(rows, workers=None, progress=True, ics_file=None):
+    results = []
+    errors = 0
+    chunksize = max(1, len(rows) // ((workers or os.cpu_count() or 1) * 8))
+    evaluate_fn = partial(evaluate_row, ics=ics_file is not None)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, res in enumerate(executor.map(evaluate_fn, rows, range(1, len(rows) + 1), chunksize=chunksize), start=1):
+            if ics_file is not None:
+                ics_file.write(res.pop("ics", ""))
+            results.append(res)
+            if res["error"]:
+                errors += 1
+            if progress and (i % 100 == 0 or i == len(rows)):
+                print(f"Evaluated {i}/{len(rows)} cases ({errors} errors)", file=sys.stderr)
+    return results
+
+
+# --- MAIN --- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Evaluate employment law cases from a CSV or Parquet table")
+    parser.add_argument("input", help="table of cases (.csv or .parquet)")
+    parser.add_argument("output", help="table of results (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    parser.add_argument("--ics", default=None, help="also write the periods of all cases to a calendar file (.ics)")
+    args = parser.parse_args()
+
+    rows = read_table(args.input)
+    if args.ics:
+        # Header and footer of the calendar around the events streamed by the workers
+        with open(args.ics, "w", encoding="utf-8", newline="") as ics_file:
+            header, footer = ics_export.ics_chunks([], name="piccolaw")
+            ics_file.write(header)
+            results = evaluate_table(rows, workers=args.workers, progress=not args.quiet, ics_file=ics_file)
+            ics_file.write(footer)
+    else:
+        results = evaluate_table(rows, workers=args.workers, progress=not args.quiet)
+
+    input_columns = list(rows[0].keys()) if rows else []
+    write_table(
+        args.output,
+        [{**row, **res} for row, res in zip(rows, results)],
+        input_columns + [column for column in RESULT_COLUMNS if column not in input_columns])
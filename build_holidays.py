@@ -0,0 +1,55 @@
+from datetime import date
+import os
+import holiday_calendar
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# --- BUILD HOLIDAY CALENDAR --- #
+# Generate the binary holiday calendar (see holiday_calendar) from the holiday rules
+# Usage: python3 build_holidays.py
+# Run again after changing the holiday rules, outdated files are ignored at runtime
+
+
+# --- FUNCTIONS --- #
+
+# Function to build the calendar file content
+def build_calendar():
+    first_day = date(holiday_calendar.CALENDAR_FIRST_YEAR, 1, 1)
+    last_day = date(holiday_calendar.CALENDAR_LAST_YEAR, 12, 31)
+    bitset_len = ((last_day - first_day).days + 8) // 8
+
+    content = bytearray(holiday_calendar.CALENDAR_HEADER.pack(
+        holiday_calendar.CALENDAR_MAGIC,
+        holiday_calendar.CALENDAR_FORMAT,
+        holiday_calendar.CALENDAR_FIRST_YEAR,
+        holiday_calendar.CALENDAR_LAST_YEAR,
+        len(holiday_calendar.CANTONS),
+        holiday_calendar.rules_hash()))
+    for canton in holiday_calendar.CANTONS:
+        content += canton.encode("ascii")
+
+    # Bitsets from the rules, not from an existing calendar file
+    for canton in holiday_calendar.CANTONS:
+        bitset = bytearray(bitset_len)
+        for year in range(holiday_calendar.CALENDAR_FIRST_YEAR, holiday_calendar.CALENDAR_LAST_YEAR + 1):
+            for day in holiday_calendar.holiday_table(year, canton):
+                i = (day - first_day).days
+                bitset[i // 8] |= 1 << (i % 8)
+        content += bitset
+    return bytes(content)
+
+# Function to write the calendar file, replaced atomically for running processes
+def write_calendar(path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(build_calendar())
+    os.replace(tmp_path, path)
+
+
+# --- MAIN --- #
+
+if __name__ == '__main__':
+    write_calendar(holiday_calendar.CALENDAR_PATH)
+    print(f"Holiday calendar written to {holiday_calendar.CALENDAR_PATH}")
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+import numpy as np
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Date arithmetic in months, quarters and years on datetime.date objects
+# Month lengths come from a precomputed table, no relativedelta or arrow objects in the hot path
+# Month and year offsets keep the day number, a day that does not exist in the target month becomes its last day
+# (31.01. + 1 month = 28.02. / 29.02., 29.02. + 1 year = 28.02.), periods of months end accordingly (BGE 134 III 354)
+# The array functions do the same on numpy datetime64[D] arrays (vectorized passes over many dates)
+
+# Days per month (index 1 to 12), common years and leap years
+MONTH_LENGTHS = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+
+# Last month of the quarter for each month (index 1 to 12)
+QUARTER_END_MONTHS = (0, 3, 3, 3, 6, 6, 6, 9, 9, 9, 12, 12, 12)
+
+
+# --- FUNCTIONS --- #
+
+# Function to check if a year is a leap year
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+# Function to get the number of days of a month
+def month_length(year, month):
+    return MONTH_LENGTHS[is_leap(year)][month]
+
+# Function to add (or subtract) months, the day number is kept or set to the last day of a shorter month
+def add_months(day, months):
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+    return date(year, month, min(day.day, MONTH_LENGTHS[is_leap(year)][month]))
+
+# Function to add (or subtract) years, 29 February becomes 28 February in common years
+def add_years(day, years):
+    return add_months(day, 12 * years)
+
+# Function to add a number of days, weeks, months or years
+def add_period(day, unit, n):
+    if unit == "days":
+        return day + timedelta(days=n)
+    elif unit == "weeks":
+        return day + timedelta(weeks=n)
+    elif unit == "months":
+        return add_months(day, n)
+    elif unit == "years":
+        return add_months(day, 12 * n)
+    raise ValueError(f"unknown unit: {unit}")
+
+# Function to get the last day of the week (sunday)
+def end_of_week(day):
+    return day + timedelta(days=6 - day.weekday())
+
+# Function to get the last day of the month
+def end_of_month(day):
+    return date(day.year, day.month, MONTH_LENGTHS[is_leap(day.year)][day.month])
+
+# Function to get the last day of the quarter
+def end_of_quarter(day):
+    month = QUARTER_END_MONTHS[day.month]
+    return date(day.year, month, MONTH_LENGTHS[is_leap(day.year)][month])
+
+# Function to get the last day of the year
+def end_of_year(day):
+    return date(day.year, 12, 31)
+
+# Function to push dates to desired endpoint (end of the week, month, quarter or year)
+def push_endpoint(day, endpoint):
+    if endpoint == "week":
+        return end_of_week(day)
+    elif endpoint == "month":
+        return end_of_month(day)
+    elif endpoint == "quarter":
+        return end_of_quarter(day)
+    elif endpoint == "year":
+        return end_of_year(day)
+    else:
+        return day
+
+# Function to correct date subtraction if origin month has more days than target month
+# A period of months ends the day before the same day number, or on the last day of a shorter month
+# See issue 1
+def subtract_corr(sdt, edt):
+    if sdt.day != edt.day:
+        return(edt)
+    else:
+        edt = edt - timedelta(days=1)
+        return(edt)
+
+
+# --- ARRAY FUNCTIONS --- #
+
+# Function to add months to an array of days, the day number is kept or set to the last day of a shorter month
+def add_months_array(days, months):
+    month = days.astype("datetime64[M]") + months
+    month_len = ((month + 1).astype("datetime64[D]") - month.astype("datetime64[D]")).astype(int)
+    day = (days - days.astype("datetime64[M]").astype("datetime64[D]")).astype(int) + 1
+    return month.astype("datetime64[D]") + (np.minimum(day, month_len) - 1)
+
+# Function to push an array of days to the desired endpoint (end of the week, month, quarter or year)
+def push_endpoint_array(days, endpoint):
+    one = np.timedelta64(1, "D")
+    if endpoint == "week":
+        # 01.01.1970 was a thursday (weekday 3)
+        return days + (6 - (days.astype(int) + 3) % 7)
+    elif endpoint == "month":
+        return (days.astype("datetime64[M]") + 1).astype("datetime64[D]") - one
+    elif endpoint == "quarter":
+        month = days.astype("datetime64[M]").astype(int)
+        return (month - month % 3 + 3).astype("datetime64[M]").astype("datetime64[D]") - one
+    elif endpoint == "year":
+        return (days.astype("datetime64[Y]") + 1).astype("datetime64[D]") - one
+    else:
+        return days
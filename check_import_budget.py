@@ -0,0 +1,59 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# --- IMPORT BUDGET CHECK --- #
+# Check that the apps start without the heavy result dependencies and within a time budget
+# Usage: python3 check_import_budget.py [--budget SECONDS]
+# pandas, plotly and pyecharts are only imported once a session reaches the results (see EmplawApp and emplaw_timeline)
+# The imports run in a fresh interpreter, exits with an error if a check fails
+
+HEAVY_MODULES = ["pandas", "plotly", "pyecharts"]
+
+# Code run in the fresh interpreter, prints the import time and the heavy modules that were loaded
+IMPORT_CODE = """
+import sys
+import time
+start = time.perf_counter()
+import EmplawApp
+import DeadlineApp
+print(time.perf_counter() - start)
+print(",".join(name for name in %r if name in sys.modules))
+""" % HEAVY_MODULES
+
+
+# --- FUNCTIONS --- #
+
+# Function to import the apps in a fresh interpreter, returns the import time and the loaded heavy modules
+def measure_imports():
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_CODE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True).stdout.splitlines()
+    return float(out[0]), [name for name in out[1].split(",") if name]
+
+
+# --- MAIN --- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check the import time of the piccolaw apps")
+    parser.add_argument("--budget", type=float, default=1.0, help="maximum import time in seconds (default: 1.0)")
+    args = parser.parse_args()
+
+    seconds, loaded = measure_imports()
+    print(f"Imported EmplawApp and DeadlineApp in {seconds:.2f}s (budget: {args.budget:.2f}s)")
+    # Explicit exit instead of assert, which python -O removes
+    errors = []
+    if loaded:
+        errors.append("imported at startup: " + ", ".join(loaded))
+    if seconds > args.budget:
+        errors.append(f"import time {seconds:.2f}s exceeds the budget of {args.budget:.2f}s")
+    if errors:
+        sys.exit("\n".join(errors))
@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Shared worker pool for heavy computations (case evaluation, chart rendering)
+# Sessions submit work to the pool and wait for the result, so a long computation
+# does not hold the GIL on the server thread serving all other sessions
+# Configuration via environment variables or configure():
+# - PICCOLAW_POOL: "thread" (default), "process" or "none" (run in session thread)
+# - PICCOLAW_POOL_WORKERS: number of workers (default: number of cores)
+
+pool_kind = os.environ.get("PICCOLAW_POOL", "thread")
+pool_workers = int(os.environ.get("PICCOLAW_POOL_WORKERS", "0")) or os.cpu_count() or 1
+pool = None
+pool_lock = threading.Lock()
+
+
+# --- FUNCTIONS --- #
+
+# Function to change pool configuration, must be called before the first computation
+def configure(kind=None, workers=None):
+    global pool_kind, pool_workers
+    if pool is not None:
+        raise RuntimeError("Pool already started")
+    if kind is not None:
+        pool_kind = kind
+    if workers:
+        pool_workers = workers
+
+# Function to get the pool, started on first use
+def get_pool():
+    global pool
+    with pool_lock:
+        if pool is None and pool_kind == "thread":
+            pool = ThreadPoolExecutor(max_workers=pool_workers, thread_name_prefix="compute")
+        elif pool is None and pool_kind == "process":
+            # Spawn instead of fork, the server process already runs threads
+            pool = ProcessPoolExecutor(max_workers=pool_workers, mp_context=multiprocessing.get_context("spawn"))
+    return pool
+
+# Function to run a function in the pool and wait for its result
+# Functions and arguments must be picklable for the process pool
+def run(fn, *args, **kwargs):
+    executor = get_pool()
+    if executor is None:
+        return fn(*args, **kwargs)
+    return executor.submit(fn, *args, **kwargs).result()
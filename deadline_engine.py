@@ -0,0 +1,320 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import lru_cache
+from dateutil.easter import easter
+import numpy as np
+from calendar_math import add_months
+import holiday_calendar
+import workdays
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Computation engine for the deadline calculator (Swiss Civil Procedure Code, ZPO)
+# Pure functions without any PyWebIO input or output, see DeadlineApp.py for the user interface
+# Dates are datetime.date objects, holidays and court holidays are looked up in per-year indexes
+# - Art. 138 ZPO: a registered letter that is not collected is deemed received on the 7th day after the collection note
+# - Art. 142 ZPO: start on the day after receipt, months end on the same day number, extension over weekends and holidays
+# - Art. 145 / 146 ZPO: deadlines stand still during court holidays, receipt during court holidays starts the deadline after them
+
+FICTION_DAYS = 7
+UNITS = ["days", "months", "years"]
+# Longest deadline per unit
+MAX_DURATION = {"days": 3650, "months": 120, "years": 10}
+
+
+# --- HOLIDAY INDEX --- #
+
+# Function to get all holidays of a year as dict (label: date), independent of the canton
+@lru_cache(maxsize=None)
+def label_table(year):
+    easter_dt = easter(year)
+    return {label: rule(year, easter_dt) for label, rule, cantons in holiday_calendar.HOLIDAYS}
+
+# Function to get the selected holidays of a year as set of dates
+# Result only depends on year and selection, built once per combination
+@lru_cache(maxsize=4096)
+def selected_holidays(year, labels):
+    table = label_table(year)
+    return frozenset(table[label] for label in labels if label in table)
+
+# Function to get the court holidays of a year as list of (start, end), inclusive and sorted
+# The period around new year is split at the end of the year
+@lru_cache(maxsize=None)
+def court_holidays(year):
+    easter_dt = easter(year)
+    return (
+        (date(year, 1, 1), date(year, 1, 2)),
+        (easter_dt - timedelta(days=7), easter_dt + timedelta(days=7)),
+        (date(year, 7, 15), date(year, 8, 15)),
+        (date(year, 12, 18), date(year, 12, 31)),
+    )
+
+# Function to get the court holiday period containing a date, None if the date is outside of court holidays
+# Periods spanning new year are returned as a whole
+def court_holiday_period(day):
+    for start, end in court_holidays(day.year):
+        if start <= day <= end:
+            if end.month == 12:
+                end = court_holidays(day.year + 1)[0][1]
+            elif start.month == 1:
+                start = court_holidays(day.year - 1)[-1][0]
+            return start, end
+    return None
+
+# Function to get the first court holiday period ending on or after a date
+def next_court_holidays(day):
+    year = day.year
+    while True:
+        for start, end in court_holidays(year):
+            if end >= day:
+                if end.month == 12:
+                    end = court_holidays(year + 1)[0][1]
+                return start, end
+        year += 1
+
+# Function to count court holidays between two dates (inclusive)
+def court_holiday_days(sdt, edt):
+    days = 0
+    for year in range(sdt.year, edt.year + 1):
+        for start, end in court_holidays(year):
+            days += max(0, (min(end, edt) - max(start, sdt)).days + 1)
+    return days
+
+
+# --- FUNCTIONS --- #
+
+# Function to get the date on which a number of running days is reached, counting from the start date as first day
+# Court holidays do not count if they stand still, the count jumps over each period
+def count_days(start, days, standstill):
+    day = start
+    while True:
+        if not standstill:
+            return day + timedelta(days=days - 1)
+        period_start, period_end = next_court_holidays(day)
+        if day >= period_start:
+            day = period_end + timedelta(days=1)
+            continue
+        if (period_start - day).days >= days:
+            return day + timedelta(days=days - 1)
+        days -= (period_start - day).days
+        day = period_end + timedelta(days=1)
+
+# Function to get all court holidays between two dates (inclusive) as numpy dates
+def court_holiday_array(sdt, edt):
+    days = [
+        np.arange(max(start, sdt), min(end, edt) + timedelta(days=1), dtype="datetime64[D]")
+        for year in range(sdt.year, edt.year + 1)
+        for start, end in court_holidays(year)]
+    return np.concatenate(days)
+
+# Function to get the holidays of a selection between two dates (inclusive) as numpy dates
+def selected_holiday_array(sdt, edt, canton, holidays):
+    if holidays is None:
+        return workdays.holiday_array(sdt, edt, canton)
+    return np.array(sorted(
+        day for year in range(sdt.year, edt.year + 1)
+        for day in selected_holidays(year, holidays) if sdt <= day <= edt), dtype="datetime64[D]")
+
+# Function to get the reason a deadline can not end on a date, None if it can
+def closed_reason(day, canton, holidays):
+    if day.weekday() == 5:
+        return "saturday"
+    if day.weekday() == 6:
+        return "sunday"
+    if holidays is None:
+        if holiday_calendar.is_holiday(day, canton):
+            return holiday_calendar.holiday_table(day.year, canton).get(day, "holiday")
+    elif day in selected_holidays(day.year, holidays):
+        return next(label for label in holidays if label_table(day.year).get(label) == day)
+    return None
+
+
+# --- CASE AND RESULT --- #
+
+# Input of a single deadline
+@dataclass
+class DeadlineCase:
+    receipt_type: str # "actual" (date of receipt) or "fiction" (date of the collection note)
+    receipt_dt: date
+    duration: int
+    unit: str = "days" # "days", "months" or "years"
+    court_holidays: bool = False
+    canton: str = "ZH"
+    holidays: tuple | None = None # labels of holidays extending the deadline, None = all holidays of the canton
+
+# Result of a single deadline
+@dataclass
+class DeadlineResult:
+    receipt_dt: date # (deemed) receipt
+    start_dt: date # first day of the deadline
+    nominal_edt: date # end before extension over weekends and holidays
+    end_dt: date
+    court_holiday_days: int # days added for court holidays
+    extension_lst: list = field(default_factory=list) # (date, reason) per day the end was moved over
+
+
+# --- ENGINE --- #
+
+# Function to get the number of days a deadline can reach beyond its receipt, court holidays and extensions included
+def reach_days(duration, unit):
+    if unit == "days":
+        return duration * 2 + 120
+    return duration * (12 if unit == "years" else 1) * 31 * 2 + 120
+
+# Function to check the input of a deadline, raises ValueError
+def check_case(case):
+    if case.unit not in UNITS:
+        raise ValueError(f"unknown unit: {case.unit}")
+    if case.duration < 1:
+        raise ValueError("duration must be at least one")
+    if case.duration > MAX_DURATION[case.unit]:
+        raise ValueError(f"duration must be at most {MAX_DURATION[case.unit]} {case.unit}")
+    if (date.max - case.receipt_dt).days < FICTION_DAYS + reach_days(case.duration, case.unit):
+        raise ValueError("end of deadline out of date range")
+
+# Function to evaluate the end of a deadline
+def evaluate(case):
+
+    check_case(case)
+
+    standstill = bool(case.court_holidays)
+    holidays = tuple(case.holidays) if case.holidays is not None else None
+
+    # Deemed receipt on the 7th day after the collection note (Art. 138 para. 3 lit. a ZPO)
+    if case.receipt_type == "fiction":
+        receipt_dt = case.receipt_dt + timedelta(days=FICTION_DAYS)
+    else:
+        receipt_dt = case.receipt_dt
+
+    # Receipt during court holidays: the deadline starts on the day after them (Art. 146 para. 1 ZPO)
+    trigger_dt = receipt_dt
+    if standstill:
+        period = court_holiday_period(receipt_dt)
+        if period is not None:
+            trigger_dt = period[1]
+    start_dt = trigger_dt + timedelta(days=1)
+
+    # Days run continuously, court holidays do not count
+    # Months end on the day with the same number as the trigger day, court holidays within the deadline are added
+    if case.unit == "days":
+        nominal_edt = count_days(start_dt, case.duration, standstill)
+        added = court_holiday_days(start_dt, nominal_edt) if standstill else 0
+    else:
+        months = case.duration * (12 if case.unit == "years" else 1)
+        nominal_edt = add_months(trigger_dt, months)
+        added = court_holiday_days(start_dt, nominal_edt) if standstill else 0
+        if added:
+            nominal_edt = count_days(nominal_edt + timedelta(days=1), added, standstill)
+
+    end_dt, extension_lst = extend(nominal_edt, case.canton, holidays, standstill)
+
+    return DeadlineResult(
+        receipt_dt=receipt_dt,
+        start_dt=start_dt,
+        nominal_edt=nominal_edt,
+        end_dt=end_dt,
+        court_holiday_days=added,
+        extension_lst=extension_lst)
+
+# Function to extend the end of a deadline to the next working day (Art. 142 para. 3 ZPO)
+# An end moved into court holidays continues after them
+# Returns the end and the days moved over as (date, reason)
+def extend(end_dt, canton, holidays, standstill):
+    extension_lst = []
+    while True:
+        period = court_holiday_period(end_dt) if standstill else None
+        if period is not None:
+            extension_lst.append((end_dt, "court_holidays"))
+            end_dt = period[1] + timedelta(days=1)
+            continue
+        reason = closed_reason(end_dt, canton, holidays)
+        if reason is None:
+            return end_dt, extension_lst
+        extension_lst.append((end_dt, reason))
+        end_dt += timedelta(days=1)
+
+# Function to evaluate a list of deadlines in one pass, results in the order of the cases
+# All rows share one set of court holidays and one working day calendar per holiday selection
+# Same rules as evaluate(), the days are resolved with numpy business day functions:
+# - running days: every day except court holidays
+# - working days: monday to friday except the selected holidays (and court holidays if they apply)
+def evaluate_many(cases):
+
+    if not cases:
+        return []
+    for case in cases:
+        check_case(case)
+
+    receipt = np.array([case.receipt_dt for case in cases], dtype="datetime64[D]")
+    receipt = receipt + np.array([FICTION_DAYS if case.receipt_type == "fiction" else 0 for case in cases])
+    duration = np.array([case.duration for case in cases])
+    unit = np.array([case.unit for case in cases])
+    standstill = np.array([bool(case.court_holidays) for case in cases])
+
+    # Range covered by all deadlines, court holidays add at most about a fifth of a year
+    sdt = receipt.min().tolist()
+    edt = (receipt + np.array([reach_days(case.duration, case.unit) for case in cases])).max().tolist()
+    standstill_days = court_holiday_array(sdt, edt)
+    running = np.busdaycalendar(weekmask=[1] * 7, holidays=standstill_days)
+    one = np.timedelta64(1, "D")
+
+    # Receipt during court holidays: the deadline starts on the day after them (Art. 146 para. 1 ZPO)
+    trigger = np.where(
+        standstill & ~np.is_busday(receipt, busdaycal=running),
+        np.busday_offset(receipt, 0, roll="forward", busdaycal=running) - one,
+        receipt)
+    start = trigger + one
+
+    # Days: nth running day, court holidays only stand still if they apply
+    days_edt = np.where(
+        standstill,
+        np.busday_offset(start, duration - 1, roll="forward", busdaycal=running),
+        start + (duration - 1))
+
+    # Months: same day number in the last month or the last day of a shorter month
+    months = duration * np.where(unit == "years", 12, 1)
+    month = trigger.astype("datetime64[M]") + months
+    month_len = ((month + 1).astype("datetime64[D]") - month.astype("datetime64[D]")).astype(int)
+    trigger_day = (trigger - trigger.astype("datetime64[M]").astype("datetime64[D]")).astype(int) + 1
+    months_edt = month.astype("datetime64[D]") + (np.minimum(trigger_day, month_len) - 1)
+
+    nominal = np.where(unit == "days", days_edt, months_edt)
+    length = (nominal - start).astype(int) + 1
+    added = np.where(standstill, length - np.busday_count(start, nominal + one, busdaycal=running), 0)
+    # Court holidays within a deadline in months are added after its nominal end
+    nominal = np.where(
+        (unit != "days") & (added > 0),
+        np.busday_offset(nominal + one, np.maximum(added - 1, 0), roll="forward", busdaycal=running),
+        nominal)
+
+    # Extension to the next working day, one calendar per holiday selection
+    end = nominal.copy()
+    groups = {}
+    for i, case in enumerate(cases):
+        key = (case.canton, tuple(case.holidays) if case.holidays is not None else None, bool(case.court_holidays))
+        groups.setdefault(key, []).append(i)
+    for (canton, holidays, group_standstill), rows in groups.items():
+        closed = selected_holiday_array(sdt, edt, canton, holidays)
+        if group_standstill:
+            closed = np.union1d(closed, standstill_days)
+        calendar = np.busdaycalendar(weekmask=[1, 1, 1, 1, 1, 0, 0], holidays=closed)
+        end[rows] = np.busday_offset(nominal[rows], 0, roll="forward", busdaycal=calendar)
+
+    # Reasons of the extension, only for deadlines that were moved
+    results = []
+    for case, receipt_dt, start_dt, nominal_edt, end_dt, added_days in zip(
+            cases, receipt.tolist(), start.tolist(), nominal.tolist(), end.tolist(), added.tolist()):
+        extension_lst = []
+        if end_dt != nominal_edt:
+            end_dt, extension_lst = extend(
+                nominal_edt, case.canton, tuple(case.holidays) if case.holidays is not None else None, bool(case.court_holidays))
+        results.append(DeadlineResult(
+            receipt_dt=receipt_dt,
+            start_dt=start_dt,
+            nominal_edt=nominal_edt,
+            end_dt=end_dt,
+            court_holiday_days=added_days,
+            extension_lst=extension_lst))
+    return results
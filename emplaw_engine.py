@@ -0,0 +1,855 @@
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+import arrow
+import copy
+import numpy as np
+from calendar_math import add_months, add_months_array, add_period, add_years, push_endpoint, push_endpoint_array, subtract_corr
+from interval_set import IntervalSet
+import workdays
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Computation engine for the employment law app
+# Pure functions without any PyWebIO input or output, see EmplawApp.py for the user interface
+# Dates are datetime.date objects, arrow is only used for the dates of the case (input)
+# The termination sweep evaluates every possible termination date of a case in one vectorized pass
+
+
+# --- FUNCTIONS --- #
+
+# Function to calculate overlap between two date ranges
+def overlap_calc(sdt_1, sdt_2, edt_1, edt_2):
+        latest_start = max(sdt_1, sdt_2)
+        earliest_end = min(edt_1, edt_2)
+        delta = (earliest_end - latest_start).days + 1
+        overlap = max(0, delta)
+        return(overlap)
+
+# Function to get the date of the case without time information
+def to_date(dt):
+    if isinstance(dt, arrow.Arrow):
+        return dt.date()
+    return dt
+
+# Function to evaluate service year thresholds
+def get_last_index(list_of_elems, condition, default_idx=-1) -> int:
+    try:
+        return next(i for i in range(len(list_of_elems) - 1, -1, -1)
+                    if condition(list_of_elems[i]))
+    except StopIteration:  # no date earlier than comparison date is found
+        return default_idx
+
+# Function to calculate time period duration in days
+def period_duration(start_date, end_date):
+    return (end_date - start_date).days + 1
+    
+# Function to correct single dates
+def single_date(lst, first_index, last_index):
+    if lst[first_index] > lst[last_index]:
+        lst[first_index] = lst[last_index]
+        return lst
+
+# Function to merge the periods of a dict (key: list of [start, end] pairs) into a sorted list of periods
+# Empty periods are skipped, overlapping periods are merged
+def merge_periods(dct):
+    return IntervalSet(period for value in dct.values() for period in value).to_list()
+
+
+# --- CASE AND RESULT --- #
+
+# Input of a single case
+# Dates are arrow objects, incapacities are given per incapacity number as list of [start, end] pairs
+@dataclass
+class EmploymentCase:
+    employment_sdt: arrow.Arrow
+    workplace: str
+    incapacity_type: str | bool = False # False, "illacc", "milservice" or "preg"
+    incap_dct: dict = field(default_factory=dict)
+    trial_relevance: bool = False
+    workdays_num: list = field(default_factory=list) # weekday numbers, 0 = monday
+    trial_dur: int = 1 # months
+    termination_occurence: bool = False
+    termination_dt: arrow.Arrow | None = None
+    notice_period: int | None = None # months, None = legal minimum according to seniority
+    endpoint: str = "month" # "week", "month", "quarter", "year" or "anytime"
+    trial_notice_period: int = 7 # days
+
+# Result of a single case
+# Period lists follow the structure used throughout the engine: [start, end], dates are datetime.date objects
+@dataclass
+class EmploymentResult:
+    termination_case: str # "no_case", "standard_case", "trial_case" or "embargo_case"
+    termination_dt: date
+    new_employment_edt: date | None
+    syears: list
+    trial_lst: list
+    trial_extension_dur: int
+    reg_employment_lst: list
+    notice_period_lst: list
+    notice_comp_lst: list
+    notice_ext_lst: list
+    notice_overlap: int
+    incap_masterlst: list
+    embargo_masterlst: list
+    sickpay_masterlst: list
+
+    # Validity of termination, None if no termination was evaluated
+    @property
+    def termination_valid(self):
+        if self.termination_case == "no_case":
+            return None
+        return self.termination_case != "embargo_case"
+
+# Result of a termination sweep, one entry per candidate termination date
+# End of employment is None if a termination on that date is invalid
+@dataclass
+class TerminationSweep:
+    termination_dts: list
+    termination_cases: list # "standard_case", "trial_case" or "embargo_case"
+    new_employment_edts: list
+
+    # Earliest date with a valid termination, None if there is none in the range
+    @property
+    def earliest_valid_dt(self):
+        for termination_dt, termination_case in zip(self.termination_dts, self.termination_cases):
+            if termination_case != "embargo_case":
+                return termination_dt
+        return None
+
+
+# --- STAGES --- #
+
+# Memo of the stage outputs of a case, e.g. kept per session while a case is edited
+# A stage is only recomputed if its arguments changed (compared by value): an edit recomputes the stages
+# downstream of the changed input and stops where a recomputed stage returns the same output as before
+# Stages never modify their arguments, outputs are shared with the following stages
+class StageMemo:
+
+    def __init__(self):
+        self.entries = {} # stage name -> (arguments, output)
+        self.computed = [] # stages computed by the last evaluation
+
+    # Function to run a stage or return its memoized output
+    def run(self, name, fn, *args):
+        entry = self.entries.get(name)
+        if entry is not None and entry[0] == args:
+            return entry[1]
+        output = fn(*args)
+        self.entries[name] = (args, output)
+        self.computed.append(name)
+        return output
+
+# Function to run a stage without memo
+def run_stage(name, fn, *args):
+    return fn(*args)
+
+# Function to list the seniority thresholds (start of each service year)
+def seniority_thresholds(employment_sdt):
+    return [add_years(employment_sdt, i) for i in range(0, 35)]
+
+# Function to calculate the probation period, capped at the termination date
+# Returns the probation period [start, end] (only [start] if not evaluated) and the number of missed workdays
+def trial_period(employment_sdt, trial_relevance, trial_dur, workdays_num, workplace, incap_masterlst, termination_dt):
+
+    trial_lst = [employment_sdt]
+
+    # Counters
+    missed_workdays = 0
+    repeated_workdays = 0
+
+    # Check if user selected trial period evaluation
+    if trial_relevance == True:
+
+        # Calculate probation period end date
+        trial_lst.insert(1, min(add_months(trial_lst[0], trial_dur), termination_dt)) # BGer 4C.45/2004
+        trial_lst[1] = subtract_corr(trial_lst[0], trial_lst[1])
+
+        # Assume no trial extension
+        trial_extension = False
+        # Check if any incapacity lies within probation period
+        for incap_sublst in incap_masterlst:
+            if overlap_calc(trial_lst[0], incap_sublst[0], trial_lst[1], incap_sublst[1]) > 0:
+                trial_extension = True
+                break
+
+        if trial_extension == True:
+
+            # Working day calendar (weekdays and holidays) until one year after the last incapacity
+            workday_cal = workdays.workday_calendar(
+                workdays_num,
+                workplace,
+                trial_lst[0],
+                add_years(max(trial_lst[1], incap_masterlst[-1][1]), 1))
+
+            for incap_sublst in incap_masterlst:
+
+                # Count working days missed during probation period
+                missed_workdays += workdays.count_workdays(
+                    max(trial_lst[0], incap_sublst[0]),
+                    min(trial_lst[1], incap_sublst[1]),
+                    workday_cal)
+
+                # Repeat missed working days after probation period and incapacity, set extension end date
+                if missed_workdays > repeated_workdays:
+                    trial_extension_edt = workdays.offset_workdays(
+                        max(trial_lst[1], incap_sublst[1]) + timedelta(days=1),
+                        missed_workdays - repeated_workdays,
+                        workday_cal)
+                    repeated_workdays = missed_workdays
+                    trial_lst[1] = min(trial_extension_edt, termination_dt) # cap at termination
+
+        # Count probation period extension
+        trial_extension_dur = missed_workdays
+    else:
+        trial_extension_dur = 0
+
+    return trial_lst, trial_extension_dur
+
+# Function to calculate the embargo periods per incapacity, starting with regular employment
+# Returns the merged embargo periods and the pay periods of military service or maternity
+def embargo_periods(incapacity_type, incap_dct, reg_employment_sdt, syears):
+
+    # Deep copy incap dict into embargo dict
+    embargo_dct = copy.deepcopy(incap_dct)
+    embargo_negative = []
+    service_pay_lst = []
+
+    # --- CASE: ILLNESS OR ACCIDENT --- #
+
+    # Selected case type
+    if incapacity_type == "illacc":
+
+        # Loop through incapacities by incapacity
+        for key, value in embargo_dct.items():
+
+            # Keep score of embargo days for each incap
+            embargo_cap_loop = 30 # start with lowest
+            embargo_claimed_loop = 0
+            embargo_unclaimed_loop = 0
+
+            # Iterate over sublists
+            for embargo_sublst in value:
+
+                # Skip empty lists
+                if embargo_sublst == []:
+                    continue
+
+                # Only check new lists, skip other lists
+                if embargo_sublst in embargo_negative:
+                    continue
+
+                # Continue with next iteration if incapacitiy start date lies before the beginning of employment, empty sublist
+                if reg_employment_sdt >= embargo_sublst[1]:
+                    embargo_sublst.clear() # Clear list
+                    continue
+
+                # Set embargo cap according to seniority at beginning of incapacity
+                if embargo_sublst[0] < syears[1]:
+                    embargo_cap_loop = 30 # cap at 29 days incl. start and end date
+                elif embargo_sublst[0] >= syears[5]:
+                    embargo_cap_loop = 180 # cap at 180 days incl. start and end date
+                else:
+                    embargo_cap_loop = 90 # cap at 90 days incl. start and end date
+
+                # Skip if embargo_cap has been exceeded
+                if embargo_claimed_loop >= embargo_cap_loop:
+                    embargo_sublst.clear()
+                    continue
+
+                # Count unclaimed days, max 1 since 1 day will be subtracted
+                embargo_unclaimed_loop = max(1, (embargo_cap_loop - embargo_claimed_loop))
+
+                # Set embargo start date
+                embargo_sublst[0] = max(reg_employment_sdt, embargo_sublst[0]) # starts on reg employment at the earliest
+
+                # Check if service year 1, 5 is crossed during embargo period, adjust embargo cap
+                if embargo_sublst[0] <= syears[1] < embargo_sublst[1]:
+                    crossed_syear = 1
+                    embargo_cap_loop = 90 # cap at 90 days incl. start and end date
+                elif embargo_sublst[0] <= syears[5] < embargo_sublst[1]:
+                    crossed_syear = 5
+                    embargo_cap_loop = 180 # cap at 180 days incl. start and end date
+                else:
+                    # Set embargo end date into embargo dict, max date after cap is reached
+                    embargo_sublst[1] = min(embargo_sublst[0] + timedelta(days=embargo_unclaimed_loop - 1), embargo_sublst[1])
+                    # Count used days
+                    embargo_claimed_loop = period_duration(embargo_sublst[0], embargo_sublst[1])
+                    # Skip syear cleanup
+                    crossed_syear = 0
+
+                # Split embargo period if seniority threshold is crossed during embargo period
+                # Put split embargo periods into dict key 11, 12, 13...
+                if crossed_syear != 0:
+                
+                    # Save original end date
+                    save_date_embargo_split = embargo_sublst[1]
+                    # Set end of first period, max one day before syear change
+                    embargo_sublst[1] = min(embargo_sublst[0] + timedelta(days=embargo_unclaimed_loop - 1), syears[crossed_syear] - timedelta(days=1))
+                    # Calculate used balance
+                    embargo_claimed_loop += period_duration(embargo_sublst[0], embargo_sublst[1])
+                    # Count unclaimed days
+                    embargo_unclaimed_loop = max(1, (embargo_cap_loop - embargo_claimed_loop))
+
+                    # Insert new list
+                    new_embargo_sublist = []
+                    value.insert((value.index(embargo_sublst) + 1), new_embargo_sublist)
+                    # Set start of second period at syear change
+                    new_embargo_sublist.insert(0, syears[crossed_syear])
+                    # Set end of second period
+                    new_embargo_sublist.insert(1, min(new_embargo_sublist[0] + timedelta(days=embargo_unclaimed_loop - 1), save_date_embargo_split))
+                    # Add to negative list to test against
+                    embargo_negative.append(new_embargo_sublist)
+                    # Count used days
+                    embargo_claimed_loop += period_duration(new_embargo_sublist[0], new_embargo_sublist[1])
+
+
+    # --- CASE: MILITARY OR CIVIL SERVICE --- #
+
+    # Selected case type
+    if incapacity_type == "milservice":
+        for key, value in embargo_dct.items():
+            for embargo_sublst in value:
+
+                # Check if milservice duration was over 11 days
+                milservice_dur = period_duration(embargo_sublst[0], embargo_sublst[1])
+                if milservice_dur > 11:
+                    # Set embargo start to 4 weeks prior
+                    embargo_sublst[0] = embargo_sublst[0] - timedelta(weeks=4, days=1)
+                    # Set embargo end to 4 weeks after
+                    embargo_sublst[1] = embargo_sublst[1] + timedelta(weeks=4, days=1)
+
+                # Delete if embargo ended before regular employment
+                if reg_employment_sdt >= embargo_sublst[1]:
+                    embargo_sublst.clear() # Clear list
+                    continue
+
+                # Set embargo beginning at start of reg employment
+                embargo_sublst[0] = max(reg_employment_sdt, embargo_sublst[0])
+
+                # Forward beginning to regular employment end date
+                if reg_employment_sdt >= embargo_sublst[0]:
+                    embargo_sublst[0] = reg_employment_sdt
+
+                # Set sick pay (Erwerbsersatz) during milservice, calculate total
+                service_pay_lst = [[embargo_sublst[0], embargo_sublst[1]]]
+
+
+    # --- CASE: PREGNANCY --- #
+
+    # Selected case type
+    if incapacity_type == "preg":
+        for key, value in embargo_dct.items():
+            for embargo_sublst in value:
+                
+                # Set sick pay (maternity pay) to 14 weeks after confinement
+                service_pay_lst = [[embargo_sublst[1], embargo_sublst[1] + timedelta(weeks=14)]]
+                
+                # Extend embargo to 16 weeks after confinement
+                embargo_sublst[1] = embargo_sublst[1] + timedelta(weeks=16, days=-1)
+                sick_pay_claimed_total = period_duration(embargo_sublst[0], embargo_sublst[1])
+
+                # Delete if embargo ended before regular employment
+                if reg_employment_sdt >= embargo_sublst[1]:
+                    embargo_sublst.clear() # Clear list
+                    continue
+
+                # Set embargo beginning at start of reg employment
+                embargo_sublst[0] = max(reg_employment_sdt, embargo_sublst[0])
+
+                # Forward beginning to regular employment end date
+                if reg_employment_sdt >= embargo_sublst[0]:
+                    embargo_sublst[0] = reg_employment_sdt
+
+    # Prepare list of merged embargo periods
+    return merge_periods(embargo_dct), service_pay_lst
+
+# Function to calculate the notice period, its compensation and extension (Art. 335c and 336c OR)
+# Returns the termination date (shifted out of sight if no termination was given), the regular employment period,
+# the notice, compensation and extension periods, the number of compensation days and the end of employment
+def notice_periods(termination_occurence, termination_dt, notice_period, endpoint, reg_employment_sdt, syears, incapacity_type, embargo_masterlst):
+
+    reg_employment_lst = [reg_employment_sdt, termination_dt]
+    notice_period_lst = []
+    notice_comp_lst = []
+    notice_ext_lst = []
+
+    # Check if user selected termination evaluation
+    if termination_occurence == True:
+
+        # Legal minimum notice period according to seniority
+        if notice_period is None:
+            if termination_dt < syears[1]:
+                notice_period = 1
+            elif termination_dt >= syears[5]:
+                notice_period = 3
+            else:
+                notice_period = 2
+
+        # Calculate regular employment period end date
+        reg_employment_lst[1] = push_endpoint(reg_employment_lst[1], endpoint)
+
+        # Determine notice period start date (BGE 134 III 354)
+        notice_period_lst.insert(0, reg_employment_lst[1] + timedelta(days=1))
+
+        # Determine notice period end date
+        notice_period_lst.insert(1, add_months(reg_employment_lst[1], notice_period))
+
+        # Push notice period end date if required
+        notice_period_lst[1] = push_endpoint(notice_period_lst[1], endpoint)
+
+        # Backwards check of notice period duration, truncate
+        while add_months(notice_period_lst[0], notice_period) < notice_period_lst[1]:
+            notice_period_lst[0] = add_months(notice_period_lst[0], 1)
+            reg_employment_lst[1] = notice_period_lst[0] - timedelta(days=1)
+
+        # Calculate new employment end date
+        new_employment_edt = notice_period_lst[-1]
+
+        # Only calculate if incap has occured
+        if incapacity_type != False:
+
+            # Calculate total notice overlap, i.e. how many days of original notice period were missed,
+            # and the compensation period behind the notice period, extended across consecutive interruptions
+            # One sweep over the merged embargo periods
+            embargo_set = IntervalSet.from_sorted(tuple(embargo_sublst) for embargo_sublst in embargo_masterlst)
+            notice_overlap, notice_comp_edt = embargo_set.compensate(notice_period_lst[0], notice_period_lst[1])
+
+            # Shift missed notice period days, start and end date
+            if notice_overlap != 0:
+
+                notice_comp_lst.append(notice_period_lst[1] + timedelta(days=1))
+                notice_comp_lst.append(notice_comp_edt)
+
+                # Create extension if needed
+                if endpoint != "anytime":
+                    notice_ext_lst.insert(0, notice_comp_lst[1] + timedelta(days=1))
+                    notice_ext_lst.insert(1, push_endpoint(notice_comp_lst[1], endpoint))
+                    single_date(notice_ext_lst, 0, 1)
+                    new_employment_edt = notice_ext_lst[1]
+                else:
+                    new_employment_edt = notice_comp_lst[1]
+        
+        # Set variables if no incaps were given
+        else:
+            notice_overlap = 0
+
+    # Set termination date to regular employment endt date if no termination date was given
+    else: 
+        notice_overlap = 0
+        new_employment_edt = termination_dt
+        termination_dt = add_years(termination_dt, 200) # Shift out of sight
+
+    return termination_dt, reg_employment_lst, notice_period_lst, notice_comp_lst, notice_ext_lst, notice_overlap, new_employment_edt
+
+# Function to calculate the sick pay periods (Art. 324a OR), capped at the end of employment
+def sick_pay(incapacity_type, workplace, employment_sdt, incap_dct, syears, service_pay_lst, new_employment_edt):
+
+    # Sick pay dict per service year, populated with emtpy lists
+    sickpay_dct = {i: [] for i in range(0, 35)}
+    # Sick pay (Erwerbsersatz, maternity pay) set by the embargo periods
+    sickpay_dct[1] = [list(sickpay_sublst) for sickpay_sublst in service_pay_lst]
+
+    if incapacity_type == "illacc":
+
+        # Sick pay matrix, starting after first year of service
+        # Source: https://www.gerichte-zh.ch/themen/arbeit/waehrend-arbeitsverhaeltnis/arbeitsverhinderung/krankheit-und-unfall.html
+        # Include placeholder for index 0 since it is 3 weeks for all cantons
+        pay_matrix = [
+            ["", 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42], # ZH (weeks)
+            ["", 1, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 6, 6 ,6, 6, 6 ,6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6], # BS / BL (months)
+            ["", 1, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 6 ,6, 6, 6 ,6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6], # BE (months)
+        ]
+
+        # Choose sick pay duration
+        if workplace in ["ZH", "SH", "TG"]:
+            canton = 0
+            unit = "weeks"
+        elif workplace in ["BS", "BL"]:
+            canton = 1
+            unit = "months"
+        else:
+            canton = 2
+            unit = "months"
+
+        # Split sick pay periods into years
+        for key, value in incap_dct.items():
+            for incap_sublst in value:
+
+                # Skip empty lists
+                if incap_sublst == []:
+                    continue
+
+                # Skip sublists that end before beginning of claim
+                if add_months(employment_sdt, 3) >= incap_sublst[1]:
+                    continue
+
+                sickpay_sublst_1 = copy.deepcopy(incap_sublst)
+                sickpay_sublst_2 = []
+                
+                # Define sick pay start date max 3 months into employment
+                sickpay_sublst_1[0] = max(add_months(employment_sdt, 3), sickpay_sublst_1[0])
+
+                # Calculate seniority at the beginning of the incapacity
+                # Source: https://stackoverflow.com/a/70038244/14819955
+                sick_pay_syear_start_index = get_last_index(syears, lambda x: x < sickpay_sublst_1[0]) + 1 # +1 to denote year 0 as first syear
+
+                # Calculate seniority at the end of the incapacity
+                sick_pay_syear_end_index = get_last_index(syears, lambda x: x < sickpay_sublst_1[1]) + 1 # +1 to denote year 0 as first syear
+
+                # Compare seniority at start and end, split if not the same
+                # Group into dict according to start year
+                if sick_pay_syear_start_index != sick_pay_syear_end_index: # not in the same year
+                    # Hold original enddate
+                    save_date_sick_pay_split = sickpay_sublst_1[1]
+                    # Cap first period a day before syear
+                    sickpay_sublst_1[1] = min(sickpay_sublst_1[1], syears[sick_pay_syear_start_index] - timedelta(days=1))
+                    # Split period after syear
+                    sickpay_sublst_2.insert(0, syears[sick_pay_syear_start_index])
+                    sickpay_sublst_2.insert(1, save_date_sick_pay_split)
+                    # Sort second period into dict according to syear
+                    sickpay_dct[sick_pay_syear_end_index].append(sickpay_sublst_2)
+
+                # Sort first period into dict according to syear
+                sickpay_dct[sick_pay_syear_start_index].append(sickpay_sublst_1)
+
+        # Keep score of total
+        sick_pay_claimed_total = 0
+        # Loop through incapacities according to syear
+        for key, value in sickpay_dct.items():
+
+            # Keep score of sick pay for each loop (year)
+            sick_pay_cap = 21 # start with lowest lowest
+            sick_pay_claimed_loop = 0
+            sick_pay_unclaimed_loop = 0
+
+            # Iterate over sublists
+            for sickpay_sublst in value:
+
+                # Skip empty lists
+                if sickpay_sublst == []:
+                    continue
+
+                # Calculate sick pay according to service year
+                if syears[key] == syears[1]:
+                    sick_pay_cap = period_duration(sickpay_sublst[0], sickpay_sublst[0] + timedelta(weeks=3, days=-1))
+                else:
+                    # Add +1 to move query to the right index in sick pay matrix
+                    sick_pay_cap = period_duration(sickpay_sublst[0], add_period(sickpay_sublst[0], unit, pay_matrix[canton][key - 1]) - timedelta(days=1))
+
+                # Check if cap has been exceeded
+                if sick_pay_claimed_loop >= sick_pay_cap:
+                    sickpay_sublst.clear() # Clear list
+                    continue
+
+                # Calculate sick pay unclaimed
+                sick_pay_unclaimed_loop = max(1, (sick_pay_cap - sick_pay_claimed_loop))
+
+                # Set sick pay end date, cap sick pay at the earliest relevant occurence
+                sickpay_sublst[1] = min(sickpay_sublst[0] + timedelta(days=sick_pay_unclaimed_loop - 1), sickpay_sublst[1], new_employment_edt)
+
+                # Count used sick days
+                sick_pay_claimed_loop += period_duration(sickpay_sublst[0], sickpay_sublst[1])
+
+                # Count total
+                sick_pay_claimed_total += sick_pay_claimed_loop
+
+        # Delete empty syear keys from dict
+        for key in list(sickpay_dct.keys()):
+            if sickpay_dct[key] == []:
+                del sickpay_dct[key]
+
+    # Prepare list of merged sick pay periods
+    return merge_periods(sickpay_dct)
+
+# Function to evaluate the validity of the termination and to clean up the periods accordingly
+# Works on copies of the periods calculated by the other stages (result without termination case)
+def termination_validity(periods, termination_occurence, incapacity_type, trial_notice_period):
+
+    termination_dt = periods.termination_dt
+    new_employment_edt = periods.new_employment_edt
+    syears = list(periods.syears)
+    trial_lst = list(periods.trial_lst)
+    trial_extension_dur = periods.trial_extension_dur
+    reg_employment_lst = list(periods.reg_employment_lst)
+    notice_period_lst = list(periods.notice_period_lst)
+    notice_comp_lst = list(periods.notice_comp_lst)
+    notice_ext_lst = list(periods.notice_ext_lst)
+    notice_overlap = periods.notice_overlap
+    incap_masterlst = [list(incap_sublst) for incap_sublst in periods.incap_masterlst]
+    embargo_masterlst = [list(embargo_sublst) for embargo_sublst in periods.embargo_masterlst]
+    sickpay_masterlst = [list(sickpay_sublst) for sickpay_sublst in periods.sickpay_masterlst]
+
+    # Standard case
+    # Termination during prbation period
+    if termination_occurence == False:
+        termination_case = "no_case"
+    # Termination without issue
+    if termination_occurence == True:
+        termination_case = "standard_case"
+    # Termination during trial
+    if (termination_occurence == True) and trial_lst[0] <= termination_dt <= trial_lst[-1]:
+        termination_case = "trial_case"
+    # Termination during embargo period
+    if (termination_occurence == True) and (incapacity_type != False):
+        for embargo_sublst in embargo_masterlst:
+            if embargo_sublst[0] <= termination_dt <= embargo_sublst[-1]:
+                termination_case = "embargo_case"
+                break
+
+
+    # --- Termination case: No case --- #
+
+    if termination_case == "no_case":
+        new_employment_edt = None
+
+    # --- Termination case: TERMINATION DURING TRIAL PERIOD --- #
+
+    # Adjust varibles
+    if termination_case == "trial_case":
+        # Set end of trial period to termination date
+        trial_lst[1] = termination_dt
+        # Adjust notice period
+        notice_period_lst[0] = termination_dt + timedelta(days=1)
+        notice_period_lst[1] = termination_dt + timedelta(days=trial_notice_period)
+        notice_ext_lst.clear()
+        notice_comp_lst.clear()
+        notice_overlap = 0
+        reg_employment_lst.clear()
+        embargo_masterlst.clear()
+        new_employment_edt = notice_period_lst[-1]
+
+
+    # --- Termination case: TERMINATION DURING EMBARGO PERIOD --- #
+
+    # Adjust varibles
+    if termination_case == "embargo_case":
+        notice_period_lst.clear()
+        notice_overlap = 0
+        reg_employment_lst[1] = add_years(reg_employment_lst[1], 3) # showing that employment continues
+        notice_comp_lst.clear()
+        notice_ext_lst.clear()
+        new_employment_edt = None
+
+    # --- Cleanup sick pay and embargo periods --- #
+    # Delete sick pay and embargo periods after valid terminatio
+    if (termination_case == "standard_case") or (termination_case == "trial_case"):
+        for sickpay_sublst in sickpay_masterlst:
+
+            # Delete sick pay that starts after end of employment
+            if sickpay_sublst[0] > new_employment_edt:
+                sickpay_sublst.clear() # Clear list
+                continue
+
+            # Cap sick pay that surpasses end of employment
+            if sickpay_sublst[0] <= new_employment_edt <= sickpay_sublst[1]:
+                sickpay_sublst[1] = new_employment_edt
+                continue
+
+        for embargo_sublst in embargo_masterlst:
+
+            # Delete embargo that starts after end of employment
+            if embargo_sublst[0] > new_employment_edt:
+                embargo_sublst.clear()
+                continue
+
+        sickpay_masterlst = [sublst for sublst in sickpay_masterlst if sublst != []]
+        embargo_masterlst = [sublst for sublst in embargo_masterlst if sublst != []]
+
+    return EmploymentResult(
+        termination_case=termination_case,
+        termination_dt=termination_dt,
+        new_employment_edt=new_employment_edt,
+        syears=syears,
+        trial_lst=trial_lst,
+        trial_extension_dur=trial_extension_dur,
+        reg_employment_lst=reg_employment_lst,
+        notice_period_lst=notice_period_lst,
+        notice_comp_lst=notice_comp_lst,
+        notice_ext_lst=notice_ext_lst,
+        notice_overlap=notice_overlap,
+        incap_masterlst=incap_masterlst,
+        embargo_masterlst=embargo_masterlst,
+        sickpay_masterlst=sickpay_masterlst)
+
+
+# --- ENGINE --- #
+
+# Function to evaluate trial, embargo, notice and sick pay periods of a case
+# Stages: seniority thresholds -> trial -> embargo -> notice -> sick pay -> validity
+# With a StageMemo, only the stages affected by a change of the case since the last evaluation are recomputed
+def evaluate(case, memo=None):
+
+    if memo is None:
+        run = run_stage
+    else:
+        run = memo.run
+        memo.computed = []
+
+    # Variables from case, dates without time information
+    employment_sdt = to_date(case.employment_sdt)
+    workplace = case.workplace
+    incapacity_type = case.incapacity_type
+    incap_dct = {key: [[to_date(dt) for dt in period] for period in value] for key, value in case.incap_dct.items()}
+    trial_relevance = case.trial_relevance
+    termination_occurence = case.termination_occurence
+    # Set end of seniority to three years from today if no termination was issued
+    if termination_occurence == True:
+        termination_dt = to_date(case.termination_dt)
+    else:
+        termination_dt = add_years(date.today(), 3)
+
+    # List structure: unequal indicies indicate start dates, equal ones end dates (starts from index 0)
+
+    # List with seniority thresholds
+    syears = run("seniority", seniority_thresholds, employment_sdt)
+
+    # Prepare list of merged incap periods
+    incap_masterlst = run("incapacity", merge_periods, incap_dct)
+
+    # --- TRIAL PERIOD --- #
+
+    trial_lst, trial_extension_dur = run(
+        "trial", trial_period,
+        employment_sdt, trial_relevance, case.trial_dur, case.workdays_num, workplace, incap_masterlst, termination_dt)
+
+    # Shift regular employment start date to after trial period
+    reg_employment_sdt = employment_sdt
+    if trial_relevance == True:
+        reg_employment_sdt = trial_lst[-1] + timedelta(days=1)
+
+    # --- EMBARGO PERIODS --- #
+
+    embargo_masterlst, service_pay_lst = run(
+        "embargo", embargo_periods,
+        incapacity_type, incap_dct, reg_employment_sdt, syears)
+
+    # --- TERMINATION AND NOTICE PERIOD --- #
+
+    termination_dt, reg_employment_lst, notice_period_lst, notice_comp_lst, notice_ext_lst, notice_overlap, new_employment_edt = run(
+        "notice", notice_periods,
+        termination_occurence, termination_dt, case.notice_period, case.endpoint, reg_employment_sdt, syears, incapacity_type, embargo_masterlst)
+
+    # --- SICK PAY --- #
+
+    sickpay_masterlst = run(
+        "sickpay", sick_pay,
+        incapacity_type, workplace, employment_sdt, incap_dct, syears, service_pay_lst, new_employment_edt)
+
+    # --- EVALUATION AND CLEANUP --- #
+
+    periods = EmploymentResult(
+        termination_case=None,
+        termination_dt=termination_dt,
+        new_employment_edt=new_employment_edt,
+        syears=syears,
+        trial_lst=trial_lst,
+        trial_extension_dur=trial_extension_dur,
+        reg_employment_lst=reg_employment_lst,
+        notice_period_lst=notice_period_lst,
+        notice_comp_lst=notice_comp_lst,
+        notice_ext_lst=notice_ext_lst,
+        notice_overlap=notice_overlap,
+        incap_masterlst=incap_masterlst,
+        embargo_masterlst=embargo_masterlst,
+        sickpay_masterlst=sickpay_masterlst)
+
+    return run("validity", termination_validity, periods, termination_occurence, incapacity_type, case.trial_notice_period)
+
+
+# Function to evaluate a case with a memo, returns the result and the memo
+# The memo is returned as well, so it can be kept when evaluating in another process
+def evaluate_staged(case, memo):
+    return evaluate(case, memo), memo
+
+
+# --- TERMINATION SWEEP --- #
+
+# Function to evaluate validity and end of employment for every termination date between sdt and edt (inclusive)
+# Trial and embargo periods do not depend on the termination date once the probation period has ended:
+# they are calculated once, notice period, compensation and extension are calculated for all later dates at once
+# Termination dates until the end of the probation period (it is capped at the termination date) are evaluated one by one
+def sweep_termination(case, sdt, edt):
+
+    employment_sdt = to_date(case.employment_sdt)
+    incapacity_type = case.incapacity_type
+    incap_dct = {key: [[to_date(dt) for dt in period] for period in value] for key, value in case.incap_dct.items()}
+    endpoint = case.endpoint
+    # Terminations before the beginning of employment are not evaluated
+    sdt = max(to_date(sdt), employment_sdt)
+    edt = to_date(edt)
+
+    termination_dts = []
+    termination_cases = []
+    new_employment_edts = []
+    if sdt > edt:
+        return TerminationSweep(termination_dts, termination_cases, new_employment_edts)
+
+    # Periods independent of the termination date
+    syears = seniority_thresholds(employment_sdt)
+    incap_masterlst = merge_periods(incap_dct)
+    trial_lst, _ = trial_period(
+        employment_sdt, case.trial_relevance, case.trial_dur, case.workdays_num, case.workplace, incap_masterlst, date.max)
+    reg_employment_sdt = employment_sdt
+    if case.trial_relevance == True:
+        reg_employment_sdt = trial_lst[-1] + timedelta(days=1)
+    embargo_masterlst = []
+    if incapacity_type != False:
+        embargo_masterlst, _ = embargo_periods(incapacity_type, incap_dct, reg_employment_sdt, syears)
+
+    # Termination during the probation period
+    termination_dt = sdt
+    while case.trial_relevance == True and termination_dt <= min(edt, trial_lst[-1]):
+        result = evaluate(replace(case, termination_occurence=True, termination_dt=termination_dt))
+        termination_dts.append(termination_dt)
+        termination_cases.append(result.termination_case)
+        new_employment_edts.append(result.new_employment_edt)
+        termination_dt += timedelta(days=1)
+    if termination_dt > edt:
+        return TerminationSweep(termination_dts, termination_cases, new_employment_edts)
+
+    # Vectorized pass over all later termination dates
+    one = np.timedelta64(1, "D")
+    termination = np.arange(np.datetime64(termination_dt), np.datetime64(edt) + one)
+
+    # Legal minimum notice period according to seniority
+    if case.notice_period is None:
+        notice_period = np.where(
+            termination < np.datetime64(syears[1]), 1, np.where(termination >= np.datetime64(syears[5]), 3, 2))
+    else:
+        notice_period = np.full(len(termination), case.notice_period)
+
+    # Notice period (BGE 134 III 354), truncated by the backwards check of its duration
+    reg_employment_edt = push_endpoint_array(termination, endpoint)
+    notice_sdt = reg_employment_edt + one
+    notice_edt = push_endpoint_array(add_months_array(reg_employment_edt, notice_period), endpoint)
+    too_long = add_months_array(notice_sdt, notice_period) < notice_edt
+    while too_long.any():
+        notice_sdt = np.where(too_long, add_months_array(notice_sdt, 1), notice_sdt)
+        too_long = add_months_array(notice_sdt, notice_period) < notice_edt
+    new_employment_edt = notice_edt
+
+    # Embargo days as holidays of a calendar of running days: compensation days are the nth running day after the notice period
+    embargo = np.zeros(len(termination), dtype=bool)
+    if embargo_masterlst:
+        embargo_days = np.concatenate([
+            np.arange(np.datetime64(embargo_sublst[0]), np.datetime64(embargo_sublst[1]) + one)
+            for embargo_sublst in embargo_masterlst])
+        running = np.busdaycalendar(weekmask=[1] * 7, holidays=embargo_days)
+        notice_overlap = (notice_edt - notice_sdt).astype(int) + 1 - np.busday_count(notice_sdt, notice_edt + one, busdaycal=running)
+        notice_comp_edt = np.busday_offset(notice_edt + one, np.maximum(notice_overlap - 1, 0), roll="forward", busdaycal=running)
+        new_employment_edt = np.where(notice_overlap > 0, push_endpoint_array(notice_comp_edt, endpoint), notice_edt)
+        # Termination during embargo period
+        embargo = ~np.is_busday(termination, busdaycal=running)
+
+    for termination_dt, in_embargo, employment_edt in zip(termination.tolist(), embargo.tolist(), new_employment_edt.tolist()):
+        termination_dts.append(termination_dt)
+        if in_embargo:
+            termination_cases.append("embargo_case")
+            new_employment_edts.append(None)
+        else:
+            termination_cases.append("standard_case")
+            new_employment_edts.append(employment_edt)
+
+    return TerminationSweep(termination_dts, termination_cases, new_employment_edts)
@@ -0,0 +1,302 @@
+from html import escape
+import json
+import os
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Timeline visualization of an evaluated employment law case
+# No PyWebIO calls, language is passed explicitly so it can run in a worker pool
+# plotly is imported on first use to keep server startup and idle workers light
+# Renderer selected via environment variable PICCOLAW_TIMELINE:
+# - "plotly" (default): interactive chart, plotly.js is loaded by the client
+# - "svg": static SVG rendered on the server, a few KB per result
+# - "auto": SVG for mobile clients, plotly otherwise
+
+TIMELINE_RENDERER = os.environ.get("PICCOLAW_TIMELINE", "plotly")
+
+
+# Colors per task, labels in both languages
+# The regular notice period keeps the color it was assigned by plotly express before
+TASK_COLORS = {
+    "[PH_T]": "#ffffff",
+    "Sick Pay": "#f032e6", "Lohnfortzahlung": "#f032e6",
+    "Probation Period": "#f58231", "Probezeit": "#f58231",
+    "Regular Employment": "#3cb44b", "Reguläre Anstellung": "#3cb44b",
+    "Regular Notice Period": "#FF97FF", "Ordentliche Kündigungsfrist": "#FF97FF",
+    "Compensation Missed Notice Period": "#4363d8", "Kompensation verpasste Kündigungsfrist": "#4363d8",
+    "Sperrfrist": "#e6194B", "Embargo Period": "#e6194B",
+    "Notice Period Extension": "#911eb4", "Verlängerung Kündigungsfrist": "#911eb4",
+    "Incapacity": "#9A6324", "Arbeitsunfähigkeit": "#9A6324",
+    "[PH_B]": "#ffffff",
+}
+
+# Layout of the SVG timeline in pixels, rows from top to bottom
+SVG_WIDTH = 1000
+SVG_MARGIN = 20
+SVG_ROW_HEIGHT = 36
+SVG_ROW_GAP = 12
+SVG_ROWS = ["stack_2", "stack_3", "stack_4"]
+
+
+# --- FUNCTIONS --- #
+
+# Function to get date (without time information) from list, empty string if index does not exist
+def get_date(lst, index):
+    if index < len(lst):
+        return lst[index]
+    else:
+        return ""
+
+# Function to collect all timeline rows of a case in a single pass
+# Returns columns task, start, end and stack, dates without time information ("" if missing)
+def timeline_rows(case, result, lang):
+    rows = {"task": [], "start": [], "end": [], "stack": []}
+
+    # Function to add a row
+    def add(task, start, end, stack):
+        rows["task"].append(task)
+        rows["start"].append(start)
+        rows["end"].append(end)
+        rows["stack"].append(stack)
+
+    # Function to add a row for each period of a list
+    def add_periods(task, masterlst, stack):
+        for sublst in masterlst:
+            if sublst != []:
+                add(task, sublst[0], sublst[1], stack)
+
+    termination_dt = result.termination_dt
+
+    # Placeholder
+    add("[PH_T]", termination_dt, termination_dt, "stack_1")
+
+    # Sick pay
+    add_periods(lang("Sick Pay", "Lohnfortzahlung"), result.sickpay_masterlst, "stack_2")
+
+    # Trial period and regular employment
+    add(lang("Probation Period", "Probezeit"), get_date(result.trial_lst, 0), get_date(result.trial_lst, 1), "stack_3")
+    add(lang("Regular Employment","Reguläre Anstellung"), get_date(result.reg_employment_lst, 0), get_date(result.reg_employment_lst, 1), "stack_3")
+
+    # Embargo periods
+    if case.incapacity_type != False:
+        add_periods(lang("Embargo Period", "Sperrfrist"), result.embargo_masterlst, "stack_3")
+
+    # Notice period, missed notice period compensation and notice period extension
+    add(lang("Regular Notice Period", "Ordentliche Kündigungsfrist"), get_date(result.notice_period_lst, 0), get_date(result.notice_period_lst, 1), "stack_3")
+    add(lang("Compensation Missed Notice Period", "Kompensation verpasste Kündigungsfrist"), get_date(result.notice_comp_lst, 0), get_date(result.notice_comp_lst, 1), "stack_3")
+    add(lang("Notice Period Extension", "Verlängerung Kündigungsfrist"), get_date(result.notice_ext_lst, 0), get_date(result.notice_ext_lst, 1), "stack_3")
+
+    # Incapacities
+    if case.incapacity_type != False:
+        add_periods(lang("Incapacity", "Arbeitsunfähigkeit"), result.incap_masterlst, "stack_4")
+
+    # Placeholder
+    add("[PH_B]", termination_dt, termination_dt, "stack_5")
+
+    return rows
+
+# Function to convert timeline rows into horizontal bar traces, one trace per task
+# Bars start at "base" and have a length of "x" milliseconds
+def timeline_traces(rows):
+    traces = {}
+    for task, start, end, stack in zip(rows["task"], rows["start"], rows["end"], rows["stack"]):
+        if task not in traces:
+            traces[task] = dict(
+                type="bar",
+                orientation="h",
+                name=task,
+                legendgroup=task,
+                showlegend=True,
+                marker=dict(color=TASK_COLORS[task], opacity=1, line_width=1.0),
+                opacity=0.95,
+                hovertemplate="<b>%{hovertext}</b><br><br>start=%{base}<br>end=%{x}<extra></extra>",
+                base=[], x=[], y=[], hovertext=[])
+        trace = traces[task]
+        trace["base"].append(start if start != "" else None)
+        trace["x"].append((end - start).days * 86400000 if start != "" and end != "" else None)
+        trace["y"].append(stack)
+        trace["hovertext"].append(task)
+    return list(traces.values())
+
+# Function to get the timeline of a case as compact figure spec (JSON with data, layout and config)
+# The client draws it with the plotly.js served as static file, see static_assets
+def timeline_spec(case, result, german):
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
+    # Function to choose language
+    def lang(eng, german_text):
+        if german:
+            return german_text
+        else:
+            return eng
+
+    # --- OUTPUT VISUALIZATION - PREPARATION --- #
+
+    # Variables from result
+    termination_dt = result.termination_dt
+    syears = result.syears
+    reg_employment_lst = result.reg_employment_lst
+
+
+    # --- OUTPUT VISUALIZATION - GATHER DATA --- #
+
+    rows = timeline_rows(case, result, lang)
+
+    # --- OUTPUT VISUALIZATION - FORMAT --- #
+
+    fig = go.Figure(
+        data=timeline_traces(rows),
+        layout=dict(width=1000, height=700, legend_tracegroupgap=0))
+
+    config = {'displayModeBar': True,
+              'displaylogo': False,
+              'modeBarButtonsToRemove': ['select2d', 'lasso2d'],}
+
+    fig.update_xaxes(range=[get_date(reg_employment_lst, 0), get_date(reg_employment_lst, 1)])
+
+    fig.update_layout(
+        barmode="overlay",
+        xaxis = dict(
+            automargin=True,
+            dtick="M12",
+            tickformat="%d.%m.%Y",
+            type="date",
+            showgrid=True,
+            rangeslider_visible=True),
+        
+        margin=dict(
+            b=100,
+            t=200,),
+
+        yaxis = dict(
+            automargin=True,
+            visible=False,
+            autorange="reversed",
+            showgrid=True),
+        
+        legend=dict(
+            title="",
+            orientation="h",
+            font_size=16,
+            x=0,
+            y=1.1),
+
+        shapes = [
+            dict(
+            x0=termination_dt, x1=termination_dt, line_color="#DB162F", fillcolor="#DB162F", y0=0, y1=1, xref='x', yref='paper',
+            line_width=3),
+            dict(
+            x0=syears[1], x1=syears[1], line_color="#3B6728", fillcolor="#3B6728", y0=0, y1=1, xref='x', yref='paper',
+            line_width=1.5),
+            dict(
+            x0=syears[5], x1=syears[5], line_color="#3B6728", fillcolor="#3B6728", y0=0, y1=1, xref='x', yref='paper',
+            line_width=1.5),
+            ],
+            
+        
+        annotations=[
+            dict(
+            x=termination_dt, y=1, xref='x', yref='paper',font=dict(size=16, color="#DB162F"),
+            showarrow=False, xanchor='left', text=lang("Termination", "Kündigung")),
+            dict(
+            x=syears[1], y=0.05, xref='x', yref='paper',font=dict(size=16, color="#3B6728"),
+            showarrow=False, xanchor='left', text="1Y"),
+            dict(
+            x=syears[5], y=0.05, xref='x', yref='paper',font=dict(size=16, color="#3B6728"),
+            showarrow=False, xanchor='left', text="5Y"),
+            ])
+
+    spec = fig.to_plotly_json()
+    spec["config"] = config
+    return json.dumps(
+        spec,
+        cls=PlotlyJSONEncoder,
+        separators=(",", ":"))
+
+
+# Function to render the timeline of a case as static SVG
+# Same rows and markers as the plotly chart, drawn directly from the timeline rows
+def timeline_svg(case, result, german):
+
+    # Function to choose language
+    def lang(eng, german_text):
+        if german:
+            return german_text
+        else:
+            return eng
+
+    rows = timeline_rows(case, result, lang)
+    bars = [
+        (task, start, end, stack)
+        for task, start, end, stack in zip(rows["task"], rows["start"], rows["end"], rows["stack"])
+        if stack in SVG_ROWS and start != "" and end != ""]
+
+    # Visible range: probation period, regular employment and notice periods, otherwise all bars
+    # The SVG cannot be panned, so the range is wider than the initial view of the plotly chart
+    range_sdt = get_date(result.trial_lst, 0) or get_date(result.reg_employment_lst, 0)
+    range_edt = get_date(result.reg_employment_lst, 1)
+    notice_edts = [get_date(lst, 1) for lst in (result.notice_period_lst, result.notice_comp_lst, result.notice_ext_lst)]
+    if range_edt != "":
+        range_edt = max([range_edt] + [edt for edt in notice_edts if edt != ""])
+    if range_sdt == "" or range_edt == "":
+        dates = [bar[1] for bar in bars] + [bar[2] for bar in bars] or [result.termination_dt]
+        range_sdt, range_edt = min(dates), max(dates)
+    span = max((range_edt - range_sdt).days, 1)
+    plot_width = SVG_WIDTH - 2 * SVG_MARGIN
+    bars = [bar for bar in bars if bar[2] >= range_sdt and bar[1] <= range_edt]
+
+    # Function to get the x position of a date, clamped to the visible range
+    def x_pos(day):
+        return SVG_MARGIN + (min(max(day, range_sdt), range_edt) - range_sdt).days / span * plot_width
+
+    svg = []
+
+    # Legend (visible tasks in order of appearance), wrapped to the width
+    legend_x, legend_y = SVG_MARGIN, 20
+    for task in dict.fromkeys(bar[0] for bar in bars):
+        item_width = 32 + 8 * len(task)
+        if legend_x + item_width > SVG_WIDTH - SVG_MARGIN:
+            legend_x, legend_y = SVG_MARGIN, legend_y + 24
+        svg.append(f'<rect x="{legend_x}" y="{legend_y - 11}" width="14" height="14" fill="{TASK_COLORS[task]}"/>')
+        svg.append(f'<text x="{legend_x + 20}" y="{legend_y}">{escape(task)}</text>')
+        legend_x += item_width
+
+    # Bars, overlapping bars of a row are drawn in order
+    plot_top = legend_y + 40
+    plot_bottom = plot_top + len(SVG_ROWS) * (SVG_ROW_HEIGHT + SVG_ROW_GAP)
+    for task, start, end, stack in bars:
+        x0 = x_pos(start)
+        y0 = plot_top + SVG_ROWS.index(stack) * (SVG_ROW_HEIGHT + SVG_ROW_GAP) + SVG_ROW_GAP / 2
+        svg.append(
+            f'<rect x="{x0:.1f}" y="{y0:.1f}" width="{max(x_pos(end) - x0, 1):.1f}" height="{SVG_ROW_HEIGHT}" '
+            f'fill="{TASK_COLORS[task]}" fill-opacity="0.95" stroke="#ffffff"><title>{escape(task)}: '
+            f'{start.strftime("%d.%m.%Y")} - {end.strftime("%d.%m.%Y")}</title></rect>')
+
+    # Axis with yearly ticks, labels thinned out for long ranges
+    svg.append(f'<line x1="{SVG_MARGIN}" y1="{plot_bottom}" x2="{SVG_WIDTH - SVG_MARGIN}" y2="{plot_bottom}" stroke="#444444"/>')
+    step = -(-(range_edt.year - range_sdt.year) // 10) or 1
+    for year in range(range_sdt.year + 1, range_edt.year + 1, step):
+        x = x_pos(range_sdt.replace(year=year, month=1, day=1))
+        svg.append(f'<line x1="{x:.1f}" y1="{plot_top}" x2="{x:.1f}" y2="{plot_bottom + 5}" stroke="#dfe2e5"/>')
+        svg.append(f'<text x="{x:.1f}" y="{plot_bottom + 20}" text-anchor="middle" font-size="12">01.01.{year}</text>')
+
+    # Termination and service year markers
+    markers = [
+        (result.termination_dt, "#DB162F", 3, lang("Termination", "Kündigung"), plot_top + 14),
+        (result.syears[1], "#3B6728", 1.5, "1Y", plot_bottom - 6),
+        (result.syears[5], "#3B6728", 1.5, "5Y", plot_bottom - 6),
+    ]
+    for day, color, width, text, text_y in markers:
+        if range_sdt <= day <= range_edt:
+            x = x_pos(day)
+            svg.append(f'<line x1="{x:.1f}" y1="{plot_top}" x2="{x:.1f}" y2="{plot_bottom}" stroke="{color}" stroke-width="{width}"/>')
+            svg.append(f'<text x="{x + 4:.1f}" y="{text_y}" fill="{color}" font-size="16">{escape(text)}</text>')
+
+    height = plot_bottom + 40
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SVG_WIDTH} {height}" width="100%" '
+        f'font-family="sans-serif" font-size="14" role="img" aria-label="{escape(lang("Timeline", "Zeitachse"))}">'
+        + "".join(svg) + "</svg>")
@@ -0,0 +1,196 @@
+from datetime import date, timedelta
+from functools import lru_cache
+import hashlib
+import mmap
+import os
+import struct
+from dateutil.easter import easter
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Swiss cantonal holidays, shared by all apps
+# Source: https://www.bj.admin.ch/dam/bj/de/data/publiservice/service/zivilprozessrecht/kant-feiertage.pdf
+
+
+# --- HOLIDAY RULES --- #
+
+CANTONS = ["AG", "AI", "AR", "BS", "BL", "BE", "FR", "GE", "GL", "GR", "JU", "LU", "NE", "NW",
+           "OW", "SH", "SZ", "SO", "SG", "TG", "TI", "UR", "VS", "VD", "ZG", "ZH"]
+
+# Function to get the first given weekday (0 = monday) on or after a date
+def next_weekday(day, weekday):
+    return day + timedelta(days=(weekday - day.weekday()) % 7)
+
+# List of holidays: label, function returning the date for a given year (and easter date), cantons
+HOLIDAYS = [
+    ("Neujahrstag",
+        lambda year, easter_dt: date(year, 1, 1),
+        CANTONS),
+    ("Berchtoldstag",
+        lambda year, easter_dt: date(year, 1, 2),
+        ["ZH", "BE", "LU", "OW", "NW", "GL", "ZG", "FR", "SO", "SH", "SG", "AG", "TG", "VD", "VS", "NE", "JU"]),
+    ("Heilige Drei Könige",
+        lambda year, easter_dt: date(year, 1, 6),
+        ["UR", "SZ", "TI"]),
+    ("Jahrestag der Ausrufung der Republik Neuenburg",
+        lambda year, easter_dt: date(year, 3, 1),
+        ["NE"]),
+    ("Josefstag",
+        lambda year, easter_dt: date(year, 3, 19),
+        ["UR", "SZ", "NW", "SO", "TI", "VS"]),
+    ("Karfreitag",
+        lambda year, easter_dt: easter_dt - timedelta(days=2),
+        ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "VD", "NE", "GE", "JU"]),
+    ("Ostermontag",
+        lambda year, easter_dt: easter_dt + timedelta(days=1),
+        ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "GE", "JU"]),
+    ("Fahrtsfest",
+        lambda year, easter_dt: next_weekday(date(year, 4, 1), 4),
+        ["GL"]),
+    ("Tag der Arbeit",
+        lambda year, easter_dt: date(year, 5, 1),
+        ["ZH", "BS", "BL", "SH", "AG", "TG", "TI", "NE", "JU"]),
+    ("Auffahrt",
+        lambda year, easter_dt: easter_dt + timedelta(days=39),
+        ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "NE", "GE", "JU"]),
+    ("Pfingstmontag",
+        lambda year, easter_dt: easter_dt + timedelta(days=50),
+        ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VD", "VS", "GE", "JU"]),
+    ("Frohnleichnam",
+        lambda year, easter_dt: easter_dt + timedelta(days=60),
+        ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR", "SO", "AI", "AG", "TI", "VS", "NE", "JU"]),
+    ("Commémoration du Plébiscite Jurassien",
+        lambda year, easter_dt: date(year, 6, 23),
+        ["JU"]),
+    ("Peter und Paul",
+        lambda year, easter_dt: date(year, 6, 29),
+        ["TI"]),
+    ("Bundesfeier",
+        lambda year, easter_dt: date(year, 8, 1),
+        CANTONS),
+    ("Mariä Himmelfahrt",
+        lambda year, easter_dt: date(year, 8, 15),
+        ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR", "SO", "AI", "AG", "TI", "VS", "JU"]),
+    ("Jeûne Genevois",
+        lambda year, easter_dt: next_weekday(next_weekday(date(year, 9, 1), 6), 3),
+        ["GE"]),
+    ("Lundi du Jeûne",
+        lambda year, easter_dt: next_weekday(date(year, 9, 1), 6) + timedelta(days=15),
+        ["VD"]),
+    ("Mauritiustag",
+        lambda year, easter_dt: date(year, 9, 25),
+        ["AI"]),
+    ("Bruderklausenfest",
+        lambda year, easter_dt: date(year, 9, 25),
+        ["OW"]),
+    ("Allerheiligen",
+        lambda year, easter_dt: date(year, 11, 1),
+        ["LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "SO", "AI", "SG", "AG", "TI", "VS", "JU"]),
+    ("Mariä Empfängnis",
+        lambda year, easter_dt: date(year, 12, 8),
+        ["LU", "UR", "SZ", "OW", "NW", "ZG", "FR", "AI", "AG", "TI", "VS"]),
+    ("Weihnachtstag",
+        lambda year, easter_dt: date(year, 12, 25),
+        CANTONS),
+    ("Stephanstag",
+        lambda year, easter_dt: date(year, 12, 26),
+        ["ZH", "BE", "LU", "UR", "SZ", "OW", "NW", "GL", "ZG", "FR", "BS", "BL", "SH", "AR", "AI", "SG", "GR", "AG", "TG", "TI", "VS", "NE"]),
+    ("Restauration de la République",
+        lambda year, easter_dt: date(year, 12, 31),
+        ["GE"]),
+]
+
+
+# --- HOLIDAY CALENDAR ARTIFACT --- #
+# Pre-built binary calendar, generated by build_holidays.py
+# Layout: header, canton codes (2 bytes each), one bitset per canton (bit set = holiday, one bit per day)
+# The file is memory mapped read-only, so all worker processes share one copy
+# Holidays are computed from the rules if the file is missing, outdated or the date is out of range
+
+CALENDAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "holidays.bin")
+CALENDAR_MAGIC = b"PCHC"
+CALENDAR_FORMAT = 1
+CALENDAR_FIRST_YEAR = 1900
+CALENDAR_LAST_YEAR = 2100
+CALENDAR_HEADER = struct.Struct("<4sHHHH32s") # magic, format, first year, last year, number of cantons, rules hash
+
+# Function to get the hash of the holiday rules (source of this module)
+def rules_hash():
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+# Function to map the calendar file, None if missing or not built from the current rules
+# Returns buffer, first day, last day and offset of the bitset per canton
+def load_calendar(path):
+    try:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buf) < CALENDAR_HEADER.size:
+        return None
+    magic, fmt, first_year, last_year, canton_num, digest = CALENDAR_HEADER.unpack_from(buf)
+    if magic != CALENDAR_MAGIC or fmt != CALENDAR_FORMAT or digest != rules_hash():
+        return None
+    first_day = date(first_year, 1, 1)
+    last_day = date(last_year, 12, 31)
+    bitset_len = ((last_day - first_day).days + 8) // 8
+    offset = CALENDAR_HEADER.size + 2 * canton_num
+    if len(buf) != offset + canton_num * bitset_len:
+        return None
+    offsets = {}
+    for i in range(canton_num):
+        canton = bytes(buf[CALENDAR_HEADER.size + 2 * i:CALENDAR_HEADER.size + 2 * i + 2]).decode("ascii")
+        offsets[canton] = offset + i * bitset_len
+    return buf, first_day, last_day, offsets
+
+calendar = load_calendar(CALENDAR_PATH)
+
+# Positions of the set bits for each byte value
+BIT_POSITIONS = [[bit for bit in range(8) if value >> bit & 1] for value in range(256)]
+
+
+# --- HOLIDAY INDEX --- #
+
+# Function to get all holidays of a year as dict (date: label)
+# Result only depends on year and canton, built once per combination
+@lru_cache(maxsize=None)
+def holiday_table(year, canton):
+    easter_dt = easter(year)
+    table = {}
+    for label, rule, cantons in HOLIDAYS:
+        if canton in cantons:
+            table.setdefault(rule(year, easter_dt), label)
+    return table
+
+# Function to check if a given date is a holiday
+def is_holiday(day, canton):
+    if calendar is not None and calendar[1] <= day <= calendar[2] and canton in calendar[3]:
+        buf, first_day, last_day, offsets = calendar
+        i = (day - first_day).days
+        return bool(buf[offsets[canton] + i // 8] >> (i % 8) & 1)
+    return day in holiday_table(day.year, canton)
+
+# Function to list all holidays between two dates (inclusive), sorted
+def holidays_between(sdt, edt, canton):
+    if calendar is not None and calendar[1] <= sdt and edt <= calendar[2] and canton in calendar[3]:
+        buf, first_day, last_day, offsets = calendar
+        holidays = []
+        start = (sdt - first_day).days
+        end = (edt - first_day).days
+        if start > end:
+            return holidays
+        # Copy the bytes of the range once, most bytes are zero (no holiday)
+        chunk = buf[offsets[canton] + start // 8:offsets[canton] + end // 8 + 1]
+        for i, byte in enumerate(chunk, start=start // 8):
+            if byte:
+                for bit in BIT_POSITIONS[byte]:
+                    if start <= i * 8 + bit <= end:
+                        holidays.append(first_day + timedelta(days=i * 8 + bit))
+        return holidays
+    holidays = []
+    for year in range(sdt.year, edt.year + 1):
+        holidays.extend(day for day in holiday_table(year, canton) if sdt <= day <= edt)
+    return sorted(holidays)
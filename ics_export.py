@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# iCalendar export (RFC 5545) of employment law periods and deadlines
+# Periods become all-day events, the document is generated as a stream of chunks (one per event)
+# Consumers write the chunks as they come, so large batch exports never hold the whole document
+# No PyWebIO calls, language is passed explicitly
+
+PRODID = "-//piccolaw//piccolaw-apps//EN"
+UID_DOMAIN = "piccolaw.ch"
+LINE_LENGTH = 75 # octets per line before folding
+
+
+# --- FUNCTIONS --- #
+
+# Function to escape text values
+def escape_text(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+# Function to fold a content line into lines of at most 75 octets, continuation lines start with a space
+def fold(line):
+    data = line.encode("utf-8")
+    if len(data) <= LINE_LENGTH:
+        return line + "\r\n"
+    parts = []
+    limit = LINE_LENGTH
+    while data:
+        # Never split a multi-byte character
+        cut = min(limit, len(data))
+        while cut < len(data) and data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = LINE_LENGTH - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+# Function to get a stable UID of an event, repeated exports update the same events
+def event_uid(prefix, summary, sdt, edt):
+    digest = hashlib.sha1("|".join([prefix, summary, sdt.isoformat(), edt.isoformat()]).encode("utf-8"))
+    return digest.hexdigest()[:24] + "@" + UID_DOMAIN
+
+# Function to get the creation time stamp of events (UTC)
+def dtstamp():
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+# Function to format a single all-day event, end date inclusive
+def vevent(summary, sdt, edt, stamp, uid_prefix="", description=None):
+    lines = [
+        "BEGIN:VEVENT",
+        "UID:" + event_uid(uid_prefix, summary, sdt, edt),
+        "DTSTAMP:" + stamp,
+        "DTSTART;VALUE=DATE:" + sdt.strftime("%Y%m%d"),
+        # DTEND of all-day events is exclusive
+        "DTEND;VALUE=DATE:" + (edt + timedelta(days=1)).strftime("%Y%m%d"),
+        "SUMMARY:" + escape_text(summary),
+    ]
+    if description:
+        lines.append("DESCRIPTION:" + escape_text(description))
+    lines.append("TRANSP:TRANSPARENT")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+# Function to generate an iCalendar document from events (summary, start, end, description)
+# Yields the header, one chunk per event and the footer
+def ics_chunks(events, name=None, uid_prefix=""):
+    stamp = dtstamp()
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:" + PRODID, "CALSCALE:GREGORIAN", "METHOD:PUBLISH"]
+    if name:
+        header.append("X-WR-CALNAME:" + escape_text(name))
+    yield "".join(fold(line) for line in header)
+    for summary, sdt, edt, description in events:
+        yield vevent(summary, sdt, edt, stamp, uid_prefix, description)
+    yield fold("END:VCALENDAR")
+
+# Function to list the events of an evaluated employment law case (summary, start, end, description)
+def employment_events(case, result, german, prefix=""):
+
+    # Function to choose language
+    def lang(eng, german_text):
+        if german:
+            return german_text
+        else:
+            return eng
+
+    # Function to list the periods of a list of [start, end] pairs
+    def periods(summary, masterlst):
+        for sublst in masterlst:
+            if sublst != []:
+                yield prefix + summary, sublst[0], sublst[1], None
+
+    if case.trial_relevance and len(result.trial_lst) > 1:
+        yield prefix + lang("Probation Period", "Probezeit"), result.trial_lst[0], result.trial_lst[1], None
+
+    if case.incapacity_type != False:
+        yield from periods(lang("Incapacity", "Arbeitsunfähigkeit"), result.incap_masterlst)
+        yield from periods(lang("Embargo Period", "Sperrfrist"), result.embargo_masterlst)
+        yield from periods(lang("Sick Pay", "Lohnfortzahlung"), result.sickpay_masterlst)
+
+    # Notice periods only exist for a valid termination
+    if result.termination_case in ["standard_case", "trial_case"]:
+        yield from periods(lang("Regular Notice Period", "Ordentliche Kündigungsfrist"), [result.notice_period_lst])
+        yield from periods(lang("Compensation Missed Notice Period", "Kompensation verpasste Kündigungsfrist"), [result.notice_comp_lst])
+        yield from periods(lang("Notice Period Extension", "Verlängerung Kündigungsfrist"), [result.notice_ext_lst])
+        if result.new_employment_edt is not None:
+            yield (prefix + lang("End of Employment", "Ende Arbeitsverhältnis"),
+                result.new_employment_edt, result.new_employment_edt, None)
+
+# Function to list the event of an evaluated deadline (summary, start, end, description)
+def deadline_events(case, result, german, prefix=""):
+
+    # Function to choose language
+    def lang(eng, german_text):
+        if german:
+            return german_text
+        else:
+            return eng
+
+    description = lang("Receipt: ", "Empfang: ") + result.receipt_dt.strftime("%d.%m.%Y") + ", " + \
+        lang("start of deadline: ", "Fristbeginn: ") + result.start_dt.strftime("%d.%m.%Y") + ", " + \
+        lang("canton: ", "Kanton: ") + case.canton
+    yield prefix + lang("End of Deadline", "Fristende"), result.end_dt, result.end_dt, description
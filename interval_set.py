@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Sorted set of closed date intervals [start, end] (both days included)
+# Overlapping intervals are merged, intervals that only follow each other (end + 1 day = start) are kept apart,
+# so merged incapacities and embargo periods are listed the same way as they were entered
+# Empty input periods ([] or start after end) are ignored
+
+
+# --- INTERVAL SET --- #
+
+class IntervalSet:
+
+    __slots__ = ("intervals",)
+
+    # Build from any iterable of [start, end] pairs: one sort, then a single pass
+    def __init__(self, periods=()):
+        self.intervals = []
+        for start, end in sorted(tuple(period) for period in periods if len(period) == 2 and period[0] <= period[1]):
+            self.add_sorted(start, end)
+
+    # Function to create a set from intervals that are already sorted and merged
+    @classmethod
+    def from_sorted(cls, intervals):
+        interval_set = cls()
+        interval_set.intervals = list(intervals)
+        return interval_set
+
+    # Function to append an interval that does not start before the last one
+    def add_sorted(self, start, end):
+        if self.intervals and start <= self.intervals[-1][1]:
+            if end > self.intervals[-1][1]:
+                self.intervals[-1] = (self.intervals[-1][0], end)
+        else:
+            self.intervals.append((start, end))
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __repr__(self):
+        return "IntervalSet(" + repr(self.intervals) + ")"
+
+    # Function to get the intervals in the list structure used by the engine: [[start, end], ...]
+    def to_list(self):
+        return [[start, end] for start, end in self.intervals]
+
+    # Function to get the union with another set (linear merge of both sorted lists)
+    def union(self, other):
+        result = IntervalSet()
+        a, b = self.intervals, other.intervals
+        i = j = 0
+        while i < len(a) or j < len(b):
+            if j == len(b) or (i < len(a) and a[i] <= b[j]):
+                result.add_sorted(*a[i])
+                i += 1
+            else:
+                result.add_sorted(*b[j])
+                j += 1
+        return result
+
+    # Function to get the intersection with another set
+    def intersection(self, other):
+        result = []
+        a, b = self.intervals, other.intervals
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start <= end:
+                result.append((start, end))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet.from_sorted(result)
+
+    # Function to check if a date lies within one of the intervals
+    def contains(self, day):
+        return any(start <= day <= end for start, end in self.intervals)
+
+    # Function to count the days covered by the set
+    def days(self):
+        return sum((end - start).days + 1 for start, end in self.intervals)
+
+    # Function to count the days covered by the set between two dates (inclusive)
+    def overlap_days(self, sdt, edt):
+        days = 0
+        for start, end in self.intervals:
+            if start > edt:
+                break
+            days += max(0, (min(end, edt) - max(start, sdt)).days + 1)
+        return days
+
+    # Function to extend a period [start, end] across the intervals it meets
+    # Each interval overlapping the (growing) period moves the end behind the interval by the number of overlapping days
+    def extend(self, start, end):
+        return [start, self.extend_from(0, start, end)]
+
+    # Function to extend the end of a period, starting with the interval at index i
+    def extend_from(self, i, start, end):
+        for lo, hi in self.intervals[i:]:
+            if hi < start:
+                # interval is lower than the period
+                continue
+            if lo > end:
+                # interval is higher than the period
+                break
+            overlap = (min(end, hi) - max(start, lo)).days + 1
+            end = max(end, hi) + timedelta(days=overlap)
+        return end
+
+    # Function to count the days covered within [sdt, edt] and append as many days after edt, extended across the intervals
+    # Returns the number of days and the end of the appended period (None if no days are covered)
+    # Single sweep: the intervals up to edt are counted, the extension continues from the last of them
+    def compensate(self, sdt, edt):
+        days = 0
+        i = 0
+        while i < len(self.intervals) and self.intervals[i][0] <= edt:
+            lo, hi = self.intervals[i]
+            days += max(0, (min(hi, edt) - max(lo, sdt)).days + 1)
+            i += 1
+        if days == 0:
+            return 0, None
+        # Only the last counted interval can reach beyond edt
+        if i > 0 and self.intervals[i - 1][1] > edt:
+            i -= 1
+        start = edt + timedelta(days=1)
+        return days, self.extend_from(i, start, edt + timedelta(days=days))
@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from importlib import util
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import arrow
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Cache for evaluation results and rendered output, keyed by a hash of the normalized case inputs
+# Values are stored pickled: every hit returns a fresh copy, so sessions never share mutable results
+# LRU eviction with a bound on entries and bytes, entries expire after a TTL
+# Keys carry the ruleset version, so a change of the legal rules invalidates all entries
+# Configuration via environment variables:
+# - PICCOLAW_CACHE: "memory" (default, per process) or "sqlite" (shared by all processes on the host)
+# - PICCOLAW_CACHE_PATH: database file of the sqlite backend (default: piccolaw-cache.sqlite3 in the temp directory)
+# - PICCOLAW_CACHE_SIZE: maximum number of entries (default: 1024, 0 disables the cache)
+# - PICCOLAW_CACHE_BYTES: maximum size of all entries in bytes (default: 64 MB)
+# - PICCOLAW_CACHE_TTL: time to live of an entry in seconds (default: 3600)
+
+# Modules containing the legal rules (pay_matrix, date arithmetic, periods, holidays, working days) and the rendering of results
+RULESET_MODULES = ["emplaw_engine", "calendar_math", "interval_set", "holiday_calendar", "workdays", "emplaw_timeline"]
+
+
+# --- RULESET --- #
+
+# Function to get the version of the ruleset, hash of the source of the rule modules
+def ruleset_version():
+    digest = hashlib.sha256()
+    for name in RULESET_MODULES:
+        with open(util.find_spec(name).origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+RULESET_VERSION = ruleset_version()
+
+
+# --- CACHE --- #
+
+class MemoryCache:
+
+    def __init__(self, maxsize=1024, maxbytes=64 * 2 ** 20, ttl=3600):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.entries = OrderedDict() # key -> (expiry time, pickled value)
+        self.size = 0
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    # Function to get a value, None if missing or expired
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self.remove(key)
+                self.counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+        return pickle.loads(entry[1])
+
+    # Function to store a value, least recently used entries are evicted first
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.maxsize <= 0 or len(data) > self.maxbytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, data)
+            self.size += len(data)
+            while len(self.entries) > self.maxsize or self.size > self.maxbytes:
+                self.remove(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    # Function to remove an entry (lock must be held)
+    def remove(self, key):
+        self.size -= len(self.entries.pop(key)[1])
+
+    # Function to remove all entries
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    # Function to get counters and current size
+    def stats(self):
+        with self.lock:
+            return {**self.counters, "entries": len(self.entries), "bytes": self.size}
+
+
+# Cache in a local SQLite database, shared by all processes on the host
+# Entries of other ruleset versions are removed when the database is opened
+class SqliteCache:
+
+    def __init__(self, path, maxsize=1024, maxbytes=64 * 2 ** 20, ttl=3600, version=""):
+        self.path = path
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.version = version
+        self.local = threading.local()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self.counters_lock = threading.Lock()
+        with self.connect() as db:
+            db.execute("DELETE FROM cache WHERE version != ?", (self.version,))
+
+    # Function to get the connection of the current thread and process
+    def connect(self):
+        if getattr(self.local, "pid", None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, version TEXT, value BLOB, size INTEGER, expires REAL, accessed REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+            self.local.db = db
+            self.local.pid = os.getpid()
+        return self.local.db
+
+    # Function to increase a counter
+    def count(self, name):
+        with self.counters_lock:
+            self.counters[name] += 1
+
+    # Function to get a value, None if missing or expired
+    def get(self, key):
+        db = self.connect()
+        now = time.time()
+        row = db.execute("SELECT value, expires FROM cache WHERE key = ? AND version = ?", (key, self.version)).fetchone()
+        if row is not None and row[1] < now:
+            db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.count("expirations")
+            row = None
+        if row is None:
+            self.count("misses")
+            return None
+        db.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        self.count("hits")
+        return pickle.loads(row[0])
+
+    # Function to store a value, least recently used entries are evicted first
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.maxsize <= 0 or len(data) > self.maxbytes:
+            return
+        db = self.connect()
+        now = time.time()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.version, data, len(data), now + self.ttl, now))
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+            while entries > self.maxsize or size > self.maxbytes:
+                evict_key, evict_size = db.execute("SELECT key, size FROM cache ORDER BY accessed LIMIT 1").fetchone()
+                db.execute("DELETE FROM cache WHERE key = ?", (evict_key,))
+                entries -= 1
+                size -= evict_size
+                self.count("evictions")
+
+    # Function to remove all entries
+    def clear(self):
+        self.connect().execute("DELETE FROM cache")
+
+    # Function to get counters (of this process) and current size (of the database)
+    def stats(self):
+        entries, size = self.connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        with self.counters_lock:
+            return {**self.counters, "entries": entries, "bytes": size}
+
+
+# Function to create the cache backend from the environment
+def make_cache():
+    options = dict(
+        maxsize=int(os.environ.get("PICCOLAW_CACHE_SIZE", "1024")),
+        maxbytes=int(os.environ.get("PICCOLAW_CACHE_BYTES", str(64 * 2 ** 20))),
+        ttl=int(os.environ.get("PICCOLAW_CACHE_TTL", "3600")))
+    if os.environ.get("PICCOLAW_CACHE", "memory") == "sqlite":
+        path = os.environ.get("PICCOLAW_CACHE_PATH", os.path.join(tempfile.gettempdir(), "piccolaw-cache.sqlite3"))
+        return SqliteCache(path, version=RULESET_VERSION, **options)
+    return MemoryCache(**options)
+
+cache = make_cache()
+
+
+# --- FUNCTIONS --- #
+
+# Function to get a canonical key of a case
+# Inputs the engine ignores are left out, so equivalent cases share the key
+def case_key(case):
+
+    # Function to format a date
+    def date_str(dt):
+        return dt.isoformat() if dt is not None else None
+
+    normalized = {
+        "employment_sdt": date_str(case.employment_sdt),
+        "workplace": case.workplace.upper(),
+        "incapacity_type": case.incapacity_type or False,
+        # Incapacities in order of their number, periods as given
+        "incapacities": [
+            [[date_str(period[0]), date_str(period[1])] for period in case.incap_dct[key] if period != []]
+            for key in sorted(case.incap_dct)],
+        "workdays_num": sorted(set(case.workdays_num)),
+        "trial_relevance": bool(case.trial_relevance),
+        "trial_dur": case.trial_dur if case.trial_relevance else None,
+        "termination_occurence": bool(case.termination_occurence),
+        # Without termination, the seniority ends relative to today
+        "termination_dt": date_str(case.termination_dt) if case.termination_occurence else arrow.now().format("YYYY-MM-DD"),
+        "notice_period": case.notice_period,
+        "endpoint": case.endpoint,
+        "trial_notice_period": case.trial_notice_period,
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+# Function to get a cached value or compute and store it
+def get_or_run(key, fn, *args, **kwargs):
+    key = RULESET_VERSION + ":" + key
+    value = cache.get(key)
+    if value is None:
+        value = fn(*args, **kwargs)
+        cache.put(key, value)
+    return value
+
+# Function to get cache counters
+def stats():
+    return cache.stats()
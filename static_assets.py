@@ -0,0 +1,56 @@
+from importlib import metadata, util
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Static files served by the app server under /static/
+# plotly.min.js is taken from the installed plotly package, so it always matches the figure specs
+# Only the listed files are served, from a directory holding nothing else (see static_dir)
+# Requests with a "v" argument are cached by the browser for a long time (tornado StaticFileHandler)
+STATIC_FILES = {
+    "plotly.min.js": os.path.join(util.find_spec("plotly").submodule_search_locations[0], "package_data", "plotly.min.js"),
+}
+STATIC_VERSION = metadata.version("plotly")
+
+# Client side: load plotly.js once (PyWebIO pages use require.js) and draw the figure spec
+# The shim covers plotly.js builds that only set window.Plotly instead of defining an AMD module
+PLOTLY_TEMPLATE = """<div id="{div_id}" style="height:{height}px; width:{width}px;"></div>
+<script type="text/javascript">
+require.config({{
+    paths: {{plotly: new URL("static/plotly.min.js?v={version}", window.location.href).href}},
+    shim: {{plotly: {{exports: "Plotly"}}}}
+}});
+require(["plotly"], function (Plotly) {{
+    var spec = {spec};
+    Plotly.newPlot(document.getElementById("{div_id}"), spec.data, spec.layout, spec.config);
+}});
+</script>"""
+
+
+# --- FUNCTIONS --- #
+
+# Function to create the directory served under /static/ with copies of the files in STATIC_FILES
+# tornado does not serve symlinks pointing outside of the directory
+# Created by the server process and removed when it exits, worker processes inherit it
+def static_dir():
+    path = tempfile.mkdtemp(prefix="piccolaw-static-")
+    for name, source in STATIC_FILES.items():
+        shutil.copyfile(source, os.path.join(path, name))
+    pid = os.getpid()
+    atexit.register(lambda: os.getpid() == pid and shutil.rmtree(path, ignore_errors=True))
+    return path
+
+# Function to get the HTML snippet drawing a figure spec (JSON with data, layout and config)
+def plotly_html(spec, height=700, width=1000):
+    return PLOTLY_TEMPLATE.format(
+        div_id="plotly-" + uuid.uuid4().hex,
+        height=height,
+        width=width,
+        version=STATIC_VERSION,
+        spec=spec.replace("</", "<\\/"))
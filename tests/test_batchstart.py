@@ -0,0 +1,53 @@
+import pytest
+from batchstart import evaluate_row
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Rows of the batch evaluation with invalid cell values, each reported in the error column
+
+VALID_ROW = {
+    "employment_sdt": "01.01.2020",
+    "workplace": "ZH",
+    "incapacity_type": "illacc",
+    "incapacities": "01.03.2021-30.04.2021",
+    "workdays": "",
+    "trial_dur": "3",
+    "termination_dt": "15.03.2021",
+    "notice_period": "",
+    "endpoint": "",
+    "trial_notice_period": "",
+}
+
+INVALID_CELLS = [
+    {"workplace": "XX"},
+    {"incapacity_type": "flu"},
+    {"endpoint": "monthly"},
+    {"termination_dt": "01.01.2019"},
+    {"incapacity_type": ""},
+    {"incapacities": ""},
+    {"incapacities": "30.04.2021-01.03.2021"},
+    {"incapacities": "01.03.2021-15.03.2021-30.04.2021"},
+    {"incapacities": "01.03.2021-30.04.2021;15.04.2021-20.05.2021"},
+    {"incapacities": "01.06.2021-30.06.2021;01.03.2021-30.04.2021"},
+    {"incapacity_type": "preg", "incapacities": "01.03.2021-30.04.2021;01.06.2021-30.06.2021"},
+    {"incapacity_type": "milservice", "incapacities": "01.03.2021-30.04.2021|01.06.2021-30.06.2021"},
+    {"trial_dur": "4"},
+    {"trial_dur": "0"},
+    {"workdays": "0,7"},
+    {"workdays": ","},
+    {"notice_period": "0"},
+    {"trial_notice_period": "0"},
+]
+
+
+def test_valid_row():
+    assert evaluate_row(VALID_ROW)["error"] == ""
+
+
+@pytest.mark.parametrize("cells", INVALID_CELLS)
+def test_invalid_row(cells):
+    res = evaluate_row(dict(VALID_ROW, **cells))
+    assert res["error"].startswith("ValueError")
+    assert res["termination_case"] == ""
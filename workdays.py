@@ -0,0 +1,49 @@
+from datetime import timedelta
+import numpy as np
+import holiday_calendar
+
+# §§
+# LICENSE: https://github.com/quadratecode/piccolaw-apps/blob/master/LICENSE.md
+# §§
+
+# Working day engine based on numpy business day functions
+# Weekdays are numbered from 0 (monday) to 6 (sunday)
+
+
+# --- FUNCTIONS --- #
+
+# Function to convert weekday numbers into numpy weekmask (monday to sunday)
+def weekmask(workdays_num):
+    return [1 if i in workdays_num else 0 for i in range(7)]
+
+# Function to get the holidays of a canton between two dates (inclusive) as numpy dates
+# Read directly from the bitset of the holiday calendar file if available
+def holiday_array(sdt, edt, canton):
+    calendar = holiday_calendar.calendar
+    if calendar is not None and calendar[1] <= sdt and edt <= calendar[2] and canton in calendar[3]:
+        buf, first_day, last_day, offsets = calendar
+        start = (sdt - first_day).days
+        end = (edt - first_day).days
+        if start > end:
+            return np.array([], dtype="datetime64[D]")
+        bits = np.unpackbits(
+            np.frombuffer(buf, dtype=np.uint8, count=end // 8 - start // 8 + 1, offset=offsets[canton] + start // 8),
+            bitorder="little")
+        return np.datetime64(sdt, "D") + np.flatnonzero(bits[start % 8:start % 8 + end - start + 1])
+    return np.array(holiday_calendar.holidays_between(sdt, edt, canton), dtype="datetime64[D]")
+
+# Function to build working day calendar from weekdays and holidays of a canton between two dates
+def workday_calendar(workdays_num, workplace, sdt, edt):
+    return np.busdaycalendar(
+        weekmask=weekmask(workdays_num),
+        holidays=holiday_array(sdt, edt, workplace))
+
+# Function to count working days between two dates (inclusive)
+def count_workdays(sdt, edt, workday_cal):
+    if sdt > edt:
+        return 0
+    return int(np.busday_count(sdt, edt + timedelta(days=1), busdaycal=workday_cal))
+
+# Function to get the date of the nth working day on or after a given date (n starts at 1)
+def offset_workdays(sdt, n, workday_cal):
+    return np.busday_offset(sdt, n - 1, roll="forward", busdaycal=workday_cal).astype(object)